@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third party apps
     'rest_framework',
@@ -156,6 +157,52 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# Caching
+# Per-worker cache of active districts used by TenantMiddleware (seconds / entries)
+DISTRICT_CACHE_TTL = int(os.getenv('DISTRICT_CACHE_TTL', '300'))
+DISTRICT_CACHE_MAX_SIZE = int(os.getenv('DISTRICT_CACHE_MAX_SIZE', '256'))
+# Public job board responses (seconds); writes to positions invalidate early
+PUBLIC_BOARD_CACHE_TTL = int(os.getenv('PUBLIC_BOARD_CACHE_TTL', '300'))
+# Dashboard statistics (seconds)
+STATS_CACHE_TTL = int(os.getenv('STATS_CACHE_TTL', '30'))
+# Rendered offer template previews (seconds)
+OFFER_PREVIEW_CACHE_TTL = int(os.getenv('OFFER_PREVIEW_CACHE_TTL', '600'))
+
+# Public application intake: 'sync' persists inline (201); 'async' stages the
+# submission and returns 202 with a tracking id while a worker pool persists it
+APPLICATION_INTAKE_MODE = os.getenv('APPLICATION_INTAKE_MODE', 'sync')
+APPLICATION_INTAKE_WORKERS = int(os.getenv('APPLICATION_INTAKE_WORKERS', '4'))
+# Processing submissions untouched this long are assumed orphaned by a dead worker
+APPLICATION_INTAKE_STALE_SECONDS = int(os.getenv('APPLICATION_INTAKE_STALE_SECONDS', '900'))
+
+# Email outbox (see core.outbox): delivered by `manage.py send_outbox`
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+# Base retry delay in seconds, doubled on each failed attempt
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', '60'))
+# Reclaim messages left in 'sending' by a crashed worker after this many seconds
+EMAIL_OUTBOX_STALE_AFTER = int(os.getenv('EMAIL_OUTBOX_STALE_AFTER', '600'))
+
+# Seconds a stored Idempotency-Key response is replayed (see core.idempotency)
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', '86400'))
+
+# DocuSign: verbose diagnostics with extra API calls, template metadata cache (seconds)
+DOCUSIGN_DEBUG = os.getenv('DOCUSIGN_DEBUG', 'False') == 'True'
+DOCUSIGN_TEMPLATE_CACHE_TTL = int(os.getenv('DOCUSIGN_TEMPLATE_CACHE_TTL', '3600'))
+# Bulk envelope dispatch: worker threads, envelopes started per second, offers per request
+DOCUSIGN_BULK_MAX_WORKERS = int(os.getenv('DOCUSIGN_BULK_MAX_WORKERS', '4'))
+DOCUSIGN_BULK_RATE_LIMIT = float(os.getenv('DOCUSIGN_BULK_RATE_LIMIT', '5'))
+DOCUSIGN_BULK_MAX_BATCH = int(os.getenv('DOCUSIGN_BULK_MAX_BATCH', '50'))
+# DocuSign Connect HMAC secrets (comma separated, to allow key rotation)
+DOCUSIGN_CONNECT_HMAC_KEYS = [
+    key.strip() for key in os.getenv('DOCUSIGN_CONNECT_HMAC_KEYS', '').split(',') if key.strip()
+]
+
+# Hired employees written per ERP export chunk (one payload file + one UPDATE each)
+ERP_EXPORT_CHUNK_SIZE = int(os.getenv('ERP_EXPORT_CHUNK_SIZE', '500'))
+# Running export batches without a completed chunk for this long may be resumed
+ERP_EXPORT_STALE_SECONDS = int(os.getenv('ERP_EXPORT_STALE_SECONDS', '1800'))
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -174,6 +221,7 @@ CORS_ALLOWED_ORIGINS = [
 # Allow custom headers for multi-tenancy
 CORS_ALLOW_HEADERS = list(default_headers) + [
     'x-district-id',
+    'idempotency-key',
 ]
 
 # Frontend URL for redirects after SSO
@@ -0,0 +1,145 @@
+import copy
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models import SchoolDistrict
+
+logger = logging.getLogger(__name__)
+
+
+class DistrictCache:
+    """
+    In-process LRU cache for active school districts.
+
+    Every API request resolves a district from the X-District-ID header, so
+    the lookup is cached per worker and keyed by UUID.
+
+    Invalidation:
+    - Entries expire after DISTRICT_CACHE_TTL seconds.
+    - Saving or deleting a SchoolDistrict evicts it locally (see core.signals)
+      and bumps a generation counter in the Django cache. Other workers compare
+      their local generation on each lookup and drop their entries when it
+      changes. With a shared cache backend (Redis/Memcached) this propagates
+      across workers; with the default local-memory backend the TTL bounds
+      staleness instead.
+    """
+
+    GENERATION_KEY = 'core:district_cache:generation'
+
+    def __init__(self, max_size=None, ttl=None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._generation = None
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, 'DISTRICT_CACHE_MAX_SIZE', 256)
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'DISTRICT_CACHE_TTL', 300)
+
+    def get_by_id(self, district_id):
+        """
+        Return the active district with the given ID, or None.
+
+        Raises:
+            ValueError: if district_id is not a valid UUID
+        """
+        if not isinstance(district_id, uuid.UUID):
+            district_id = uuid.UUID(str(district_id))
+        return self._get(district_id)
+
+    def invalidate(self, district):
+        """Evict a district locally and tell other workers to drop theirs."""
+        with self._lock:
+            self._entries.pop(district.id, None)
+        self._bump_generation()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation = None
+
+    def _get(self, district_id):
+        self._sync_generation()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(district_id)
+            if entry is not None:
+                district, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(district_id)
+                    return copy.copy(district)
+                del self._entries[district_id]
+
+        try:
+            district = SchoolDistrict.objects.get(is_active=True, id=district_id)
+        except SchoolDistrict.DoesNotExist:
+            return None
+
+        self._store(district, now + self.ttl)
+        return copy.copy(district)
+
+    def _store(self, district, expires_at):
+        with self._lock:
+            self._entries[district.id] = (district, expires_at)
+            self._entries.move_to_end(district.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _sync_generation(self):
+        try:
+            generation = cache.get(self.GENERATION_KEY, 0)
+        except Exception as e:
+            logger.warning(f"District cache generation check failed: {e}")
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                self._entries.clear()
+                self._generation = generation
+
+    def _bump_generation(self):
+        try:
+            cache.add(self.GENERATION_KEY, 0, timeout=None)
+            cache.incr(self.GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"District cache generation bump failed: {e}")
+
+
+district_cache = DistrictCache()
+
+
+def get_request_district(request):
+    """
+    Return the district for a request.
+
+    Uses request.district when TenantMiddleware has set it, otherwise
+    resolves the X-District-ID header through the cache. Returns None when
+    neither is available.
+    """
+    district = getattr(request, 'district', None)
+    if district is not None:
+        return district
+
+    district_id = request.headers.get('X-District-ID')
+    if not district_id:
+        return None
+    try:
+        return district_cache.get_by_id(district_id)
+    except ValueError:
+        return None
@@ -0,0 +1,101 @@
+"""
+Idempotency-Key support for unsafe API actions.
+
+Usage in a view:
+
+    replay = get_replay(request, scope)
+    if replay is not None:
+        return replay
+    with transaction.atomic():
+        ... lock the target row, call get_replay() again, do the work ...
+        return store_response(request, scope, response)
+
+The second lookup under the row lock closes the window where two requests
+with the same key both miss the first check. Records older than
+IDEMPOTENCY_KEY_TTL seconds are ignored and overwritten, and deleted by
+prune_expired_records() from the daily `expire_offers` sweep.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyRecord
+
+HEADER = 'Idempotency-Key'
+
+
+def get_key(request):
+    key = request.headers.get(HEADER, '').strip()
+    return key[:255] or None
+
+
+def _request_hash(request):
+    raw = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder, default=str)
+    return hashlib.sha256(f"{request.method}:{request.path}:{raw}".encode('utf-8')).hexdigest()
+
+
+def _expiry_cutoff():
+    ttl = getattr(settings, 'IDEMPOTENCY_KEY_TTL', 86400)
+    return timezone.now() - timedelta(seconds=ttl)
+
+
+def _fresh_records():
+    return IdempotencyRecord.objects.filter(created_at__gte=_expiry_cutoff())
+
+
+def prune_expired_records():
+    """Delete records past IDEMPOTENCY_KEY_TTL; returns how many were removed"""
+    deleted, _ = IdempotencyRecord.objects.filter(created_at__lt=_expiry_cutoff()).delete()
+    return deleted
+
+
+def get_replay(request, scope):
+    """
+    Return the stored Response for this request's Idempotency-Key, or None.
+
+    A key reused with a different request body is rejected with 422.
+    """
+    key = get_key(request)
+    if key is None:
+        return None
+
+    record = _fresh_records().filter(scope=scope, key=key).first()
+    if record is None:
+        return None
+
+    if record.request_hash != _request_hash(request):
+        return Response(
+            {'error': f'{HEADER} was already used with a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    response = Response(record.response_body, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def store_response(request, scope, response):
+    """Persist response under the request's Idempotency-Key (if any) and return it"""
+    key = get_key(request)
+    if key is None or response.status_code >= 500:
+        return response
+
+    body = json.loads(json.dumps(response.data, cls=DjangoJSONEncoder))
+    IdempotencyRecord.objects.update_or_create(
+        scope=scope,
+        key=key,
+        defaults={
+            'request_hash': _request_hash(request),
+            'status_code': response.status_code,
+            'response_body': body,
+            # Restart the TTL when an expired record is overwritten
+            'created_at': timezone.now(),
+        },
+    )
+    return response
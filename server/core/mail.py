@@ -0,0 +1,36 @@
+"""
+Batched mail dispatch over a single SMTP connection.
+"""
+import logging
+
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+def send_batch(messages, connection=None):
+    """
+    Send EmailMessages over one connection and report failures per message.
+
+    The connection is opened once for the whole batch. A failed send closes
+    it so the next message reconnects instead of inheriting a broken
+    session. Returns a dict mapping the index of each failed message to its
+    exception; an empty dict means everything was accepted.
+    """
+    connection = connection or get_connection()
+    failures = {}
+
+    try:
+        for index, message in enumerate(messages):
+            try:
+                # No-op while the connection is up
+                connection.open()
+                connection.send_messages([message])
+            except Exception as e:
+                failures[index] = e
+                logger.warning(f"Failed to send email to {', '.join(message.recipients())}: {e}")
+                connection.close()
+    finally:
+        connection.close()
+
+    return failures
@@ -0,0 +1,56 @@
+"""
+Management command to deliver queued emails from the outbox
+Usage: python manage.py send_outbox [--loop] [--interval 5] [--batch-size 50]
+
+Run once from cron, or with --loop as a long-lived worker.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.outbox import deliver_due
+
+
+class Command(BaseCommand):
+    help = 'Send pending emails from the outbox, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new messages instead of exiting when the outbox is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep between polls when idle (default: 5)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Messages claimed per batch (default: EMAIL_OUTBOX_BATCH_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = deliver_due(options['batch_size'])
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(f'Batch: {sent} sent, {failed} failed')
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Outbox drained: {total_sent} sent, {total_failed} failed'))
@@ -1,7 +1,7 @@
 import logging
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
-from core.models import SchoolDistrict
+from core.district_cache import district_cache
 
 logger = logging.getLogger(__name__)
 
@@ -41,20 +41,21 @@ class TenantMiddleware(MiddlewareMixin):
         district_id = request.headers.get('X-District-ID')
         if district_id:
             try:
-                district = SchoolDistrict.objects.get(id=district_id, is_active=True)
-                logger.debug(f"District detected from header: {district.name}")
-            except SchoolDistrict.DoesNotExist:
-                logger.warning(f"Invalid district ID in header: {district_id}")
-                return JsonResponse({
-                    'error': 'Invalid district',
-                    'detail': 'The specified district does not exist or is inactive'
-                }, status=400)
+                district = district_cache.get_by_id(district_id)
             except ValueError:
                 logger.warning(f"Malformed district ID in header: {district_id}")
                 return JsonResponse({
                     'error': 'Invalid district ID format',
                     'detail': 'District ID must be a valid UUID'
                 }, status=400)
+
+            if district is None:
+                logger.warning(f"Invalid district ID in header: {district_id}")
+                return JsonResponse({
+                    'error': 'Invalid district',
+                    'detail': 'The specified district does not exist or is inactive'
+                }, status=400)
+            logger.debug(f"District detected from header: {district.name}")
         
         # Method 2: Use authenticated user's district
         if not district and request.user.is_authenticated:
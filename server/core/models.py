@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 import uuid
 
 
@@ -58,4 +59,79 @@ class SchoolDistrict(models.Model):
         verbose_name_plural = 'School Districts'
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+class EmailOutbox(BaseModel):
+    """
+    Durable queue of outgoing emails.
+
+    Rows are written in the same transaction as the business change that
+    triggers them (see core.outbox.enqueue_email) and delivered later by
+    `python manage.py send_outbox`, so requests never wait on SMTP.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    district = models.ForeignKey(
+        SchoolDistrict,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='outbox_emails',
+        help_text="District the email was sent on behalf of"
+    )
+    category = models.CharField(max_length=50, blank=True, db_index=True,
+                                help_text="Email kind, e.g. 'offer' or 'onboarding_invitation'")
+
+    # Message
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    metadata = models.JSONField(default=dict, blank=True,
+                                help_text="Caller context passed to delivery signals")
+
+    # Delivery
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'email_outbox'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='email_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+
+class IdempotencyRecord(BaseModel):
+    """
+    Stored response for a request sent with an Idempotency-Key header.
+
+    Replays of the same key within the same scope are answered from here
+    (see core.idempotency) instead of re-running the action.
+    """
+    scope = models.CharField(max_length=200, help_text="Action and target, e.g. 'offers.accept:<id>'")
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response_body = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'idempotency_records'
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotency_scope_key_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} [{self.key}] -> {self.status_code}"
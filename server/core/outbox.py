@@ -0,0 +1,155 @@
+"""
+Transactional email outbox.
+
+Signal handlers call `enqueue_email` instead of sending mail inline. The row
+is written in the caller's transaction, so an email exists if and only if
+the business change that produced it was committed. `deliver_due` (run by
+`python manage.py send_outbox`) drains the table in batches, each sent over
+one SMTP connection (core.mail.send_batch), retrying failures with
+exponential backoff.
+
+Callers that track delivery themselves (e.g. OnboardingEmailLog) pass an id
+in `metadata` and listen for `email_sent` / `email_failed`.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .mail import send_batch
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# Sent with `message` (the EmailOutbox row) after delivery succeeds or gives up
+email_sent = Signal()
+email_failed = Signal()
+
+
+def build_email(subject, body, to, html_body='', from_email=None, district=None,
+                category='', metadata=None):
+    """Return an unsaved EmailOutbox row"""
+    if isinstance(to, str):
+        to = [to]
+    return EmailOutbox(
+        district=district,
+        category=category,
+        subject=subject[:255],
+        body=body,
+        html_body=html_body or '',
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+        metadata=metadata or {},
+    )
+
+
+def enqueue_email(subject, body, to, **kwargs):
+    """Queue an email for delivery by the outbox worker"""
+    email = build_email(subject, body, to, **kwargs)
+    email.save()
+    return email
+
+
+def enqueue_emails(emails):
+    """Queue several rows from build_email with a single INSERT"""
+    return EmailOutbox.objects.bulk_create(emails)
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: base * 2^(attempts - 1), capped at one hour"""
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_DELAY', 60)
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), 3600))
+
+
+def claim_due(batch_size):
+    """
+    Mark up to batch_size due messages as 'sending' and return them.
+
+    Rows are locked with SKIP LOCKED so several workers can drain the outbox
+    concurrently. Messages stuck in 'sending' (worker died mid-batch) are
+    reclaimed after EMAIL_OUTBOX_STALE_AFTER seconds.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_STALE_AFTER', 600))
+
+    with transaction.atomic():
+        messages = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status='pending', next_attempt_at__lte=now) |
+                Q(status='sending', updated_at__lt=stale_before)
+            )
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if messages:
+            EmailOutbox.objects.filter(id__in=[m.id for m in messages]).update(
+                status='sending', updated_at=now)
+    return messages
+
+
+def _build_message(message):
+    email = EmailMultiAlternatives(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        to=message.to,
+    )
+    if message.html_body:
+        email.attach_alternative(message.html_body, 'text/html')
+    return email
+
+
+def deliver(messages, connection=None):
+    """
+    Send claimed messages over one SMTP connection and record each outcome.
+
+    Returns (sent, failed) counts for this batch; 'failed' includes messages
+    rescheduled for a retry.
+    """
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    failures = send_batch([_build_message(message) for message in messages], connection)
+
+    now = timezone.now()
+    delivered, given_up = [], []
+    for index, message in enumerate(messages):
+        message.attempts += 1
+        message.updated_at = now
+        error = failures.get(index)
+        if error is None:
+            message.status = 'sent'
+            message.sent_at = now
+            message.last_error = ''
+            delivered.append(message)
+            continue
+
+        message.last_error = str(error)
+        if message.attempts >= max_attempts:
+            message.status = 'failed'
+            given_up.append(message)
+        else:
+            message.status = 'pending'
+            message.next_attempt_at = now + retry_delay(message.attempts)
+
+    EmailOutbox.objects.bulk_update(messages, [
+        'status', 'attempts', 'sent_at', 'last_error', 'next_attempt_at', 'updated_at'])
+
+    for message in delivered:
+        email_sent.send(sender=EmailOutbox, message=message)
+    for message in given_up:
+        email_failed.send(sender=EmailOutbox, message=message)
+
+    return len(delivered), len(failures)
+
+
+def deliver_due(batch_size=None):
+    """Claim and send one batch of due messages; returns (sent, failed)"""
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+    messages = claim_due(batch_size)
+    if not messages:
+        return 0, 0
+    return deliver(messages)
@@ -0,0 +1,160 @@
+import base64
+import datetime
+import json
+import uuid
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Clients that don't send `?cursor=` get the regular PageNumberPagination
+    response ({count, next, previous, results}). Sending `?cursor=` (empty for
+    the first page) switches to keyset pagination: rows are filtered to those
+    after the cursor (`a < x OR (a = x AND (b < y OR (b = y AND id < z)))`)
+    instead of using OFFSET, no COUNT(*) is issued, and the response is
+    {next, previous, results}. Cursor values are validated against the
+    ordering fields; a malformed cursor is a 404.
+
+    Usage in views:
+        class MyViewSet(viewsets.ModelViewSet):
+            pagination_class = KeysetPagination
+            keyset_ordering = ('-submitted_at', '-id')
+
+    The last field of `keyset_ordering` must be unique (normally `id`) so
+    the ordering is total and pages never skip or repeat rows. Keyset
+    ordering takes precedence over `?ordering=` in cursor mode.
+    """
+
+    cursor_query_param = 'cursor'
+    keyset_ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.use_cursor = False
+            return super().paginate_queryset(queryset, request, view)
+
+        self.use_cursor = True
+        self.request = request
+        self.ordering = tuple(getattr(view, 'keyset_ordering', None) or self.keyset_ordering)
+        self.page_size = self.get_page_size(request)
+
+        values, reverse = self.decode_cursor(request, queryset.model)
+        ordering = self._reversed(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.next_values = self._values(rows[-1]) if rows and (has_more or reverse) else None
+        self.previous_values = self._values(rows[0]) if rows and (values is not None) and (has_more or not reverse) else None
+        return rows
+
+    def get_paginated_response(self, data):
+        if not getattr(self, 'use_cursor', False):
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not getattr(self, 'use_cursor', False):
+            return super().get_next_link()
+        if self.next_values is None:
+            return None
+        return self._link(self.next_values, reverse=False)
+
+    def get_previous_link(self):
+        if not getattr(self, 'use_cursor', False):
+            return super().get_previous_link()
+        if self.previous_values is None:
+            return None
+        return self._link(self.previous_values, reverse=True)
+
+    def decode_cursor(self, request, model):
+        """
+        Return (values, reverse) for the request cursor; (None, False) on the
+        first page. Values are converted with the model's ordering fields.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            values = payload['v']
+            reverse = bool(payload.get('r', False))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound('Invalid cursor')
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound('Invalid cursor')
+        try:
+            values = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound('Invalid cursor')
+        return values, reverse
+
+    def encode_cursor(self, values, reverse):
+        payload = {'v': values}
+        if reverse:
+            payload['r'] = True
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def _link(self, values, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values, reverse))
+
+    def _values(self, obj):
+        values = []
+        for field in self.ordering:
+            value = getattr(obj, field.lstrip('-'))
+            if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+                value = value.isoformat()
+            elif isinstance(value, uuid.UUID):
+                value = str(value)
+            values.append(value)
+        return values
+
+    @staticmethod
+    def _reversed(ordering):
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    @staticmethod
+    def _after(ordering, values):
+        """
+        Build the condition selecting rows after `values` in the given
+        ordering: `f1 > v1 OR (f1 = v1 AND (f2 > v2 OR ...))`, with `<` for
+        descending fields. Equivalent to a row-value comparison, but valid
+        for mixed directions.
+        """
+        condition = Q()
+        for index in reversed(range(len(ordering))):
+            field = ordering[index].lstrip('-')
+            lookup = 'lt' if ordering[index].startswith('-') else 'gt'
+            step = Q(**{f'{field}__{lookup}': values[index]})
+            if index < len(ordering) - 1:
+                step |= Q(**{field: values[index]}) & condition
+            condition = step
+        return condition
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import SchoolDistrict
+from .district_cache import district_cache
+
+
+@receiver(post_save, sender=SchoolDistrict)
+@receiver(post_delete, sender=SchoolDistrict)
+def invalidate_district_cache(sender, instance, **kwargs):
+    """Drop cached district lookups when a district is saved, deactivated or deleted"""
+    district_cache.invalidate(instance)
@@ -0,0 +1,179 @@
+"""
+Sparse fieldsets for read endpoints.
+
+    GET /api/hiring/offers/?fields=id,status,candidate_name
+    GET /api/onboarding/candidates/1/?omit=section_data,documents
+
+Serializers using SparseFieldsetMixin drop the unrequested top-level fields
+before serialization, so their SerializerMethodFields and nested
+serializers never run. ViewSets using SparseFieldsetViewMixin also narrow
+the queryset: only the columns behind the remaining fields are loaded
+(`.only()`), and prefetches / select_related joins that no remaining field
+uses are dropped.
+
+Fields whose source isn't a model field or relation (properties, method
+fields) declare what they read in `Meta.sparse_field_sources`:
+
+    class Meta:
+        sparse_field_sources = {'filled_text': ['template_text', 'template_data']}
+
+If any remaining field's dependencies are unknown the queryset is left
+untouched, so a missing declaration costs performance, never correctness.
+Only safe (read) requests are pruned; writes always see the full field set.
+"""
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _split(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+def requested_fieldset(request):
+    """Return (fields, omit) name sets from the request, or (None, set()) when not filtering"""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, set()
+    params = request.query_params
+    fields = _split(params.get(FIELDS_PARAM)) if FIELDS_PARAM in params else None
+    return fields or None, _split(params.get(OMIT_PARAM))
+
+
+class SparseFieldsetMixin:
+    """ModelSerializer mixin honouring ?fields= and ?omit= on the root serializer"""
+
+    def _is_root(self):
+        parent = self.parent
+        if parent is None:
+            return True
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_root():
+            return fields
+
+        wanted, omit = requested_fieldset(self.context.get('request'))
+        if wanted is None and not omit:
+            return fields
+
+        for name in list(fields):
+            if (wanted is not None and name not in wanted) or name in omit:
+                fields.pop(name)
+        return fields
+
+    @classmethod
+    def sparse_dependencies(cls, serializer):
+        """
+        Map the serializer's (pruned) fields to the model attributes they read.
+
+        Returns (columns, relations) or None when some field's dependencies
+        cannot be determined.
+        """
+        model = cls.Meta.model
+        declared = getattr(cls.Meta, 'sparse_field_sources', {})
+        concrete = {field.name for field in model._meta.concrete_fields}
+        relations = {
+            field.name for field in model._meta.get_fields()
+            if field.is_relation and (field.many_to_many or field.one_to_many
+                                      or (field.one_to_one and not field.concrete))
+        }
+        for field in model._meta.get_fields():
+            accessor = getattr(field, 'get_accessor_name', None)
+            if accessor and field.name in relations:
+                relations.add(accessor())
+
+        needed_columns = set()
+        needed_relations = set()
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in declared:
+                sources = declared[name]
+            elif field.source == '*' or not field.source_attrs:
+                return None
+            else:
+                sources = [field.source_attrs[0]]
+
+            for source in sources:
+                if source.startswith('get_') and source.endswith('_display'):
+                    source = source[len('get_'):-len('_display')]
+                if source in concrete:
+                    needed_columns.add(source)
+                    if model._meta.get_field(source).is_relation:
+                        needed_relations.add(source)
+                elif source in relations:
+                    needed_relations.add(source)
+                elif source != 'pk':
+                    return None
+        return needed_columns, needed_relations
+
+
+def _flatten_select_related(tree, prefix=''):
+    paths = []
+    for name, children in tree.items():
+        path = f'{prefix}{name}'
+        nested = _flatten_select_related(children, f'{path}__')
+        paths.extend(nested or [path])
+    return paths
+
+
+def narrow_queryset(queryset, serializer_class, request, ordering=()):
+    """
+    Restrict columns, prefetches and joins to what the sparse fieldset needs.
+
+    `ordering` lists extra fields read from each row after the query (e.g.
+    keyset pagination cursors), which must stay loaded.
+    """
+    wanted, omit = requested_fieldset(request)
+    if (wanted is None and not omit) or not issubclass(serializer_class, SparseFieldsetMixin):
+        return queryset
+
+    serializer = serializer_class(context={'request': request})
+    dependencies = serializer_class.sparse_dependencies(serializer)
+    if dependencies is None:
+        return queryset
+    columns, relations = dependencies
+
+    prefetches = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if (lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup).split('__')[0]
+        in relations
+    ]
+    queryset = queryset.prefetch_related(None).prefetch_related(*prefetches)
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        joins = [path for path in _flatten_select_related(select_related)
+                 if path.split('__')[0] in relations]
+        queryset = queryset.select_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+            columns |= {path.split('__')[0] for path in joins}
+    elif select_related:
+        # select_related() without arguments follows every non-null FK
+        return queryset
+
+    concrete = {field.name for field in queryset.model._meta.concrete_fields}
+    for name in [*queryset.query.order_by, *ordering]:
+        if isinstance(name, str) and name.lstrip('-') in concrete:
+            columns.add(name.lstrip('-'))
+
+    return queryset.only(queryset.model._meta.pk.name, *columns)
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin narrowing the queryset to the requested sparse fieldset.
+
+    Applied in filter_queryset() so the prefetches and joins a view adds in
+    get_queryset() are already in place when they are pruned.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return narrow_queryset(queryset, self.get_serializer_class(), self.request,
+                               ordering=getattr(self, 'keyset_ordering', None) or ())
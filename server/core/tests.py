@@ -0,0 +1,91 @@
+import pytest
+from types import SimpleNamespace
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+class TestDistrictCache:
+    """District lookups are cached per worker with TTL, LRU and generation invalidation"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from django.core.cache import cache
+        from core.district_cache import district_cache
+        cache.clear()
+        district_cache.clear()
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        import core.district_cache
+        now = SimpleNamespace(value=1000.0)
+        monkeypatch.setattr(core.district_cache, 'time', SimpleNamespace(monotonic=lambda: now.value))
+        return now
+
+    def _queries(self, lookup):
+        with CaptureQueriesContext(connection) as ctx:
+            result = lookup()
+        district_queries = [q for q in ctx.captured_queries if 'school_districts' in q['sql']]
+        return result, len(district_queries)
+
+    def test_hit_skips_the_database(self, district1):
+        from core.district_cache import DistrictCache
+
+        districts = DistrictCache()
+        first, queries = self._queries(lambda: districts.get_by_id(district1.id))
+        assert (first.id, queries) == (district1.id, 1)
+
+        second, queries = self._queries(lambda: districts.get_by_id(str(district1.id)))
+        assert (second.id, queries) == (district1.id, 0)
+        assert second is not first
+
+    def test_malformed_id_raises(self):
+        from core.district_cache import DistrictCache
+
+        with pytest.raises(ValueError):
+            DistrictCache().get_by_id('not-a-uuid')
+
+    def test_entries_expire_after_ttl(self, district1, clock):
+        from core.district_cache import DistrictCache
+
+        districts = DistrictCache(ttl=60)
+        districts.get_by_id(district1.id)
+
+        clock.value += 59
+        assert self._queries(lambda: districts.get_by_id(district1.id))[1] == 0
+        clock.value += 2
+        assert self._queries(lambda: districts.get_by_id(district1.id))[1] == 1
+
+    def test_evicts_least_recently_used(self, district1, district2, SchoolDistrict):
+        from core.district_cache import DistrictCache
+
+        district3 = SchoolDistrict.objects.create(name="Test District 3", code="test-district-3")
+        districts = DistrictCache(max_size=2)
+        districts.get_by_id(district1.id)
+        districts.get_by_id(district2.id)
+        districts.get_by_id(district1.id)
+        districts.get_by_id(district3.id)
+
+        assert self._queries(lambda: districts.get_by_id(district1.id))[1] == 0
+        assert self._queries(lambda: districts.get_by_id(district2.id))[1] == 1
+
+    def test_save_invalidates_through_signal(self, district1):
+        from core.district_cache import district_cache
+
+        assert district_cache.get_by_id(district1.id).is_active
+        district1.is_active = False
+        district1.save()
+
+        assert district_cache.get_by_id(district1.id) is None
+
+    def test_generation_bump_clears_other_workers(self, district1, district2):
+        from core.district_cache import DistrictCache
+
+        worker, other_worker = DistrictCache(), DistrictCache()
+        worker.get_by_id(district1.id)
+        worker.get_by_id(district2.id)
+
+        other_worker.invalidate(district1)
+
+        assert self._queries(lambda: worker.get_by_id(district1.id))[1] == 1
+        assert self._queries(lambda: worker.get_by_id(district2.id))[1] == 1
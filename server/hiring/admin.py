@@ -67,9 +67,13 @@ class PositionAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_counts()
+
     def applicant_count(self, obj):
         return obj.applicant_count
     applicant_count.short_description = 'Applicants'
+    applicant_count.admin_order_field = 'annotated_applicant_count'
 
 
 @admin.register(InterviewStage)
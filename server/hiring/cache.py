@@ -0,0 +1,163 @@
+"""
+Cache helpers for hiring endpoints.
+
+Public job board payloads are namespaced by a generation counter stored in
+the Django cache. Writes to the underlying models bump the counter (see
+hiring.signals), which orphans every previously cached entry at once without
+having to know their individual keys.
+
+Dashboard statistics are short-lived and simply expire. Offer previews are
+keyed by a hash of the template text, so editing a template orphans its old
+previews without explicit invalidation.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_BOARD_GENERATION_KEY = 'hiring:public_board:generation'
+
+# A fixed pool of striped locks: keys that hash to the same stripe share a
+# lock, which only serializes unrelated misses briefly, and the pool can't
+# grow with the number of distinct keys (offer previews hash their data)
+_LOCAL_LOCK_STRIPES = 64
+_local_locks = [threading.Lock() for _ in range(_LOCAL_LOCK_STRIPES)]
+
+
+def _get_generation(key):
+    try:
+        return cache.get(key, 0)
+    except Exception as e:
+        logger.warning(f"Cache generation read failed for {key}: {e}")
+        return 0
+
+
+def _bump_generation(key):
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Cache generation bump failed for {key}: {e}")
+
+
+def _digest(payload):
+    raw = json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def public_board_cache_key(search, department, worksite, posting_date):
+    """Build the cache key for one public job board query"""
+    params = {
+        'search': search or '',
+        'department': department or '',
+        'worksite': worksite or '',
+        'date': posting_date.isoformat(),
+    }
+    generation = _get_generation(PUBLIC_BOARD_GENERATION_KEY)
+    return f"hiring:public_board:{generation}:{_digest(params)}"
+
+
+def get_public_board(key):
+    """Return (etag, data) for a cached public board response, or None"""
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Public board cache read failed: {e}")
+        return None
+
+
+def set_public_board(key, data):
+    """Cache serialized public board data and return its strong ETag"""
+    etag = f'"{_digest(data)}"'
+    timeout = getattr(settings, 'PUBLIC_BOARD_CACHE_TTL', 300)
+    try:
+        cache.set(key, (etag, data), timeout=timeout)
+    except Exception as e:
+        logger.warning(f"Public board cache write failed: {e}")
+    return etag
+
+
+def invalidate_public_board():
+    """Drop every cached public board response"""
+    _bump_generation(PUBLIC_BOARD_GENERATION_KEY)
+
+
+def etag_matches(request, etag):
+    """Check a strong ETag against the request's If-None-Match header"""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag in [tag.strip() for tag in header.split(',')]
+
+
+def _local_lock(key):
+    return _local_locks[hash(key) % _LOCAL_LOCK_STRIPES]
+
+
+def get_or_compute(key, compute, timeout, lock_timeout=10, wait=2.0):
+    """
+    Return cache[key], computing it with single-flight protection on a miss.
+
+    Concurrent misses in the same worker queue on a striped local lock; across
+    workers, only the caller that wins `cache.add` on the lock key computes
+    while the rest poll for the result for up to `wait` seconds before
+    falling back to computing it themselves.
+    """
+    missing = object()
+    value = cache.get(key, missing)
+    if value is not missing:
+        return value
+
+    with _local_lock(key):
+        value = cache.get(key, missing)
+        if value is not missing:
+            return value
+
+        lock_key = f"{key}:lock"
+        acquired = cache.add(lock_key, 1, timeout=lock_timeout)
+        if not acquired:
+            deadline = time.monotonic() + wait
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                value = cache.get(key, missing)
+                if value is not missing:
+                    return value
+
+        try:
+            value = compute()
+            cache.set(key, value, timeout=timeout)
+        finally:
+            if acquired:
+                cache.delete(lock_key)
+        return value
+
+
+def stats_cache_key(name, district):
+    """Cache key for a dashboard statistics payload"""
+    district_key = district.id if district is not None else 'all'
+    return f"hiring:stats:{name}:{district_key}"
+
+
+def get_cached_stats(name, district, compute):
+    """Short-TTL, single-flight cache for dashboard statistics"""
+    timeout = getattr(settings, 'STATS_CACHE_TTL', 30)
+    return get_or_compute(stats_cache_key(name, district), compute, timeout)
+
+
+def offer_preview_cache_key(template_id, text_hash, data):
+    """Cache key for one rendered offer template preview"""
+    return f"hiring:offer_preview:{template_id}:{text_hash}:{_digest(data)}"
+
+
+def get_cached_offer_preview(template_id, text_hash, data, compute):
+    timeout = getattr(settings, 'OFFER_PREVIEW_CACHE_TTL', 600)
+    return get_or_compute(offer_preview_cache_key(template_id, text_hash, data), compute, timeout)
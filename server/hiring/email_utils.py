@@ -32,9 +32,7 @@ def create_offer_email_html(offer, accept_url, reject_url):
 
     # Use template_text if available, otherwise use default
     if offer.template_text and offer.template_data:
-        message_body = offer.template_text
-        for key, value in offer.template_data.items():
-            message_body = message_body.replace(f'{{{{{key}}}}}', str(value))
+        message_body = offer.get_filled_text()
         # Convert line breaks to HTML
         message_body = message_body.replace('\n', '<br>')
     else:
@@ -0,0 +1,32 @@
+"""
+Management command to seed the ERP change feed with existing hires
+Usage: python manage.py backfill_erp_change_feed [--district CODE]
+
+Writes one 'hired' event for every hired employee that has no change event
+yet, so a fresh ERP sync without a watermark sees the full roster.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import SchoolDistrict
+from hiring.models import HiredEmployee
+from hiring.services.erp_feed import record_changes
+
+
+class Command(BaseCommand):
+    help = 'Record ERP change events for hired employees that predate the change feed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--district', help='Only backfill this district (by code)')
+
+    def handle(self, *args, **options):
+        employees = HiredEmployee.objects.filter(change_events__isnull=True)
+        if options['district']:
+            try:
+                district = SchoolDistrict.objects.get(code=options['district'])
+            except SchoolDistrict.DoesNotExist:
+                raise CommandError(f"District '{options['district']}' not found")
+            employees = employees.filter(district=district)
+
+        count = employees.count()
+        record_changes(employees.order_by('hire_date', 'created_at'), 'hired')
+        self.stdout.write(self.style.SUCCESS(f'Recorded {count} change event(s)'))
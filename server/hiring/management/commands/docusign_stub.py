@@ -0,0 +1,224 @@
+"""
+Management command to run a local stub of the DocuSign eSignature REST API
+Usage: python manage.py docusign_stub [--port 8765] [--latency 150]
+
+Implements the envelope and template endpoints DocuSignService calls, with
+an optional artificial latency per request, so bulk envelope dispatch can be
+exercised and benchmarked offline. Point the service at it with:
+
+    DOCUSIGN_BASE_URL=http://127.0.0.1:8765/restapi
+    DOCUSIGN_ACCESS_TOKEN=stub
+    DOCUSIGN_ACCOUNT_ID=stub-account
+    DOCUSIGN_TEMPLATE_ID=stub-template
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+TEMPLATE_TAB_LABELS = [
+    'districtName', 'candidateName', 'candidateEmail', 'positionTitle', 'department',
+    'worksite', 'salary', 'fte', 'startDate', 'offerDate', 'expirationDate',
+    'benefit1', 'benefit2', 'benefit3', 'benefit4', 'hrDirectorName', 'hrDirectorTitle',
+]
+
+ROUTES = [
+    ('POST', r'envelopes', 'create_envelope'),
+    ('GET', r'envelopes/(?P<envelope_id>[^/]+)', 'get_envelope'),
+    ('PUT', r'envelopes/(?P<envelope_id>[^/]+)', 'update_envelope'),
+    ('GET', r'envelopes/(?P<envelope_id>[^/]+)/recipients', 'list_recipients'),
+    ('GET', r'envelopes/(?P<envelope_id>[^/]+)/recipients/(?P<recipient_id>[^/]+)/tabs', 'list_tabs'),
+    ('PUT', r'envelopes/(?P<envelope_id>[^/]+)/recipients/(?P<recipient_id>[^/]+)/tabs', 'update_tabs'),
+    ('GET', r'envelopes/(?P<envelope_id>[^/]+)/form_data', 'form_data'),
+    ('POST', r'envelopes/(?P<envelope_id>[^/]+)/views/recipient', 'recipient_view'),
+    ('GET', r'templates/(?P<template_id>[^/]+)', 'get_template'),
+    ('GET', r'templates/(?P<template_id>[^/]+)/documents', 'list_template_documents'),
+    ('GET', r'templates/(?P<template_id>[^/]+)/documents/(?P<document_id>[^/]+)/fields', 'list_document_fields'),
+]
+ROUTE_PATTERNS = [
+    (method, re.compile(rf'^.*?/v2(?:\.1)?/accounts/[^/]+/{pattern}/?$'), name)
+    for method, pattern, name in ROUTES
+]
+
+
+class StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.envelopes = {}
+        self.requests = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    state = None
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def _dispatch(self, method):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.state.lock:
+            self.state.requests += 1
+
+        path = self.path.split('?', 1)[0]
+        for route_method, pattern, name in ROUTE_PATTERNS:
+            match = pattern.match(path)
+            if route_method == method and match:
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}') if length else {}
+                status, payload = getattr(self, name)(body, **match.groupdict())
+                return self._respond(status, payload)
+        self._respond(404, {'errorCode': 'RESOURCE_NOT_FOUND', 'message': f'{method} {path}'})
+
+    def _respond(self, status, payload):
+        raw = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _envelope(self, envelope_id):
+        with self.state.lock:
+            return self.state.envelopes.get(envelope_id)
+
+    # Envelopes
+
+    def create_envelope(self, body):
+        envelope_id = str(uuid.uuid4())
+        role = (body.get('templateRoles') or [{}])[0]
+        envelope = {
+            'envelopeId': envelope_id,
+            'status': body.get('status', 'created'),
+            'statusDateTime': timezone.now().isoformat(),
+            'uri': f'/envelopes/{envelope_id}',
+            'signer': {
+                'recipientId': '1',
+                'roleName': role.get('roleName', 'Candidate'),
+                'email': role.get('email', ''),
+                'name': role.get('name', ''),
+                'status': 'created',
+            },
+            'tabs': (role.get('tabs') or {}),
+        }
+        with self.state.lock:
+            self.state.envelopes[envelope_id] = envelope
+        return 201, {key: envelope[key] for key in ('envelopeId', 'status', 'statusDateTime', 'uri')}
+
+    def get_envelope(self, body, envelope_id):
+        envelope = self._envelope(envelope_id)
+        if envelope is None:
+            return 404, {'errorCode': 'ENVELOPE_DOES_NOT_EXIST'}
+        return 200, {key: envelope[key] for key in ('envelopeId', 'status', 'statusDateTime', 'uri')}
+
+    def update_envelope(self, body, envelope_id):
+        envelope = self._envelope(envelope_id)
+        if envelope is None:
+            return 404, {'errorCode': 'ENVELOPE_DOES_NOT_EXIST'}
+        with self.state.lock:
+            envelope['status'] = body.get('status', envelope['status'])
+            envelope['signer']['status'] = 'sent' if envelope['status'] == 'sent' else 'created'
+        return 200, {'envelopeId': envelope_id}
+
+    def list_recipients(self, body, envelope_id):
+        envelope = self._envelope(envelope_id)
+        if envelope is None:
+            return 404, {'errorCode': 'ENVELOPE_DOES_NOT_EXIST'}
+        return 200, {'signers': [envelope['signer']], 'recipientCount': '1'}
+
+    def list_tabs(self, body, envelope_id, recipient_id):
+        envelope = self._envelope(envelope_id)
+        if envelope is None:
+            return 404, {'errorCode': 'ENVELOPE_DOES_NOT_EXIST'}
+        return 200, envelope['tabs']
+
+    def update_tabs(self, body, envelope_id, recipient_id):
+        envelope = self._envelope(envelope_id)
+        if envelope is None:
+            return 404, {'errorCode': 'ENVELOPE_DOES_NOT_EXIST'}
+        with self.state.lock:
+            envelope['tabs'] = body
+        return 200, body
+
+    def form_data(self, body, envelope_id):
+        envelope = self._envelope(envelope_id)
+        if envelope is None:
+            return 404, {'errorCode': 'ENVELOPE_DOES_NOT_EXIST'}
+        fields = [
+            {'name': tab.get('tabLabel'), 'value': tab.get('value', '')}
+            for tab in envelope['tabs'].get('textTabs', [])
+        ]
+        return 200, {'envelopeId': envelope_id, 'formData': fields}
+
+    def recipient_view(self, body, envelope_id):
+        host = self.headers.get('Host', '127.0.0.1')
+        return 201, {'url': f'http://{host}/signing/{envelope_id}'}
+
+    # Templates
+
+    def get_template(self, body, template_id):
+        return 200, {
+            'templateId': template_id,
+            'name': 'Stub Offer Letter',
+            'recipients': {'signers': [{
+                'roleName': 'Candidate',
+                'recipientId': '1',
+                'tabs': {'textTabs': [{'tabLabel': label} for label in TEMPLATE_TAB_LABELS]},
+            }]},
+        }
+
+    def list_template_documents(self, body, template_id):
+        return 200, {'templateId': template_id,
+                     'templateDocuments': [{'documentId': '1', 'name': 'Offer Letter'}]}
+
+    def list_document_fields(self, body, template_id, document_id):
+        return 200, {'documentFields': []}
+
+
+class Command(BaseCommand):
+    help = 'Run a local stub of the DocuSign REST API for offline testing and benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0,
+            help='Artificial delay per request in milliseconds, to mimic DocuSign round trips',
+        )
+
+    def handle(self, *args, **options):
+        state = StubState()
+        handler = type('ConfiguredStubHandler', (StubHandler,), {
+            'state': state,
+            'latency': options['latency'] / 1000.0,
+        })
+        server = ThreadingHTTPServer((options['host'], options['port']), handler)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"DocuSign stub listening on http://{options['host']}:{options['port']}/restapi "
+            f"(latency {options['latency']:.0f} ms)"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(
+                f'Served {state.requests} request(s), {len(state.envelopes)} envelope(s) created')
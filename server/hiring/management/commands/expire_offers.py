@@ -0,0 +1,109 @@
+"""
+Management command to expire overdue pending offers
+Usage: python manage.py expire_offers [--dry-run] [--no-digest]
+
+Intended to run daily from cron. Expires every overdue offer with one
+UPDATE and queues a single HR digest per district listing what expired.
+Also deletes Idempotency-Key records past IDEMPOTENCY_KEY_TTL.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.idempotency import prune_expired_records
+from core.outbox import build_email, enqueue_emails
+from hiring.models import Offer
+
+
+class Command(BaseCommand):
+    help = "Mark pending offers past their expiration date as Expired"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report overdue offers without updating them',
+        )
+        parser.add_argument(
+            '--no-digest',
+            action='store_true',
+            help='Do not queue the HR digest email',
+        )
+
+    def handle(self, *args, **options):
+        if not options['dry_run']:
+            pruned = prune_expired_records()
+            if pruned:
+                self.stdout.write(f'Deleted {pruned} expired idempotency record(s)')
+
+        today = timezone.now().date()
+        overdue = Offer.objects.filter(status='Pending', expiration_date__lt=today)
+
+        with transaction.atomic():
+            # Lock the overdue offers so a concurrent accept can't land between
+            # reading them for the digest and expiring them. The lock query must
+            # have no joins: OF is dropped for values() queries, so anything
+            # joined is locked too. Clearing Meta.ordering keeps the
+            # district-name sort from joining (and locking) school_districts.
+            offer_ids = list(overdue.order_by().select_for_update().values_list('id', flat=True))
+            rows = list(
+                Offer.objects.filter(id__in=offer_ids)
+                .order_by('district_id', 'expiration_date')
+                .values(
+                    'id', 'district_id', 'expiration_date',
+                    'application__applicant_name', 'application__position__title',
+                    'application__position__req_id',
+                )
+            )
+            if not rows:
+                self.stdout.write('No overdue offers')
+                return
+
+            if options['dry_run']:
+                for row in rows:
+                    self.stdout.write(
+                        f"Would expire offer {row['id']} to {row['application__applicant_name']} "
+                        f"(expired {row['expiration_date']:%Y-%m-%d})")
+                return
+
+            expired = Offer.objects.filter(
+                id__in=[row['id'] for row in rows], status='Pending'
+            ).update(status='Expired', updated_at=timezone.now())
+
+            if not options['no_digest']:
+                self._queue_digests(rows, today)
+
+        self.stdout.write(self.style.SUCCESS(f'Expired {expired} offer(s)'))
+
+    def _queue_digests(self, rows, today):
+        by_district = defaultdict(list)
+        for row in rows:
+            by_district[row['district_id']].append(row)
+
+        hr_email = getattr(settings, 'HR_EMAIL', settings.DEFAULT_FROM_EMAIL)
+        digests = []
+        for district_id, offers in by_district.items():
+            lines = '\n'.join(
+                f"- {row['application__applicant_name']}: {row['application__position__title']} "
+                f"({row['application__position__req_id']}), expired {row['expiration_date']:%B %d, %Y}"
+                for row in offers
+            )
+            digest = build_email(
+                f'{len(offers)} offer(s) expired - {today:%B %d, %Y}',
+                f"""The following pending offers passed their expiration date and were marked Expired:
+
+{lines}
+
+Extend or withdraw these offers as appropriate.
+
+HR System
+""",
+                [hr_email],
+                category='offer_expiry_digest',
+            )
+            digest.district_id = district_id
+            digests.append(digest)
+        enqueue_emails(digests)
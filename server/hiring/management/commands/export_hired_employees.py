@@ -0,0 +1,47 @@
+"""
+Management command to export pending hired employees to the ERP in chunks
+Usage: python manage.py export_hired_employees [--district CODE] [--chunk-size 500] [--resume BATCH_ID]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import SchoolDistrict
+from hiring.models import ERPExportBatch
+from hiring.services.erp_export import run_export, start_export
+
+
+class Command(BaseCommand):
+    help = 'Export hired employees that are pending ERP export, resumably, in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--district', help='Only export this district (by code)')
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Employees per chunk (default: ERP_EXPORT_CHUNK_SIZE)')
+        parser.add_argument('--resume', metavar='BATCH_ID',
+                            help='Resume a failed, partial or stalled export batch instead of starting a new one')
+
+    def handle(self, *args, **options):
+        if options['resume']:
+            try:
+                batch = ERPExportBatch.objects.get(id=options['resume'])
+            except (ERPExportBatch.DoesNotExist, ValueError):
+                raise CommandError(f"Export batch {options['resume']} not found")
+            try:
+                batch = run_export(batch)
+            except ValueError as e:
+                raise CommandError(str(e))
+        else:
+            district = None
+            if options['district']:
+                try:
+                    district = SchoolDistrict.objects.get(code=options['district'])
+                except SchoolDistrict.DoesNotExist:
+                    raise CommandError(f"District '{options['district']}' not found")
+            batch = start_export(district=district, chunk_size=options['chunk_size'])
+
+        summary = (f'Batch {batch.id}: {batch.exported_count}/{batch.total} exported '
+                   f'in {batch.chunks_completed} chunk(s)')
+        if batch.status == 'Completed':
+            self.stdout.write(self.style.SUCCESS(summary))
+        else:
+            raise CommandError(f'{summary}; {batch.status.lower()}: {batch.error_message}. '
+                               f'Resume with --resume {batch.id}')
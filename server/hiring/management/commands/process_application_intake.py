@@ -0,0 +1,97 @@
+"""
+Management command to persist staged public applications
+Usage: python manage.py process_application_intake [--loop] [--interval 60] [--retry-failed]
+       [--stale-after SECONDS] [--limit N]
+
+Runs pending submissions left behind when a worker process restarted before
+its intake thread pool drained, and reclaims submissions left Processing by
+a worker that died mid-way. Safe to run alongside live workers. Run once
+from cron, or with --loop as a long-lived worker.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from hiring.models import ApplicationSubmission
+from hiring.services.application_intake import process_submission, reclaim_stale_submissions
+
+
+class Command(BaseCommand):
+    help = 'Persist staged application submissions that are still pending'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for pending submissions instead of exiting when none are left',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60.0,
+            help='Seconds to sleep between polls when idle (default: 60)',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Reset failed submissions to pending and process them again',
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=None,
+            help='Reclaim submissions Processing for longer than this many seconds '
+                 '(default: APPLICATION_INTAKE_STALE_SECONDS)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=500,
+            help='Maximum number of submissions to process per pass (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            reset = ApplicationSubmission.objects.filter(status='Failed').update(status='Pending')
+            self.stdout.write(f'Reset {reset} failed submission(s) to pending')
+
+        try:
+            while True:
+                processed = self._process_pending(options)
+                if not options['loop']:
+                    break
+                if not processed:
+                    time.sleep(options['interval'])
+                close_old_connections()
+        except KeyboardInterrupt:
+            pass
+
+    def _process_pending(self, options):
+        """Run one pass; returns the number of submissions processed"""
+        reclaimed = reclaim_stale_submissions(options['stale_after'])
+        if reclaimed:
+            self.stdout.write(f'Reclaimed {reclaimed} stale processing submission(s)')
+
+        submission_ids = list(
+            ApplicationSubmission.objects.filter(status='Pending')
+            .order_by('created_at')
+            .values_list('id', flat=True)[:options['limit']]
+        )
+
+        completed = failed = 0
+        for submission_id in submission_ids:
+            submission = process_submission(submission_id)
+            if submission is None:
+                continue
+            if submission.status == 'Completed':
+                completed += 1
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(
+                    f'Submission {submission_id} failed: {submission.error_message}'))
+
+        if completed or failed or not options['loop']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Processed {completed + failed} submission(s): {completed} completed, {failed} failed'))
+        return completed + failed
@@ -0,0 +1,23 @@
+"""
+Management command to rebuild full-text search vectors for positions and applications
+Usage: python manage.py rebuild_search_vectors
+"""
+from django.core.management.base import BaseCommand
+
+from hiring.models import Position, JobApplication
+from hiring.search import build_search_vector, full_text_search_enabled
+
+
+class Command(BaseCommand):
+    help = 'Recompute the weighted search_vector column for all positions and job applications'
+
+    def handle(self, *args, **options):
+        if not full_text_search_enabled():
+            self.stdout.write(self.style.WARNING(
+                'Full-text search requires PostgreSQL; nothing to rebuild.'))
+            return
+
+        for model in (Position, JobApplication):
+            updated = model.objects.update(search_vector=build_search_vector(model))
+            self.stdout.write(self.style.SUCCESS(
+                f'Rebuilt search vectors for {updated} {model._meta.verbose_name_plural}'))
@@ -1,6 +1,12 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator, FileExtensionValidator
 from core.models import BaseModel, SchoolDistrict
+from core.managers import DistrictQuerySet
+from .template_engine import extract_fields, render_template
 from authentication.models import User
 import uuid
 from builtins import list
@@ -79,6 +85,50 @@ class JobTemplate(BaseModel):
         return f"{self.district.name} - {self.template_name}"
 
 
+class PositionQuerySet(DistrictQuerySet):
+    """QuerySet helpers for serializing positions without per-row queries"""
+
+    def with_counts(self):
+        """
+        Annotate applicant and interview counts as correlated subqueries.
+
+        Position.applicant_count / interview_count read these annotations
+        when present instead of issuing a COUNT per position.
+        """
+        applicant_counts = (
+            JobApplication.objects
+            .filter(position=OuterRef('pk'))
+            .order_by()
+            .values('position')
+            .annotate(total=Count('id', distinct=True))
+            .values('total')
+        )
+        interview_counts = (
+            Interview.objects
+            .filter(application__position=OuterRef('pk'))
+            .order_by()
+            .values('application__position')
+            .annotate(total=Count('id', distinct=True))
+            .values('total')
+        )
+        return self.annotate(
+            annotated_applicant_count=Coalesce(Subquery(applicant_counts), 0),
+            annotated_interview_count=Coalesce(Subquery(interview_counts), 0),
+        )
+
+    def with_related(self):
+        """Prefetch screening questions and stages with their interviewers"""
+        return self.prefetch_related(
+            Prefetch('screening_questions'),
+            Prefetch(
+                'stages',
+                queryset=InterviewStage.objects.order_by('stage_number').prefetch_related(
+                    Prefetch('interviewers')
+                )
+            ),
+        )
+
+
 class Position(BaseModel):
     """
     Job positions/requisitions.
@@ -139,6 +189,11 @@ class Position(BaseModel):
     template = models.ForeignKey(
         JobTemplate, null=True, blank=True, on_delete=models.SET_NULL)
 
+    # Weighted full-text index over title/req_id/department/worksite (see hiring.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PositionQuerySet.as_manager()
+
     class Meta:
         db_table = 'positions'
         ordering = ['district', '-created_at']
@@ -147,6 +202,7 @@ class Position(BaseModel):
             models.Index(fields=['district', 'req_id']),
             models.Index(fields=['district', 'title']),
             models.Index(fields=['district', 'department']),
+            GinIndex(fields=['search_vector'], name='positions_search_gin'),
         ]
         # req_id should be unique within district
         unique_together = [['district', 'req_id']]
@@ -169,11 +225,15 @@ class Position(BaseModel):
     @property
     def applicant_count(self):
         """Get count of applications for this position"""
+        if hasattr(self, 'annotated_applicant_count'):
+            return self.annotated_applicant_count
         return self.applications.count()
 
     @property
     def interview_count(self):
         """Get count of scheduled interviews for this position"""
+        if hasattr(self, 'annotated_interview_count'):
+            return self.annotated_interview_count
         return Interview.objects.filter(
             application__position=self
         ).count()
@@ -300,6 +360,9 @@ class JobApplication(BaseModel):
 
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    # Weighted full-text index over name/email/current role (see hiring.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         db_table = 'job_applications'
         ordering = ['district', '-submitted_at']
@@ -308,12 +371,70 @@ class JobApplication(BaseModel):
             models.Index(fields=['district', 'applicant_name']),
             models.Index(fields=['district', 'applicant_email']),
             models.Index(fields=['district', 'position']),
+            GinIndex(fields=['search_vector'], name='job_applications_search_gin'),
+            # Keyset pagination order used by JobApplicationViewSet, whose list
+            # is not filtered by district
+            models.Index(fields=['-submitted_at', '-id'], name='job_applications_keyset_idx'),
         ]
 
     def __str__(self):
         return f"{self.applicant_name} - {self.position.title}"
 
 
+class ApplicationSubmission(BaseModel):
+    """
+    Staged public application awaiting background persistence.
+
+    Used by the asynchronous intake mode (APPLICATION_INTAKE_MODE='async'):
+    the request validates and stages the submission, returns 202 with this
+    row's id as the tracking id, and a worker creates the JobApplication.
+
+    Multi-Tenancy: District-isolated through Position relationship.
+    """
+    STATUS_CHOICES = [
+        ('Pending', 'Pending'),
+        ('Processing', 'Processing'),
+        ('Completed', 'Completed'),
+        ('Failed', 'Failed'),
+    ]
+
+    # Multi-tenancy
+    district = models.ForeignKey(
+        SchoolDistrict,
+        on_delete=models.CASCADE,
+        related_name='application_submissions',
+        help_text="School district this submission belongs to"
+    )
+
+    position = models.ForeignKey(
+        Position, on_delete=models.CASCADE, related_name='submissions')
+
+    # Validated application fields, references and availability (JSON-safe)
+    payload = models.JSONField(default=dict)
+    resume_path = models.CharField(max_length=500)
+    resume_name = models.CharField(max_length=255)
+
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='Pending', db_index=True)
+    application = models.OneToOneField(
+        JobApplication, null=True, blank=True, on_delete=models.SET_NULL,
+        related_name='submission')
+    error_message = models.TextField(blank=True)
+    attempts = models.IntegerField(default=0)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'application_submissions'
+        ordering = ['district', '-created_at']
+        indexes = [
+            models.Index(fields=['district', 'status']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Submission {self.id} - {self.status}"
+
+
 class Reference(BaseModel):
     """
     Professional references for applications.
@@ -427,6 +548,9 @@ class Interview(BaseModel):
             models.Index(fields=['district', 'scheduled_date']),
             models.Index(fields=['district', 'application']),
             models.Index(fields=['district', 'stage']),
+            # Keyset pagination order used by InterviewViewSet, whose list is
+            # not filtered by district
+            models.Index(fields=['scheduled_date', 'scheduled_time', 'id'], name='interviews_keyset_idx'),
         ]
 
     def __str__(self):
@@ -450,18 +574,11 @@ class OfferTemplate(BaseModel):
 
     def extract_fields(self):
         """Extract {{field}} placeholders from template"""
-        import re
-        regex = r'\{\{(\w+)\}\}'
-        fields = set(re.findall(regex, self.template_text))
-        return list(fields)
+        return extract_fields(self.template_text)
 
     def fill_template(self, data: dict) -> str:
         """Fill template with provided data"""
-        result = self.template_text
-        for key, value in data.items():
-            placeholder = f'{{{{{key}}}}}'
-            result = result.replace(placeholder, str(value))
-        return result
+        return render_template(self.template_text, data)
 
 
 class Offer(BaseModel):
@@ -509,12 +626,24 @@ class Offer(BaseModel):
     accepted_date = models.DateField(null=True, blank=True)
     declined_reason = models.TextField(blank=True)
 
+    # DocuSign signing state, kept current by the Connect webhook
+    docusign_envelope_id = models.CharField(max_length=100, blank=True, db_index=True)
+    docusign_status = models.CharField(max_length=30, blank=True, db_index=True)
+    docusign_recipients = models.JSONField(default=list, blank=True)
+    docusign_status_changed_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         db_table = 'offers'
         ordering = ['district', '-offer_date']
         indexes = [
             models.Index(fields=['district', 'status']),
             models.Index(fields=['district', 'application']),
+            # Serves the expiry sweep and expiring_soon without scanning settled offers
+            models.Index(
+                fields=['district', 'expiration_date'],
+                condition=Q(status='Pending'),
+                name='offers_pending_expiry_idx',
+            ),
         ]
 
     def __str__(self):
@@ -522,14 +651,8 @@ class Offer(BaseModel):
 
     def get_filled_text(self) -> str:
         """Get the offer text with all template fields filled"""
-        if self.template_text and self.template_data:
-            # Fill the stored template_text with template_data
-            result = self.template_text
-            for key, value in self.template_data.items():
-                placeholder = f'{{{{{key}}}}}'
-                result = result.replace(placeholder, str(value))
-            return result
-        return self.template_text if self.template_text else ''
+        # Fill the stored template_text with template_data
+        return render_template(self.template_text, self.template_data)
 
 
 class HiredEmployee(BaseModel):
@@ -556,6 +679,9 @@ class HiredEmployee(BaseModel):
         default=False, db_index=True)
     export_date = models.DateTimeField(null=True, blank=True)
     infinite_vision_employee_id = models.CharField(max_length=100, blank=True)
+    export_batch = models.ForeignKey(
+        'ERPExportBatch', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='employees', help_text="Export run that sent this employee to the ERP")
 
     # Additional Data
     hire_date = models.DateField()
@@ -571,3 +697,103 @@ class HiredEmployee(BaseModel):
 
     def __str__(self):
         return f"{self.application.applicant_name} - Hired {self.hire_date}"
+
+
+class ERPExportBatch(BaseModel):
+    """
+    One run of the hired-employee ERP export (see hiring.services.erp_export).
+
+    Employees are exported in chunks; each chunk is written to storage and
+    marked exported in the same transaction that advances this record, so a
+    failed or partial run can be resumed without re-sending finished chunks.
+    """
+    STATUS_CHOICES = [
+        ('Running', 'Running'),
+        ('Completed', 'Completed'),
+        ('Partial', 'Partial'),
+        ('Failed', 'Failed'),
+    ]
+
+    district = models.ForeignKey(
+        SchoolDistrict,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='erp_export_batches',
+        help_text="Limit the export to one district (all districts when empty)"
+    )
+    employee_ids = models.JSONField(
+        default=list, blank=True, help_text="Limit the export to these hired employees")
+    chunk_size = models.PositiveIntegerField(default=500)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Running', db_index=True)
+    total = models.PositiveIntegerField(default=0)
+    exported_count = models.PositiveIntegerField(default=0)
+    chunks_completed = models.PositiveIntegerField(default=0)
+    files = models.JSONField(default=list, blank=True, help_text="Storage paths of the chunk payloads")
+    error_message = models.TextField(blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'erp_export_batches'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"ERP export {self.id} - {self.status} ({self.exported_count}/{self.total})"
+
+
+class TxidCurrent(models.Func):
+    """
+    txid_current(): the writing transaction's id.
+
+    Compiled per database when the schema is created, so migrations carry the
+    same default everywhere; SQLite, which has no transaction ids, gets 0.
+    """
+    function = 'txid_current'
+    template = '%(function)s()'
+    output_field = models.BigIntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return '0', []
+
+
+class ERPChangeEvent(models.Model):
+    """
+    Append-only log of changes the ERP needs to see.
+
+    One row is written when an employee is hired and whenever their offer or
+    position changes afterwards (see hiring.signals). Consumers read events
+    in (txid, id) order after the last pair they processed, the feed
+    watermark (see hiring.services.erp_feed). `txid` is the inserting
+    transaction's id, stamped by the database default; on SQLite it is 0
+    and the order falls back to id.
+    """
+    REASON_CHOICES = [
+        ('hired', 'Hired'),
+        ('employee', 'Employee Updated'),
+        ('offer', 'Offer Updated'),
+        ('position', 'Position Updated'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    district = models.ForeignKey(
+        SchoolDistrict,
+        on_delete=models.CASCADE,
+        related_name='erp_change_events',
+    )
+    hired_employee = models.ForeignKey(
+        HiredEmployee, on_delete=models.CASCADE, related_name='change_events')
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    txid = models.BigIntegerField(db_default=TxidCurrent(), editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'erp_change_events'
+        ordering = ['txid', 'id']
+        indexes = [
+            models.Index(fields=['txid', 'id'], name='erp_change_seq_idx'),
+            models.Index(fields=['district', 'txid', 'id'], name='erp_change_district_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.reason} {self.hired_employee_id}"
@@ -0,0 +1,151 @@
+"""
+Postgres full-text search for hiring models.
+
+Position and JobApplication keep a weighted tsvector in `search_vector`
+(GIN-indexed), refreshed from hiring.signals on save. Searches become prefix
+tsqueries ranked with ts_rank, so they use the index instead of the
+leading-wildcard LIKE scans done by icontains.
+
+Postgres' parser keeps emails, hosts and URLs as single lexemes, and it
+drops stop words entirely. So a search also ORs in icontains on the view's
+search fields when the text looks like one of those literals (contains @ or
+.) or when it reduces to no lexemes at all (only stop words).
+
+Non-Postgres databases (e.g. the SQLite development settings) fall back to
+the previous icontains behaviour. The GIN indexes are always declared, so
+migrations don't depend on the database they were generated against; only
+the Postgres schema editor renders `USING gin`, other backends build a plain
+index.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Func, IntegerField, Q
+from rest_framework import filters
+
+SEARCH_CONFIG = 'english'
+
+# Weighted source columns per model; A ranks highest
+SEARCH_VECTOR_FIELDS = {
+    'Position': [
+        ('title', 'A'),
+        ('req_id', 'A'),
+        ('department', 'B'),
+        ('worksite', 'C'),
+    ],
+    'JobApplication': [
+        ('applicant_name', 'A'),
+        ('applicant_email', 'B'),
+        ('current_role', 'C'),
+    ],
+}
+
+# Terms keep the characters the parser uses for emails/hosts/URLs; everything
+# else (including tsquery operators) separates terms
+_TERM_RE = re.compile(r'[\w@.+-]+', re.UNICODE)
+_TERM_EDGES = '@.+-'
+# Text the parser turns into a single lexeme that prefix terms can't match
+_LITERAL_RE = re.compile(r'[@.]')
+# DRF SearchFilter lookup prefixes (^ istartswith, = iexact, @ search, $ iregex)
+_SEARCH_FIELD_PREFIXES = '^=@$'
+
+
+def full_text_search_enabled():
+    return connection.vendor == 'postgresql'
+
+
+def build_search_vector(model):
+    """Weighted SearchVector expression for a model's searchable columns"""
+    vectors = [
+        SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        for field, weight in SEARCH_VECTOR_FIELDS[model.__name__]
+    ]
+    return reduce(lambda left, right: left + right, vectors)
+
+
+def refresh_search_vector(model, pk):
+    """Recompute the stored search vector for one row"""
+    if not full_text_search_enabled():
+        return
+    model.objects.filter(pk=pk).update(search_vector=build_search_vector(model))
+
+
+def build_search_query(text):
+    """
+    Turn free text into a prefix-matching tsquery (`term:* & term:*`).
+
+    Returns None when the text contains no searchable terms.
+    """
+    terms = [term.strip(_TERM_EDGES) for term in _TERM_RE.findall(text or '')]
+    terms = [term for term in terms if term]
+    if not terms:
+        return None
+    raw = ' & '.join(f'{term}:*' for term in terms)
+    return SearchQuery(raw, search_type='raw', config=SEARCH_CONFIG)
+
+
+def _icontains(fields, text):
+    return reduce(or_, [Q(**{f'{field}__icontains': text}) for field in fields])
+
+
+def apply_full_text_search(queryset, text, fallback_fields, rank=True):
+    """
+    Filter a queryset by full-text search on its `search_vector`.
+
+    When `rank` is set the results are annotated with `search_rank` and
+    ordered by it. Without Postgres, `fallback_fields` are matched with
+    icontains instead. On Postgres they are also ORed in for literal terms
+    such as emails and for text made only of stop words.
+    """
+    if not text:
+        return queryset
+
+    if not full_text_search_enabled():
+        return queryset.filter(_icontains(fallback_fields, text)) if fallback_fields else queryset
+
+    query = build_search_query(text)
+    if query is None:
+        return queryset.filter(_icontains(fallback_fields, text)) if fallback_fields else queryset
+
+    condition = Q(search_vector=query)
+    if fallback_fields:
+        if _LITERAL_RE.search(text):
+            condition |= _icontains(fallback_fields, text)
+        else:
+            # numnode() is 0 when every term was a stop word
+            queryset = queryset.annotate(search_query_nodes=Func(
+                query, function='numnode', output_field=IntegerField()))
+            condition |= Q(search_query_nodes=0) & _icontains(fallback_fields, text)
+
+    queryset = queryset.filter(condition)
+    if rank:
+        queryset = queryset.annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        ).order_by('-search_rank', *queryset.query.order_by)
+    return queryset
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter backed by the model's `search_vector` column.
+
+    Keeps the `?search=` parameter and `search_fields` (used as the
+    icontains fallback, see apply_full_text_search). Results are ranked by relevance unless the client
+    asks for an explicit `?ordering=`; list this backend after OrderingFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not full_text_search_enabled() or not hasattr(queryset.model, 'search_vector'):
+            return super().filter_queryset(request, queryset, view)
+
+        text = request.query_params.get(self.search_param, '')
+        ordering_param = filters.OrderingFilter.ordering_param
+        rank = not request.query_params.get(ordering_param)
+        fallback_fields = [
+            field.lstrip(_SEARCH_FIELD_PREFIXES)
+            for field in (self.get_search_fields(view, request) or [])
+        ]
+        return apply_full_text_search(queryset, text.strip(), fallback_fields, rank=rank)
@@ -1,4 +1,8 @@
 from rest_framework import serializers
+from django.db import transaction
+from django.utils import timezone
+
+from core.sparse_fields import SparseFieldsetMixin
 from .models import (
     ScreeningQuestion,
     JobTemplate,
@@ -15,21 +19,21 @@ from .models import (
 )
 
 
-class ScreeningQuestionSerializer(serializers.ModelSerializer):
+class ScreeningQuestionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ScreeningQuestion
         fields = ['id', 'question', 'category', 'required', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class InterviewerSerializer(serializers.ModelSerializer):
+class InterviewerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Interviewer
         fields = ['id', 'name', 'email', 'role']
         read_only_fields = ['id']
 
 
-class InterviewStageSerializer(serializers.ModelSerializer):
+class InterviewStageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     interviewers = InterviewerSerializer(many=True, read_only=True)
     interviewer_data = serializers.ListField(
         child=serializers.DictField(),
@@ -53,7 +57,7 @@ class InterviewStageSerializer(serializers.ModelSerializer):
         return stage
 
 
-class JobTemplateSerializer(serializers.ModelSerializer):
+class JobTemplateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = JobTemplate
         fields = [
@@ -65,7 +69,7 @@ class JobTemplateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class PositionListSerializer(serializers.ModelSerializer):
+class PositionListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Simplified serializer for listing positions"""
     applicant_count = serializers.ReadOnlyField()
     interview_count = serializers.ReadOnlyField()
@@ -83,9 +87,14 @@ class PositionListSerializer(serializers.ModelSerializer):
             'is_open', 'created_at', 'screening_questions', 'stages'
         ]
         read_only_fields = ['id', 'created_at']
+        sparse_field_sources = {
+            'is_open': ['status', 'posting_start_date', 'posting_end_date'],
+            'applicant_count': ['applications'],
+            'interview_count': [],
+        }
 
 
-class PositionDetailSerializer(serializers.ModelSerializer):
+class PositionDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Detailed serializer for position CRUD"""
     screening_questions = ScreeningQuestionSerializer(
         many=True, read_only=True)
@@ -119,38 +128,27 @@ class PositionDetailSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        sparse_field_sources = {
+            'is_open': ['status', 'posting_start_date', 'posting_end_date'],
+            'applicant_count': ['applications'],
+            'interview_count': [],
+        }
 
     def create(self, validated_data):
         stage_data = validated_data.pop('stage_data', [])
         screening_questions = validated_data.pop('screening_questions', [])
 
-        # District should be passed from perform_create
-        position = Position.objects.create(**validated_data)
+        with transaction.atomic():
+            # District should be passed from perform_create
+            position = Position.objects.create(**validated_data)
 
-        # Set screening questions (ManyToMany field)
-        if screening_questions:
-            position.screening_questions.set(screening_questions)
+            # Set screening questions (ManyToMany field)
+            if screening_questions:
+                position.screening_questions.set(screening_questions)
 
-        # Create interview stages
-        for stage_info in stage_data:
-            # Pop interviewer_data (what frontend sends) or interviewers (alternative)
-            interviewer_data = stage_info.pop(
-                'interviewer_data', stage_info.pop('interviewers', []))
-            # Ensure we only pass valid model fields to InterviewStage
-            stage = InterviewStage.objects.create(
-                position=position,
-                district=position.district,  # Set district from position
-                stage_number=stage_info.get('stage_number', 1),
-                stage_name=stage_info.get('stage_name', 'Interview Stage')
-            )
-
-            # Create interviewers for this stage
-            for interviewer_info in interviewer_data:
-                Interviewer.objects.create(
-                    stage=stage,
-                    district=position.district,  # Set district from position
-                    **interviewer_info
-                )
+            # Create interview stages
+            if stage_data:
+                self._sync_stages(position, stage_data)
 
         return position
 
@@ -158,44 +156,119 @@ class PositionDetailSerializer(serializers.ModelSerializer):
         stage_data = validated_data.pop('stage_data', None)
         screening_questions = validated_data.pop('screening_questions', None)
 
-        # Update position fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        with transaction.atomic():
+            # Update position fields
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
 
-        # Update screening questions if provided
-        if screening_questions is not None:
-            instance.screening_questions.set(screening_questions)
-
-        # Update interview stages if provided
-        if stage_data is not None:
-            # Delete existing stages
-            instance.stages.all().delete()
-
-            # Create new stages
-            for stage_info in stage_data:
-                # Pop interviewer_data (what frontend sends) or interviewers (alternative)
-                interviewer_data = stage_info.pop(
-                    'interviewer_data', stage_info.pop('interviewers', []))
-                # Ensure we only pass valid model fields to InterviewStage
-                stage = InterviewStage.objects.create(
-                    position=instance,
-                    district=instance.district,  # Set district from position
-                    stage_number=stage_info.get('stage_number', 1),
-                    stage_name=stage_info.get('stage_name', 'Interview Stage')
-                )
+            # Update screening questions if provided
+            if screening_questions is not None:
+                instance.screening_questions.set(screening_questions)
 
-                for interviewer_info in interviewer_data:
-                    Interviewer.objects.create(
-                        stage=stage,
-                        district=instance.district,  # Set district from position
-                        **interviewer_info
-                    )
+            # Reconcile interview stages if provided
+            if stage_data is not None:
+                self._sync_stages(instance, stage_data)
 
         return instance
 
+    def _sync_stages(self, position, stage_data):
+        """
+        Reconcile a position's stages and interviewers with stage_data.
+
+        Stages are matched by stage_number and interviewers by email, so
+        unchanged stages keep their IDs and scheduled interviews. Only
+        stages missing from stage_data are deleted. Writes are batched
+        with bulk_create/bulk_update and a targeted delete per model.
+        """
+        now = timezone.now()
+        existing_stages = {
+            stage.stage_number: stage
+            for stage in position.stages.prefetch_related('interviewers')
+        }
+
+        stages_to_create = []
+        stages_to_update = []
+        interviewers_to_create = []
+        interviewers_to_update = []
+        interviewer_ids_to_delete = []
+        kept_stage_numbers = set()
 
-class PublicPositionSerializer(serializers.ModelSerializer):
+        for stage_info in stage_data:
+            # Read interviewer_data (what frontend sends) or interviewers (alternative)
+            interviewer_data = stage_info.get(
+                'interviewer_data', stage_info.get('interviewers', []))
+            stage_number = stage_info.get('stage_number', 1)
+            stage_name = stage_info.get('stage_name', 'Interview Stage')
+            kept_stage_numbers.add(stage_number)
+
+            stage = existing_stages.get(stage_number)
+            if stage is None:
+                stage = InterviewStage(
+                    position=position,
+                    district=position.district,  # Set district from position
+                    stage_number=stage_number,
+                    stage_name=stage_name
+                )
+                stages_to_create.append(stage)
+                existing_interviewers = {}
+            else:
+                if stage.stage_name != stage_name:
+                    stage.stage_name = stage_name
+                    stage.updated_at = now
+                    stages_to_update.append(stage)
+                existing_interviewers = {
+                    interviewer.email.lower(): interviewer
+                    for interviewer in stage.interviewers.all()
+                }
+
+            kept_emails = set()
+            for interviewer_info in interviewer_data:
+                email = interviewer_info.get('email', '')
+                key = email.lower()
+                kept_emails.add(key)
+                name = interviewer_info.get('name', '')
+                role = interviewer_info.get('role', '')
+
+                interviewer = existing_interviewers.get(key)
+                if interviewer is None:
+                    interviewers_to_create.append(Interviewer(
+                        stage=stage,
+                        district=position.district,  # Set district from position
+                        name=name,
+                        email=email,
+                        role=role
+                    ))
+                elif (interviewer.name, interviewer.role) != (name, role):
+                    interviewer.name = name
+                    interviewer.role = role
+                    interviewer.updated_at = now
+                    interviewers_to_update.append(interviewer)
+
+            interviewer_ids_to_delete.extend(
+                interviewer.id
+                for key, interviewer in existing_interviewers.items()
+                if key not in kept_emails
+            )
+
+        removed_stage_numbers = set(existing_stages) - kept_stage_numbers
+        if removed_stage_numbers:
+            position.stages.filter(stage_number__in=removed_stage_numbers).delete()
+        if interviewer_ids_to_delete:
+            Interviewer.objects.filter(id__in=interviewer_ids_to_delete).delete()
+        if stages_to_update:
+            InterviewStage.objects.bulk_update(
+                stages_to_update, ['stage_name', 'updated_at'])
+        if stages_to_create:
+            InterviewStage.objects.bulk_create(stages_to_create)
+        if interviewers_to_update:
+            Interviewer.objects.bulk_update(
+                interviewers_to_update, ['name', 'role', 'updated_at'])
+        if interviewers_to_create:
+            Interviewer.objects.bulk_create(interviewers_to_create)
+
+
+class PublicPositionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Public-facing serializer for job board"""
     screening_questions = ScreeningQuestionSerializer(
         many=True, read_only=True)
@@ -211,21 +284,21 @@ class PublicPositionSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class ReferenceSerializer(serializers.ModelSerializer):
+class ReferenceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Reference
         fields = ['id', 'name', 'email', 'phone', 'relationship']
         read_only_fields = ['id']
 
 
-class InterviewAvailabilitySerializer(serializers.ModelSerializer):
+class InterviewAvailabilitySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = InterviewAvailability
         fields = ['id', 'date', 'time_slots']
         read_only_fields = ['id']
 
 
-class JobApplicationListSerializer(serializers.ModelSerializer):
+class JobApplicationListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Simplified serializer for listing applications"""
     position_title = serializers.CharField(
         source='position.title', read_only=True)
@@ -246,7 +319,7 @@ class JobApplicationListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'submitted_at']
 
 
-class JobApplicationDetailSerializer(serializers.ModelSerializer):
+class JobApplicationDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Detailed serializer for application CRUD"""
     references = ReferenceSerializer(many=True, required=False)
     interview_availability = InterviewAvailabilitySerializer(
@@ -311,7 +384,7 @@ class JobApplicationDetailSerializer(serializers.ModelSerializer):
         return instance
 
 
-class InterviewSerializer(serializers.ModelSerializer):
+class InterviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for interviews"""
     candidate_name = serializers.CharField(
         source='application.applicant_name', read_only=True)
@@ -342,7 +415,7 @@ class InterviewSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class OfferTemplateSerializer(serializers.ModelSerializer):
+class OfferTemplateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for offer templates"""
     extracted_fields = serializers.SerializerMethodField()
 
@@ -351,12 +424,13 @@ class OfferTemplateSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'template_text', 'is_active',
                   'extracted_fields', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        sparse_field_sources = {'extracted_fields': ['template_text']}
 
     def get_extracted_fields(self, obj):
         return obj.extract_fields()
 
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for offers"""
     candidate_name = serializers.CharField(
         source='application.applicant_name', read_only=True)
@@ -381,9 +455,12 @@ class OfferSerializer(serializers.ModelSerializer):
             'offer_date', 'expiration_date', 'template_text', 'template_data', 'filled_text',
             'status', 'accepted_date', 'declined_reason', 'candidate_name',
             'candidate_email', 'position_title', 'position_req_id', 'department',
-            'worksite', 'employee_category', 'created_at', 'updated_at'
+            'worksite', 'employee_category', 'docusign_envelope_id', 'docusign_status',
+            'docusign_recipients', 'docusign_status_changed_at', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'docusign_envelope_id', 'docusign_status', 'docusign_recipients',
+                            'docusign_status_changed_at', 'created_at', 'updated_at']
+        sparse_field_sources = {'filled_text': ['template_text', 'template_data']}
 
     def get_filled_text(self, obj):
         return obj.get_filled_text()
@@ -395,15 +472,27 @@ class OfferSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class HiredEmployeeSerializer(serializers.ModelSerializer):
-    """Serializer for hired employees"""
+class PositionSummarySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Compact position representation for embedding in other resources"""
+
+    class Meta:
+        model = Position
+        fields = [
+            'id', 'req_id', 'title', 'department', 'worksite', 'primary_job_title',
+            'fte', 'employee_category', 'start_date', 'status'
+        ]
+        read_only_fields = fields
+
+
+class HiredEmployeeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Serializer for hired employees (position as a summary)"""
     employee_name = serializers.CharField(
         source='application.applicant_name', read_only=True)
     employee_email = serializers.CharField(
         source='application.applicant_email', read_only=True)
     position_title = serializers.CharField(
         source='application.position.title', read_only=True)
-    position_data = PositionDetailSerializer(
+    position = PositionSummarySerializer(
         source='application.position', read_only=True)
 
     class Meta:
@@ -411,7 +500,16 @@ class HiredEmployeeSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'application', 'offer', 'hire_date', 'exported_to_infinite_vision',
             'export_date', 'infinite_vision_employee_id', 'employee_name',
-            'employee_email', 'position_title', 'position_data',
+            'employee_email', 'position_title', 'position',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'export_date']
+
+
+class HiredEmployeeExpandedSerializer(HiredEmployeeSerializer):
+    """Hired employee with the full position detail (?expand=position)"""
+    position_data = PositionDetailSerializer(
+        source='application.position', read_only=True)
+
+    class Meta(HiredEmployeeSerializer.Meta):
+        fields = HiredEmployeeSerializer.Meta.fields + ['position_data']
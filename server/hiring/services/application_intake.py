@@ -0,0 +1,224 @@
+"""
+Public job application intake.
+
+`persist_application` writes an application and its nested rows in one
+transaction and is used by both intake modes:
+
+- sync (default): JobApplicationViewSet.create persists inline and returns 201.
+- async: the view validates the submission, stages it as an
+  ApplicationSubmission (resume written to storage), and returns 202 with a
+  tracking id. A process-local thread pool then persists the application
+  (and queues its confirmation email), so the request worker only pays for
+  validation and one staging INSERT.
+
+Submissions left Pending by a restart, or stuck Processing because their
+worker died, are picked up by `python manage.py process_application_intake`,
+which the deployments run with --loop next to the outbox worker.
+"""
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import ApplicationSubmission, InterviewAvailability, Reference
+from ..serializers import JobApplicationDetailSerializer
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def is_async_intake_enabled():
+    return getattr(settings, 'APPLICATION_INTAKE_MODE', 'sync') == 'async'
+
+
+def persist_application(data, references_data, availability_data, context=None):
+    """Validate and create an application with its references and availability atomically"""
+    with transaction.atomic():
+        serializer = JobApplicationDetailSerializer(data=data, context=context or {})
+        serializer.is_valid(raise_exception=True)
+        application = serializer.save()
+
+        Reference.objects.bulk_create([
+            Reference(
+                application=application,
+                district=application.district,  # Set district from application
+                name=reference_data.get('name', ''),
+                email=reference_data.get('email', ''),
+                phone=reference_data.get('phone', ''),
+                relationship=reference_data.get('relationship', '')
+            )
+            for reference_data in references_data
+        ])
+
+        InterviewAvailability.objects.bulk_create([
+            InterviewAvailability(
+                application=application,
+                district=application.district,  # Set district from application
+                date=availability.get('date'),
+                time_slots=availability.get('timeSlots', [])
+            )
+            for availability in availability_data
+        ])
+
+    return application
+
+
+def stage_submission(data, references_data, availability_data):
+    """
+    Validate a submission and stage it for background persistence.
+
+    Raises rest_framework ValidationError for invalid data. The worker is
+    scheduled once the staging row is committed.
+    """
+    serializer = JobApplicationDetailSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+
+    resume = data['resume']
+    resume_name = os.path.basename(resume.name)
+    resume_path = default_storage.save(
+        f"intake/{timezone.now():%Y/%m}/{uuid.uuid4().hex}_{resume_name}", resume)
+
+    payload = {
+        'data': {
+            key: str(value) if key in ('position', 'district') else value
+            for key, value in data.items() if key != 'resume'
+        },
+        'references': references_data,
+        'interview_availability': availability_data,
+    }
+
+    try:
+        with transaction.atomic():
+            submission = ApplicationSubmission.objects.create(
+                district_id=data['district'],
+                position_id=data['position'],
+                payload=payload,
+                resume_path=resume_path,
+                resume_name=resume_name,
+            )
+            transaction.on_commit(lambda: enqueue_submission(submission.id))
+    except Exception:
+        # Nothing references the staged file without its submission row
+        try:
+            default_storage.delete(resume_path)
+        except Exception as e:
+            logger.warning(f"Could not remove staged resume {resume_path}: {e}")
+        raise
+
+    return submission
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'APPLICATION_INTAKE_WORKERS', 4),
+                thread_name_prefix='application-intake',
+            )
+        return _executor
+
+
+def enqueue_submission(submission_id):
+    get_executor().submit(_run_in_worker, submission_id)
+
+
+def _run_in_worker(submission_id):
+    close_old_connections()
+    try:
+        process_submission(submission_id)
+    except Exception:
+        logger.exception(f"Application intake worker crashed on submission {submission_id}")
+    finally:
+        close_old_connections()
+
+
+class _ClaimLost(Exception):
+    """The submission was reclaimed by another processor while this one ran"""
+
+
+def reclaim_stale_submissions(stale_after=None):
+    """
+    Return Processing submissions whose worker died to Pending.
+
+    A claim that has not completed within `stale_after` seconds (default
+    APPLICATION_INTAKE_STALE_SECONDS) is assumed lost. Returns the number
+    of submissions reclaimed.
+    """
+    if stale_after is None:
+        stale_after = getattr(settings, 'APPLICATION_INTAKE_STALE_SECONDS', 900)
+    now = timezone.now()
+    return ApplicationSubmission.objects.filter(
+        status='Processing', updated_at__lt=now - timedelta(seconds=stale_after)
+    ).update(status='Pending', updated_at=now)
+
+
+def process_submission(submission_id):
+    """
+    Persist one staged submission.
+
+    Claims the row with a conditional UPDATE so a submission is never
+    processed twice, even when the worker pool and the management command
+    race. The application is created and the submission marked Completed in
+    one transaction, under a lock that verifies the claim is still ours, so
+    a submission reclaimed from a slow worker can't produce a duplicate.
+    Returns the resulting ApplicationSubmission, or None if it was claimed
+    elsewhere.
+    """
+    claimed_at = timezone.now()
+    claimed = ApplicationSubmission.objects.filter(
+        id=submission_id, status='Pending'
+    ).update(status='Processing', attempts=F('attempts') + 1, updated_at=claimed_at)
+    if not claimed:
+        return None
+
+    try:
+        with transaction.atomic():
+            submission = ApplicationSubmission.objects.select_for_update().get(id=submission_id)
+            if submission.status != 'Processing' or submission.updated_at != claimed_at:
+                raise _ClaimLost()
+            payload = submission.payload
+
+            with default_storage.open(submission.resume_path, 'rb') as resume:
+                data = dict(payload.get('data', {}))
+                data['resume'] = File(resume, name=submission.resume_name)
+                application = persist_application(
+                    data,
+                    payload.get('references', []),
+                    payload.get('interview_availability', []),
+                )
+
+            submission.status = 'Completed'
+            submission.application = application
+            submission.error_message = ''
+            submission.processed_at = timezone.now()
+            submission.save(update_fields=[
+                'status', 'application', 'error_message', 'processed_at', 'updated_at'])
+    except _ClaimLost:
+        logger.warning(f"Application submission {submission_id} was reclaimed while processing")
+        return None
+    except Exception as e:
+        logger.exception(f"Failed to persist application submission {submission_id}")
+        ApplicationSubmission.objects.filter(
+            id=submission_id, status='Processing', updated_at=claimed_at
+        ).update(status='Failed', error_message=str(e), processed_at=timezone.now(),
+                 updated_at=timezone.now())
+        return ApplicationSubmission.objects.get(id=submission_id)
+
+    try:
+        default_storage.delete(submission.resume_path)
+    except Exception as e:
+        logger.warning(f"Could not remove staged resume {submission.resume_path}: {e}")
+
+    return submission
@@ -0,0 +1,136 @@
+"""
+Bulk DocuSign envelope dispatch for offers.
+
+Each envelope costs several sequential DocuSign round trips (create draft,
+list recipients, update tabs, send, recipient view). Sending a batch fans
+those out over a bounded thread pool sharing the process-wide
+DocuSignService, with a token-bucket limiter so the batch stays under the
+account's API rate limit. Every offer gets its own result entry; one failure
+never aborts the rest of the batch. An envelope counts as delivered only once
+DocuSign reports it sent; a draft left behind by a failed send is a failure.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .docusign_service import get_docusign_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HR_DIRECTOR_NAME = 'Dr. Jennifer Davis'
+DEFAULT_HR_DIRECTOR_TITLE = 'Director of Human Resources'
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` acquisitions per second"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def offer_envelope_payload(offer):
+    """
+    Build the envelope arguments for an offer.
+
+    Mirrors the tab labels the frontend's createOfferLetterEnvelope sends,
+    so bulk and single sends fill the template identically.
+    """
+    application = offer.application
+    position = application.position
+    benefits = (list(offer.benefits or []) + ['', '', '', ''])[:4]
+    district_name = offer.district.name if offer.district_id else 'School District'
+
+    values = {
+        'districtName': district_name,
+        'candidateName': application.applicant_name,
+        'candidateEmail': application.applicant_email,
+        'positionTitle': position.title,
+        'department': position.department,
+        'worksite': position.worksite,
+        'salary': f'{offer.salary:.2f}',
+        'fte': str(offer.fte),
+        'startDate': offer.start_date.strftime('%m/%d/%Y'),
+        'offerDate': offer.offer_date.strftime('%m/%d/%Y'),
+        'expirationDate': offer.expiration_date.strftime('%m/%d/%Y'),
+        'benefit1': benefits[0],
+        'benefit2': benefits[1],
+        'benefit3': benefits[2],
+        'benefit4': benefits[3],
+        'hrDirectorName': DEFAULT_HR_DIRECTOR_NAME,
+        'hrDirectorTitle': DEFAULT_HR_DIRECTOR_TITLE,
+    }
+
+    return {
+        'recipient_email': application.applicant_email,
+        'recipient_name': application.applicant_name,
+        'subject': f'Job Offer - {position.title} at {district_name}',
+        'tabs_data': {
+            'textTabs': [{'tabLabel': label, 'value': value} for label, value in values.items()],
+        },
+    }
+
+
+def send_offer_envelopes(offers, max_workers=None, rate_limit=None, service=None):
+    """
+    Create and send one envelope per offer concurrently.
+
+    `offers` should be loaded with application__position and district
+    (payloads are built up front, so worker threads never touch the DB).
+    Returns a list of per-offer result dicts in input order:
+        {'offer_id', 'ok', 'envelope_id', 'status', 'signing_url', 'error'}
+    """
+    max_workers = max_workers or getattr(settings, 'DOCUSIGN_BULK_MAX_WORKERS', 4)
+    rate_limit = rate_limit if rate_limit is not None else getattr(settings, 'DOCUSIGN_BULK_RATE_LIMIT', 5)
+    service = service or get_docusign_service()
+    limiter = RateLimiter(rate_limit)
+
+    jobs = [(str(offer.id), offer_envelope_payload(offer)) for offer in offers]
+    if not jobs:
+        return []
+
+    # Authenticate once up front instead of letting every worker race for it
+    service.authenticate()
+
+    def send(job):
+        offer_id, payload = job
+        limiter.acquire()
+        try:
+            result = service.create_envelope_from_template(**payload)
+        except Exception as e:
+            logger.warning(f"DocuSign envelope for offer {offer_id} failed: {e}")
+            return {'offer_id': offer_id, 'ok': False, 'envelope_id': None,
+                    'status': None, 'signing_url': None, 'error': str(e)}
+        if result['status'] != 'sent':
+            # The service leaves the envelope as a draft when the final send fails
+            logger.warning(f"DocuSign envelope {result['envelopeId']} for offer {offer_id} "
+                           f"was not sent (status {result['status']})")
+            return {'offer_id': offer_id, 'ok': False, 'envelope_id': result['envelopeId'],
+                    'status': result['status'], 'signing_url': None,
+                    'error': 'Envelope was created but could not be sent'}
+        return {'offer_id': offer_id, 'ok': True, 'envelope_id': result['envelopeId'],
+                'status': result['status'], 'signing_url': result['signingUrl'], 'error': None}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)),
+                            thread_name_prefix='docusign-bulk') as executor:
+        return list(executor.map(send, jobs))
@@ -0,0 +1,118 @@
+"""
+DocuSign Connect event ingestion.
+
+Connect POSTs envelope events to our webhook as JSON, signed with
+HMAC-SHA256 over the raw body (base64 in X-DocuSign-Signature-1..N, one
+header per active key). Events are applied to the Offer that owns the
+envelope, so signing state is read from our database instead of being
+fetched back from DocuSign.
+"""
+import base64
+import hashlib
+import hmac
+import logging
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import Offer
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER_PREFIX = 'X-DocuSign-Signature-'
+MAX_SIGNATURE_HEADERS = 10
+
+
+def get_hmac_keys():
+    keys = getattr(settings, 'DOCUSIGN_CONNECT_HMAC_KEYS', [])
+    return [key for key in keys if key]
+
+
+def verify_signature(raw_body, headers):
+    """Return True if any X-DocuSign-Signature-N header matches any configured key"""
+    keys = get_hmac_keys()
+    if not keys:
+        return False
+
+    signatures = []
+    for index in range(1, MAX_SIGNATURE_HEADERS + 1):
+        value = headers.get(f'{SIGNATURE_HEADER_PREFIX}{index}')
+        if not value:
+            break
+        signatures.append(value.strip())
+
+    for key in keys:
+        expected = base64.b64encode(
+            hmac.new(key.encode('utf-8'), raw_body, hashlib.sha256).digest()).decode('ascii')
+        if any(hmac.compare_digest(expected, signature) for signature in signatures):
+            return True
+    return False
+
+
+def parse_event(payload):
+    """
+    Extract (envelope_id, status, recipients, changed_at) from a Connect payload.
+
+    Handles the JSON SIM event format ({"event", "data": {"envelopeSummary"}})
+    as well as flat envelope payloads.
+    """
+    data = payload.get('data') or {}
+    summary = data.get('envelopeSummary') or payload
+
+    envelope_id = data.get('envelopeId') or summary.get('envelopeId')
+    status = (summary.get('status') or '').lower()
+    if not status and payload.get('event', '').startswith('envelope-'):
+        status = payload['event'][len('envelope-'):]
+
+    signers = ((summary.get('recipients') or {}).get('signers')) or []
+    recipients = [
+        {
+            'recipient_id': signer.get('recipientId'),
+            'name': signer.get('name'),
+            'email': signer.get('email'),
+            'status': (signer.get('status') or '').lower(),
+            'signed_at': signer.get('signedDateTime'),
+            'delivered_at': signer.get('deliveredDateTime'),
+            'declined_reason': signer.get('declinedReason', ''),
+        }
+        for signer in signers
+    ]
+
+    changed_at = None
+    for field in ('statusChangedDateTime', 'completedDateTime', 'sentDateTime'):
+        if summary.get(field):
+            changed_at = parse_datetime(summary[field])
+            if changed_at:
+                break
+    if changed_at is None and payload.get('generatedDateTime'):
+        changed_at = parse_datetime(payload['generatedDateTime'])
+
+    return envelope_id, status, recipients, changed_at or timezone.now()
+
+
+def apply_event(payload):
+    """
+    Persist a Connect event on its offer.
+
+    Events can arrive out of order or be retried, so an event older than the
+    stored state is ignored. Returns the number of offers updated.
+    """
+    envelope_id, status, recipients, changed_at = parse_event(payload)
+    if not envelope_id or not status:
+        return 0
+
+    updates = {'docusign_status': status, 'docusign_status_changed_at': changed_at,
+               'updated_at': timezone.now()}
+    if recipients:
+        updates['docusign_recipients'] = recipients
+
+    updated = Offer.objects.filter(
+        Q(docusign_status_changed_at__isnull=True) | Q(docusign_status_changed_at__lte=changed_at),
+        docusign_envelope_id=envelope_id,
+    ).update(**updates)
+
+    if not updated:
+        logger.info(f"DocuSign Connect event for envelope {envelope_id} matched no offer or was stale")
+    return updated
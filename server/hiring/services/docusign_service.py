@@ -1,11 +1,48 @@
-from docusign_esign import ApiClient, EnvelopesApi, EnvelopeDefinition, TemplateRole, Text, Tabs, RecipientViewRequest, TextCustomField, CustomFields
+from docusign_esign import ApiClient, ApiException, EnvelopesApi, EnvelopeDefinition, TemplateRole, Text, Tabs, RecipientViewRequest, TextCustomField, CustomFields
 import os
+import threading
+import time
 import jwt
+import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from django.conf import settings
+from django.core.cache import cache
+
+from ..cache import get_or_compute
+
+logger = logging.getLogger(__name__)
+
+# Refresh the access token this many seconds before DocuSign expires it
+TOKEN_REFRESH_MARGIN = int(os.getenv('DOCUSIGN_TOKEN_REFRESH_MARGIN', '300'))
+TOKEN_LIFETIME = 3600
+
+
+TEMPLATE_TAB_TYPES = [
+    ('text_tabs', 'Text'),
+    ('number_tabs', 'Number'),
+    ('email_tabs', 'Email'),
+    ('date_tabs', 'Date'),
+    ('checkbox_tabs', 'Checkbox'),
+    ('sign_here_tabs', 'Signature'),
+    ('initial_here_tabs', 'Initial'),
+    ('full_name_tabs', 'Full Name'),
+    ('company_tabs', 'Company'),
+    ('title_tabs', 'Title'),
+]
+
 
 class DocuSignService:
+    """
+    DocuSign eSignature client.
+
+    Use get_docusign_service() rather than constructing this directly: the
+    shared instance keeps one ApiClient (and its HTTP connection pool) and
+    an access token that is reused until shortly before it expires, so
+    envelope creation doesn't pay for a JWT grant round trip every time.
+    """
+
     def __init__(self):
         self.integration_key = os.getenv('DOCUSIGN_INTEGRATION_KEY')
         self.user_id = os.getenv('DOCUSIGN_USER_ID')
@@ -26,9 +63,22 @@ class DocuSignService:
 
         self.base_url = os.getenv('DOCUSIGN_BASE_URL', 'https://demo.docusign.net/restapi')
 
+        # Pre-issued bearer token; skips the JWT grant (used with the local
+        # stub from `manage.py docusign_stub`)
+        self.static_access_token = os.getenv('DOCUSIGN_ACCESS_TOKEN', '')
+
+        # Extra remote calls for diagnostics (template introspection, tab
+        # verification) only run when this is enabled
+        self.debug = getattr(settings, 'DOCUSIGN_DEBUG', False)
+
         self.api_client = ApiClient()
         self.api_client.host = self.base_url
 
+        self._private_key = None
+        self._access_token = None
+        self._token_expires_at = 0.0
+        self._token_lock = threading.Lock()
+
     def _validate_config(self):
         """Validate that all required configuration is present"""
         if not self.integration_key:
@@ -44,12 +94,18 @@ class DocuSignService:
         if not os.path.exists(self.private_key_path):
             raise ValueError(f"DocuSign private key file not found at: {self.private_key_path}")
 
+    def _read_private_key(self):
+        """Read the RSA private key once per process"""
+        if self._private_key is None:
+            with open(self.private_key_path, 'rb') as key_file:
+                self._private_key = key_file.read()
+        return self._private_key
+
     def get_jwt_token(self):
         """Generate JWT token for authentication"""
         self._validate_config()
 
-        with open(self.private_key_path, 'rb') as key_file:
-            private_key = key_file.read()
+        private_key = self._read_private_key()
 
         now = datetime.utcnow()
 
@@ -68,44 +124,237 @@ class DocuSignService:
 
         return jwt.encode(payload, private_key, algorithm='RS256')
 
-    def authenticate(self):
-        """Authenticate with DocuSign using JWT"""
-        self._validate_config()
+    def authenticate(self, force=False):
+        """
+        Ensure the API client carries a valid access token.
+
+        The JWT grant is only performed when there is no token yet, it is
+        within TOKEN_REFRESH_MARGIN seconds of expiring, or force=True
+        (e.g. after a 401). Concurrent callers wait for a single refresh.
+        """
+        if not force and self._access_token and time.monotonic() < self._token_expires_at:
+            return
+
+        if self.static_access_token:
+            self._access_token = self.static_access_token
+            self._token_expires_at = float('inf')
+            self.api_client.set_default_header('Authorization', f'Bearer {self._access_token}')
+            return
+
+        with self._token_lock:
+            if not force and self._access_token and time.monotonic() < self._token_expires_at:
+                return
+
+            self._validate_config()
+
+            oauth_host = 'account-d.docusign.com' if 'demo' in self.base_url else 'account.docusign.com'
+
+            response = self.api_client.request_jwt_user_token(
+                client_id=self.integration_key,
+                user_id=self.user_id,
+                oauth_host_name=oauth_host,
+                private_key_bytes=self._read_private_key(),
+                expires_in=TOKEN_LIFETIME,
+                scopes=['signature', 'impersonation']
+            )
 
-        oauth_host = 'account-d.docusign.com' if 'demo' in self.base_url else 'account.docusign.com'
+            expires_in = int(getattr(response, 'expires_in', None) or TOKEN_LIFETIME)
+            self._access_token = response.access_token  # type: ignore
+            self._token_expires_at = time.monotonic() + max(expires_in - TOKEN_REFRESH_MARGIN, 0)
+            self.api_client.set_default_header('Authorization', f'Bearer {self._access_token}')
 
-        with open(self.private_key_path, 'rb') as key_file:
-            private_key = key_file.read()
+    def _call(self, method, *args, **kwargs):
+        """
+        Call a DocuSign API method, refreshing the token once on a 401.
 
-        response = self.api_client.request_jwt_user_token(
-            client_id=self.integration_key,
-            user_id=self.user_id,
-            oauth_host_name=oauth_host,
-            private_key_bytes=private_key,
-            expires_in=3600,
-            scopes=['signature', 'impersonation']
-        )
+        The cached token can be revoked or expire early on DocuSign's side;
+        the request is retried with a fresh grant unless another thread has
+        already replaced the token that was rejected.
+        """
+        token = self._access_token
+        try:
+            return method(*args, **kwargs)
+        except ApiException as e:
+            if e.status != 401:
+                raise
+            logger.info("DocuSign rejected the access token; refreshing it and retrying")
+            if self._access_token == token:
+                self.authenticate(force=True)
+            return method(*args, **kwargs)
+
+    def template_metadata_cache_key(self):
+        return f"hiring:docusign:template:{self.account_id}:{self.template_id}"
+
+    def get_template_metadata(self, refresh=False):
+        """
+        Return a plain-dict summary of the configured template.
+
+        Fetched with TemplatesApi.get / list_documents / list_document_fields
+        and cached for DOCUSIGN_TEMPLATE_CACHE_TTL seconds per template id.
+        """
+        key = self.template_metadata_cache_key()
+        if refresh:
+            cache.delete(key)
+        timeout = getattr(settings, 'DOCUSIGN_TEMPLATE_CACHE_TTL', 3600)
+        return get_or_compute(key, self._fetch_template_metadata, timeout)
+
+    def _fetch_template_metadata(self):
+        from docusign_esign import TemplatesApi
+
+        self.authenticate()
+        templates_api = TemplatesApi(self.api_client)
+        template = self._call(templates_api.get, self.account_id, self.template_id)
+
+        metadata = {
+            'template_id': self.template_id,
+            'name': getattr(template, 'name', None) or 'Unknown',
+            'custom_fields': [],
+            'documents': [],
+            'roles': [],
+        }
+
+        custom_fields = getattr(template, 'custom_fields', None)
+        for field in (getattr(custom_fields, 'text_custom_fields', None) or []):
+            metadata['custom_fields'].append({'name': field.name, 'value': getattr(field, 'value', None)})
+
+        documents = templates_api.list_documents(self.account_id, self.template_id)
+        for doc in (getattr(documents, 'template_documents', None) or []):
+            fields = []
+            try:
+                doc_fields = templates_api.list_document_fields(
+                    self.account_id, self.template_id, doc.document_id)
+                fields = [
+                    {'name': field.name, 'type': getattr(field, 'field_type', None)}
+                    for field in (getattr(doc_fields, 'document_fields', None) or [])
+                ]
+            except Exception as e:
+                logger.debug(f"Could not fetch document fields for {doc.document_id}: {str(e)}")
+            metadata['documents'].append({'id': doc.document_id, 'name': doc.name, 'fields': fields})
+
+        recipients = getattr(template, 'recipients', None)
+        for signer in (getattr(recipients, 'signers', None) or []):
+            tabs = {}
+            signer_tabs = getattr(signer, 'tabs', None)
+            for tab_attr, tab_name in TEMPLATE_TAB_TYPES:
+                tab_list = getattr(signer_tabs, tab_attr, None) if signer_tabs else None
+                if tab_list:
+                    tabs[tab_name] = [getattr(tab, 'tab_label', None) for tab in tab_list]
+            metadata['roles'].append({
+                'role_name': signer.role_name,
+                'recipient_id': signer.recipient_id,
+                'tabs': tabs,
+            })
+
+        return metadata
+
+    def _log_template_metadata(self, metadata):
+        logger.debug(f"Template Name: {metadata['name']}")
+        logger.debug(f"Template ID: {metadata['template_id']}")
+
+        if metadata['custom_fields']:
+            logger.debug(f"CUSTOM FIELDS (envelope-level): {len(metadata['custom_fields'])}")
+            for field in metadata['custom_fields'][:5]:
+                logger.debug(f"Name: '{field['name']}' | Value: '{field['value']}'")
+
+        logger.debug(f"TEMPLATE DOCUMENTS: {len(metadata['documents'])}")
+        for doc in metadata['documents']:
+            logger.debug(f"Document: {doc['name']} (ID: {doc['id']})")
+            for field in doc['fields'][:5]:
+                logger.debug(f"- Name: '{field['name']}' | Type: {field['type']}")
+
+        if not metadata['roles']:
+            logger.debug("No signer roles in template")
+        for role in metadata['roles']:
+            logger.debug(f"Role Name: '{role['role_name']}'")
+            logger.debug(f"Recipient ID: {role['recipient_id']}")
+            if not role['tabs']:
+                logger.debug("NO TABS FOUND IN TEMPLATE FOR THIS ROLE!")
+            for tab_name, labels in role['tabs'].items():
+                logger.debug(f"{tab_name} tabs: {len(labels)}")
+                for label in labels[:5]:
+                    logger.debug(f"Label: '{label}'")
+
+    def _log_envelope_details(self, envelopes_api, envelope_id):
+        """Log the envelope, recipient tabs and form data as DocuSign stores them"""
+        # Fetch envelope details to see what was actually stored
+        logger.debug("FETCHING ENVELOPE DETAILS FROM DOCUSIGN...")
+        try:
+            envelope = envelopes_api.get_envelope(self.account_id, envelope_id)
+            logger.debug("Envelope fetched successfully")
+            logger.debug(f"Status: {envelope.status}")
+
+            # Get all tabs from the recipient to see what DocuSign actually has
+            logger.debug("FETCHING ALL RECIPIENT TABS (WHAT DOCUSIGN HAS)...")
+            try:
+                # Need to get recipients first
+                recipients = envelopes_api.list_recipients(self.account_id, envelope_id)
+                if recipients.signers and len(recipients.signers) > 0:
+                    recipient_id = recipients.signers[0].recipient_id
+                    tabs = envelopes_api.list_tabs(self.account_id, envelope_id, recipient_id)
+                    logger.debug(f"Tabs retrieved from DocuSign for recipient: {recipient_id}")
+
+                    # Check ALL tab types
+                    tab_types = [
+                        ('text_tabs', 'TEXT'),
+                        ('number_tabs', 'NUMBER'),
+                        ('email_tabs', 'EMAIL'),
+                        ('date_tabs', 'DATE'),
+                        ('checkbox_tabs', 'CHECKBOX'),
+                        ('radio_group_tabs', 'RADIO'),
+                        ('list_tabs', 'LIST/DROPDOWN'),
+                        ('sign_here_tabs', 'SIGNATURE'),
+                        ('initial_here_tabs', 'INITIAL'),
+                        ('full_name_tabs', 'FULL NAME'),
+                        ('company_tabs', 'COMPANY'),
+                        ('title_tabs', 'TITLE'),
+                        ('formula_tabs', 'FORMULA'),
+                        ('note_tabs', 'NOTE'),
+                    ]
 
-        self.api_client.set_default_header('Authorization', f'Bearer {response.access_token}')  # type: ignore
+                    found_any = False
+                    for tab_attr, tab_name in tab_types:
+                        if hasattr(tabs, tab_attr):
+                            tab_list = getattr(tabs, tab_attr)
+                            if tab_list:
+                                found_any = True
+                                logger.debug(f"{tab_name} TABS ({len(tab_list)} total):")
+                                for tab in tab_list:
+                                    tab_label = getattr(tab, 'tab_label', 'N/A')
+                                    tab_value = getattr(tab, 'value', 'N/A')
+                                    tab_locked = getattr(tab, 'locked', 'N/A')
+                                    tab_id = getattr(tab, 'tab_id', 'N/A')
+                                    logger.debug(f"- Label: '{tab_label}' | Value: '{tab_value}' | Locked: {tab_locked} | ID: {tab_id}")
+
+                    if not found_any:
+                        logger.debug("NO TABS OF ANY TYPE FOUND FOR THIS RECIPIENT!")
+                else:
+                    logger.debug("No signers found in envelope")
+            except Exception as e:
+                logger.debug(f"Could not fetch tabs: {str(e)}")
+
+            # Get form data to see field values
+            logger.debug("FETCHING FORM DATA (FIELD VALUES)...")
+            form_data = envelopes_api.get_form_data(self.account_id, envelope_id)
+            if hasattr(form_data, 'form_data') and form_data.form_data:
+                logger.debug("Form data retrieved:")
+                for field in form_data.form_data:
+                    if hasattr(field, 'name') and hasattr(field, 'value'):
+                        logger.debug(f"- {field.name}: '{field.value}'")
+            else:
+                logger.debug("No form data available yet")
+        except Exception as e:
+            logger.debug(f"Could not fetch envelope details: {str(e)}")
 
     def create_envelope_from_template(self, recipient_email, recipient_name, subject, tabs_data):
         """Create envelope from your existing template with field values"""
         self.authenticate()
 
-        print("\n" + "="*80)
-        print("DOCUSIGN ENVELOPE CREATION - DEBUG LOG")
-        print("="*80)
-
-        print(f"\n1. ENVELOPE CONFIG:")
-        print(f"   Template ID: {self.template_id}")
-        print(f"   Account ID: {self.account_id}")
-        print(f"   Email Subject: {subject}")
-        print(f"   Status: sent")
-
-        print(f"\n2. RECIPIENT INFO:")
-        print(f"   Role Name: Candidate")
-        print(f"   Email: {recipient_email}")
-        print(f"   Name: {recipient_name}")
+        # Recipient details and tab values are personal data: they are only
+        # logged at DEBUG, and only when DOCUSIGN_DEBUG is on
+        logger.debug("Creating DocuSign envelope from template %s", self.template_id)
+        if self.debug:
+            logger.debug("Envelope subject %r for recipient %s <%s>",
+                         subject, recipient_name, recipient_email)
 
         # Define HR fields that should be locked (pre-filled by HR)
         hr_locked_fields = {
@@ -116,9 +365,6 @@ class DocuSignService:
             'hrDirectorName', 'hrDirectorTitle'
         }
 
-        print(f"\n3. CREATING TEXT TABS:")
-        print(f"   Total tabs to process: {len(tabs_data.get('textTabs', []))}")
-
         # Build text tabs list
         text_tabs = []
         empty_fields = []
@@ -145,102 +391,19 @@ class DocuSignService:
 
             text_tabs.append(text_tab)
 
-            field_type = "LOCKED (HR)" if is_locked else "EDITABLE (Candidate)"
-            status = "⚠️ EMPTY" if not tab_value else "✓"
-            print(f"   [{idx+1}] {tab_label:20s} = '{tab_value:30s}' [{field_type}] {status}")
+            if self.debug:
+                field_type = "locked" if is_locked else "editable"
+                logger.debug("Tab %d %s = %r (%s)", idx + 1, tab_label, tab_value, field_type)
 
         if empty_fields:
-            print(f"\n   ⚠️  WARNING: {len(empty_fields)} field(s) have empty values: {', '.join(empty_fields)}")
+            logger.debug("%d tab(s) have empty values: %s", len(empty_fields), ', '.join(empty_fields))
 
-        print(f"\n4. FETCHING TEMPLATE INFO:")
-        # Fetch template to see its configuration
-        try:
-            from docusign_esign import TemplatesApi
-            templates_api = TemplatesApi(self.api_client)
-            template = templates_api.get(self.account_id, self.template_id)
-
-            print(f"   Template Name: {template.name if hasattr(template, 'name') else 'Unknown'}")
-            print(f"   Template ID: {self.template_id}")
-
-            # Check for custom fields (envelope-level)
-            if hasattr(template, 'custom_fields') and template.custom_fields:
-                print(f"\n   CUSTOM FIELDS (envelope-level):")
-                if hasattr(template.custom_fields, 'text_custom_fields') and template.custom_fields.text_custom_fields:
-                    print(f"      Text custom fields: {len(template.custom_fields.text_custom_fields)}")
-                    for field in template.custom_fields.text_custom_fields[:5]:
-                        print(f"         • Name: '{field.name}' | Value: '{getattr(field, 'value', 'N/A')}'")
-
-            # Get template documents to check for merge/data fields
+        if self.debug:
+            logger.debug("TEMPLATE INFO (cached):")
             try:
-                documents = templates_api.list_documents(self.account_id, self.template_id)
-                if documents and hasattr(documents, 'template_documents'):
-                    print(f"\n   TEMPLATE DOCUMENTS: {len(documents.template_documents)}")
-                    for doc in documents.template_documents:
-                        print(f"      • Document: {doc.name} (ID: {doc.document_id})")
-
-                        # Try to get document fields (data/merge fields)
-                        try:
-                            doc_fields = templates_api.list_document_fields(
-                                self.account_id,
-                                self.template_id,
-                                doc.document_id
-                            )
-                            if doc_fields and hasattr(doc_fields, 'document_fields') and doc_fields.document_fields:
-                                print(f"         Data/Merge Fields: {len(doc_fields.document_fields)}")
-                                for field in doc_fields.document_fields[:5]:
-                                    print(f"            - Name: '{field.name}' | Type: {getattr(field, 'field_type', 'N/A')}")
-                        except Exception as e:
-                            print(f"         Could not fetch document fields: {str(e)}")
+                self._log_template_metadata(self.get_template_metadata())
             except Exception as e:
-                print(f"   Could not fetch template documents: {str(e)}")
-
-            # Get template recipients to see roles and tabs
-            if hasattr(template, 'recipients') and template.recipients:
-                if hasattr(template.recipients, 'signers') and template.recipients.signers:
-                    print(f"\n   SIGNER ROLES ({len(template.recipients.signers)} total):")
-                    for signer in template.recipients.signers:
-                        print(f"\n      Role Name: '{signer.role_name}'")
-                        print(f"      Recipient ID: {signer.recipient_id}")
-
-                        # Check all tab types in template
-                        if hasattr(signer, 'tabs') and signer.tabs:
-                            tab_types = [
-                                ('text_tabs', 'Text'),
-                                ('number_tabs', 'Number'),
-                                ('email_tabs', 'Email'),
-                                ('date_tabs', 'Date'),
-                                ('checkbox_tabs', 'Checkbox'),
-                                ('sign_here_tabs', 'Signature'),
-                                ('initial_here_tabs', 'Initial'),
-                                ('full_name_tabs', 'Full Name'),
-                                ('company_tabs', 'Company'),
-                                ('title_tabs', 'Title'),
-                            ]
-
-                            found_tabs = False
-                            for tab_attr, tab_name in tab_types:
-                                if hasattr(signer.tabs, tab_attr):
-                                    tab_list = getattr(signer.tabs, tab_attr)
-                                    if tab_list:
-                                        found_tabs = True
-                                        print(f"      {tab_name} tabs: {len(tab_list)}")
-                                        for tab in tab_list[:5]:  # Show first 5 of each type
-                                            tab_label = getattr(tab, 'tab_label', 'N/A')
-                                            print(f"         • Label: '{tab_label}'")
-
-                            if not found_tabs:
-                                print(f"      ⚠️  NO TABS FOUND IN TEMPLATE FOR THIS ROLE!")
-                        else:
-                            print(f"      ⚠️  NO TABS OBJECT IN TEMPLATE!")
-                else:
-                    print(f"   ⚠️  No signer roles in template")
-            else:
-                print(f"   ⚠️  No recipients in template")
-        except Exception as e:
-            print(f"   Could not fetch template: {str(e)}")
-
-        print(f"\n5. BUILDING ENVELOPE:")
-        print(f"   Total tabs to send: {len(text_tabs)}")
+                logger.debug(f"Could not fetch template: {str(e)}")
 
         # Create template role with tabs
         template_role = TemplateRole(
@@ -258,24 +421,20 @@ class DocuSignService:
             template_roles=[template_role]
         )
 
-        print(f"\n6. CREATING ENVELOPE AS DRAFT...")
-        print(f"   API Host: {self.api_client.host}")
-
         # Create the envelope
         envelopes_api = EnvelopesApi(self.api_client)
-        results = envelopes_api.create_envelope(self.account_id, envelope_definition=envelope_definition)
+        results = self._call(envelopes_api.create_envelope, self.account_id,
+                             envelope_definition=envelope_definition)
 
-        print(f"   Envelope created in draft mode: {results.envelope_id}")
+        logger.debug("Envelope %s created as draft on %s", results.envelope_id, self.api_client.host)
 
         # Update tab values (works in draft mode)
-        print(f"\n   Updating tab values...")
         try:
             # Get recipients to find recipient ID
-            recipients = envelopes_api.list_recipients(self.account_id, results.envelope_id)
+            recipients = self._call(envelopes_api.list_recipients, self.account_id, results.envelope_id)
 
             if recipients.signers and len(recipients.signers) > 0:
                 recipient_id = recipients.signers[0].recipient_id
-                print(f"   Recipient ID: {recipient_id}")
 
                 # Build tabs with updated values
                 updated_text_tabs = []
@@ -286,150 +445,91 @@ class DocuSignService:
                         locked='true'  # Lock HR fields
                     )
                     updated_text_tabs.append(text_tab)
-                    print(f"      • {tab_data['tabLabel']}: '{tab_data.get('value', '')}'")
 
                 if updated_text_tabs:
                     # Update tabs for the recipient
                     tabs_to_update = Tabs(text_tabs=updated_text_tabs)
 
-                    envelopes_api.update_tabs(
+                    self._call(
+                        envelopes_api.update_tabs,
                         self.account_id,
                         results.envelope_id,
                         recipient_id,
                         tabs=tabs_to_update
                     )
-                    print(f"   ✓ Tabs updated with {len(updated_text_tabs)} fields")
-
-                    # Verify the update by fetching tabs back
-                    print(f"\n   Verifying updated tabs...")
-                    try:
-                        updated_tabs = envelopes_api.list_tabs(self.account_id, results.envelope_id, recipient_id)
-                        if updated_tabs.text_tabs:
-                            print(f"   Text tabs after update ({len(updated_tabs.text_tabs)} total):")
-                            for tab in updated_tabs.text_tabs:
-                                status = "✓ FILLED" if tab.value else "✗ EMPTY"
-                                print(f"      {status} - {tab.tab_label}: '{tab.value}'")
-                        else:
-                            print(f"   No text tabs found")
-                    except Exception as verify_err:
-                        print(f"   Could not verify tabs: {str(verify_err)}")
-                else:
-                    print(f"   No tabs to update")
+                    logger.debug("Updated %d tabs on envelope %s", len(updated_text_tabs), results.envelope_id)
+
+                    # Verify the update by fetching tabs back (diagnostics only)
+                    if self.debug:
+                        logger.debug("Verifying updated tabs...")
+                        try:
+                            updated_tabs = envelopes_api.list_tabs(self.account_id, results.envelope_id, recipient_id)
+                            if updated_tabs.text_tabs:
+                                logger.debug(f"Text tabs after update ({len(updated_tabs.text_tabs)} total):")
+                                for tab in updated_tabs.text_tabs:
+                                    status = "✓ FILLED" if tab.value else "✗ EMPTY"
+                                    logger.debug(f"{status} - {tab.tab_label}: '{tab.value}'")
+                            else:
+                                logger.debug("No text tabs found")
+                        except Exception as verify_err:
+                            logger.debug(f"Could not verify tabs: {str(verify_err)}")
             else:
-                print(f"   ⚠️  No recipients found in envelope")
+                logger.warning("No recipients found in envelope %s", results.envelope_id)
         except Exception as e:
-            print(f"   ⚠️  Could not update tabs: {str(e)}")
+            logger.warning("Could not update tabs on envelope %s: %s", results.envelope_id, e)
 
         # Now send the envelope
-        print(f"\n   Sending envelope...")
+        envelope_status = results.status
         try:
             from docusign_esign import Envelope
             envelope_update = Envelope(status='sent')
-            envelopes_api.update(
+            self._call(
+                envelopes_api.update,
                 self.account_id,
                 results.envelope_id,
                 envelope=envelope_update
             )
-            print(f"   ✓ Envelope sent successfully")
+            envelope_status = 'sent'
+            logger.debug("Envelope %s sent", results.envelope_id)
         except Exception as e:
-            print(f"   ⚠️  Could not send envelope: {str(e)}")
-
-        print(f"\n7. DOCUSIGN RESPONSE:")
-        print(f"   Envelope ID: {results.envelope_id}")
-        print(f"   Status: {results.status}")
-        print(f"   Status Date/Time: {results.status_date_time}")
-        if hasattr(results, 'envelope_uri'):
-            print(f"   Envelope URI: {results.envelope_uri}")
-
-        # Fetch envelope details to see what was actually stored
-        print(f"\n8. FETCHING ENVELOPE DETAILS FROM DOCUSIGN...")
-        try:
-            envelope = envelopes_api.get_envelope(self.account_id, results.envelope_id)
-            print(f"   Envelope fetched successfully")
-            print(f"   Status: {envelope.status}")
-
-            # Get all tabs from the recipient to see what DocuSign actually has
-            print(f"\n9. FETCHING ALL RECIPIENT TABS (WHAT DOCUSIGN HAS)...")
-            try:
-                # Need to get recipients first
-                recipients = envelopes_api.list_recipients(self.account_id, results.envelope_id)
-                if recipients.signers and len(recipients.signers) > 0:
-                    recipient_id = recipients.signers[0].recipient_id
-                    tabs = envelopes_api.list_tabs(self.account_id, results.envelope_id, recipient_id)
-                    print(f"   Tabs retrieved from DocuSign for recipient: {recipient_id}")
-
-                    # Check ALL tab types
-                    tab_types = [
-                        ('text_tabs', 'TEXT'),
-                        ('number_tabs', 'NUMBER'),
-                        ('email_tabs', 'EMAIL'),
-                        ('date_tabs', 'DATE'),
-                        ('checkbox_tabs', 'CHECKBOX'),
-                        ('radio_group_tabs', 'RADIO'),
-                        ('list_tabs', 'LIST/DROPDOWN'),
-                        ('sign_here_tabs', 'SIGNATURE'),
-                        ('initial_here_tabs', 'INITIAL'),
-                        ('full_name_tabs', 'FULL NAME'),
-                        ('company_tabs', 'COMPANY'),
-                        ('title_tabs', 'TITLE'),
-                        ('formula_tabs', 'FORMULA'),
-                        ('note_tabs', 'NOTE'),
-                    ]
+            logger.warning("Could not send envelope %s: %s", results.envelope_id, e)
 
-                    found_any = False
-                    for tab_attr, tab_name in tab_types:
-                        if hasattr(tabs, tab_attr):
-                            tab_list = getattr(tabs, tab_attr)
-                            if tab_list:
-                                found_any = True
-                                print(f"\n   {tab_name} TABS ({len(tab_list)} total):")
-                                for tab in tab_list:
-                                    tab_label = getattr(tab, 'tab_label', 'N/A')
-                                    tab_value = getattr(tab, 'value', 'N/A')
-                                    tab_locked = getattr(tab, 'locked', 'N/A')
-                                    tab_id = getattr(tab, 'tab_id', 'N/A')
-                                    print(f"      - Label: '{tab_label}' | Value: '{tab_value}' | Locked: {tab_locked} | ID: {tab_id}")
-
-                    if not found_any:
-                        print(f"\n   ⚠️  NO TABS OF ANY TYPE FOUND FOR THIS RECIPIENT!")
-                else:
-                    print(f"   ⚠️  No signers found in envelope")
-            except Exception as e:
-                print(f"   Could not fetch tabs: {str(e)}")
-
-            # Get form data to see field values
-            print(f"\n10. FETCHING FORM DATA (FIELD VALUES)...")
-            form_data = envelopes_api.get_form_data(self.account_id, results.envelope_id)
-            if hasattr(form_data, 'form_data') and form_data.form_data:
-                print(f"   Form data retrieved:")
-                for field in form_data.form_data:
-                    if hasattr(field, 'name') and hasattr(field, 'value'):
-                        print(f"   - {field.name}: '{field.value}'")
-            else:
-                print(f"   No form data available yet")
-        except Exception as e:
-            print(f"   Warning: Could not fetch envelope details: {str(e)}")
+        # Envelope state after sending arrives through the Connect webhook
+        # (views_extra.docusign.docusign_connect_webhook); reading it back
+        # here is diagnostics only
+        if self.debug:
+            self._log_envelope_details(envelopes_api, results.envelope_id)
 
         # Get signing URL
-        print(f"\n11. GENERATING SIGNING URL...")
         view_request = RecipientViewRequest()
         view_request.return_url = os.getenv('FRONTEND_URL', 'http://localhost:3000') + '/offers/signed'
         view_request.authentication_method = 'email'
         view_request.email = recipient_email
         view_request.user_name = recipient_name
 
-        signing_view = envelopes_api.create_recipient_view(
+        signing_view = self._call(
+            envelopes_api.create_recipient_view,
             self.account_id,
             results.envelope_id,
             recipient_view_request=view_request
         )
 
-        print(f"   Signing URL generated successfully")
-        print(f"   URL length: {len(signing_view.url)} characters")
-        print("="*80 + "\n")
-
         return {
             'envelopeId': results.envelope_id,
-            'status': results.status,
+            'status': envelope_status,
             'signingUrl': signing_view.url
         }
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_docusign_service():
+    """Return the process-wide DocuSignService, creating it on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = DocuSignService()
+    return _service
@@ -0,0 +1,204 @@
+"""
+Chunked export of hired employees to the ERP (Infinite Vision).
+
+A run is tracked by an ERPExportBatch. Each chunk of pending employees is
+loaded with its application, position and offer in one query, written to
+storage as a JSON payload, and flagged exported with a single UPDATE, all in
+one transaction together with the batch's progress counters. Resuming a
+failed batch picks up exactly the employees that are still pending; a batch
+that is already running can't be resumed, unless it has made no progress for
+ERP_EXPORT_STALE_SECONDS (its process was killed mid-run). Employees locked by
+a concurrent export are skipped, and a batch that ends with some of them still
+pending is marked Partial and can be resumed like a failed one.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast, Concat, Substr, Upper
+from django.utils import timezone
+
+from ..models import ERPExportBatch, HiredEmployee
+
+logger = logging.getLogger(__name__)
+
+
+def pending_employees(batch):
+    """Employees in scope for a batch that have not been exported yet"""
+    queryset = HiredEmployee.objects.filter(exported_to_infinite_vision=False)
+    if batch.district_id:
+        queryset = queryset.filter(district_id=batch.district_id)
+    if batch.employee_ids:
+        queryset = queryset.filter(id__in=batch.employee_ids)
+    return queryset
+
+
+# Source columns employee_record reads, per model (foreign keys by attname);
+# saves that change none of them don't change what the ERP sees
+ERP_SOURCE_FIELDS = {
+    'HiredEmployee': ['district_id', 'application_id', 'offer_id', 'hire_date'],
+    'Offer': ['start_date', 'salary', 'fte', 'benefits'],
+    'Position': [
+        'req_id', 'title', 'primary_job_title', 'department', 'worksite',
+        'employee_category', 'eeoc_classification', 'workers_comp_classification',
+        'leave_plan', 'deduction_template',
+    ],
+}
+
+
+def employee_record(employee):
+    """ERP payload for one hired employee"""
+    application = employee.application
+    position = application.position
+    offer = employee.offer
+    return {
+        'hired_employee_id': str(employee.id),
+        'district_id': str(employee.district_id),
+        'hire_date': employee.hire_date,
+        'first_day': offer.start_date,
+        'name': application.applicant_name,
+        'email': application.applicant_email,
+        'phone': application.applicant_phone,
+        'position': {
+            'req_id': position.req_id,
+            'title': position.title,
+            'primary_job_title': position.primary_job_title,
+            'department': position.department,
+            'worksite': position.worksite,
+            'employee_category': position.employee_category,
+            'eeoc_classification': position.eeoc_classification,
+            'workers_comp_classification': position.workers_comp_classification,
+            'leave_plan': position.leave_plan,
+            'deduction_template': position.deduction_template,
+        },
+        'compensation': {
+            'salary': offer.salary,
+            'fte': offer.fte,
+            'benefits': offer.benefits,
+        },
+    }
+
+
+def start_export(district=None, employee_ids=None, chunk_size=None):
+    """Create a batch for the given scope and run it"""
+    batch = ERPExportBatch(
+        district=district,
+        employee_ids=[str(employee_id) for employee_id in (employee_ids or [])],
+        chunk_size=chunk_size or getattr(settings, 'ERP_EXPORT_CHUNK_SIZE', 500),
+    )
+    batch.total = pending_employees(batch).count()
+    batch.save()
+    return _run(batch)
+
+
+def run_export(batch):
+    """
+    Resume a Failed, Partial or stalled batch from its last completed chunk.
+
+    Every chunk bumps the batch's updated_at, so a Running batch untouched
+    for ERP_EXPORT_STALE_SECONDS lost its process and may be taken over.
+    The batch row is locked while it is claimed, so two resumes can't both
+    start it. Raises ValueError for any other batch.
+    """
+    stale_before = timezone.now() - timedelta(
+        seconds=getattr(settings, 'ERP_EXPORT_STALE_SECONDS', 1800))
+    with transaction.atomic():
+        claimed = ERPExportBatch.objects.select_for_update().get(id=batch.id)
+        stalled = claimed.status == 'Running' and claimed.updated_at < stale_before
+        if claimed.status not in ('Failed', 'Partial') and not stalled:
+            raise ValueError(
+                f"Export batch is {claimed.status.lower()}; "
+                f"only failed, partial or stalled batches can be resumed")
+        claimed.status = 'Running'
+        claimed.error_message = ''
+        claimed.save(update_fields=['status', 'error_message', 'updated_at'])
+    return _run(claimed)
+
+
+def _run(batch):
+    """Export chunks until none are available, then mark the batch finished"""
+    try:
+        while _export_chunk(batch):
+            pass
+    except Exception as e:
+        logger.exception(f"ERP export batch {batch.id} failed")
+        batch.refresh_from_db()
+        batch.status = 'Failed'
+        batch.error_message = str(e)
+        batch.save(update_fields=['status', 'error_message', 'updated_at'])
+        return batch
+
+    # Chunks skip rows locked by another export, so running out of chunks
+    # doesn't mean everything in scope went out
+    if batch.exported_count < batch.total and pending_employees(batch).exists():
+        batch.status = 'Partial'
+        batch.error_message = (
+            f"{batch.total - batch.exported_count} employee(s) were locked by another "
+            f"export and are still pending")
+        batch.save(update_fields=['status', 'error_message', 'updated_at'])
+        return batch
+
+    batch.status = 'Completed'
+    batch.finished_at = timezone.now()
+    batch.save(update_fields=['status', 'finished_at', 'updated_at'])
+    return batch
+
+
+def _export_chunk(batch):
+    """Export one chunk; returns False once nothing is left"""
+    with transaction.atomic():
+        employees = list(
+            pending_employees(batch)
+            .select_related('application__position', 'offer')
+            .select_for_update(skip_locked=True, of=('self',))
+            .order_by('id')[:batch.chunk_size]
+        )
+        if not employees:
+            return False
+
+        now = timezone.now()
+        payload = {
+            'batch_id': str(batch.id),
+            'chunk': batch.chunks_completed + 1,
+            'generated_at': now,
+            'employees': [employee_record(employee) for employee in employees],
+        }
+        path = default_storage.save(
+            f"erp_exports/{now:%Y/%m}/{batch.id}/chunk-{batch.chunks_completed + 1:05d}.json",
+            ContentFile(json.dumps(payload, cls=DjangoJSONEncoder).encode('utf-8')),
+        )
+
+        # One UPDATE for the whole chunk. Until the ERP returns its own IDs,
+        # the employee ID is derived from our UUID instead of a random mock.
+        exported = HiredEmployee.objects.filter(
+            id__in=[employee.id for employee in employees]
+        ).update(
+            exported_to_infinite_vision=True,
+            export_date=now,
+            export_batch=batch,
+            infinite_vision_employee_id=Concat(
+                Value('EMP-'), Upper(Substr(Cast('id', output_field=CharField()), 1, 8)),
+                output_field=CharField(),
+            ),
+            updated_at=now,
+        )
+
+        # Read the file list under the row lock so the append can't be lost
+        locked = ERPExportBatch.objects.select_for_update().only('files').get(id=batch.id)
+        ERPExportBatch.objects.filter(id=batch.id).update(
+            exported_count=F('exported_count') + exported,
+            chunks_completed=F('chunks_completed') + 1,
+            files=locked.files + [path],
+            updated_at=now,
+        )
+        batch.refresh_from_db(fields=['exported_count', 'chunks_completed', 'files'])
+
+    logger.info(f"ERP export batch {batch.id}: chunk {batch.chunks_completed} "
+                f"({batch.exported_count}/{batch.total})")
+    return True
@@ -0,0 +1,116 @@
+"""
+Incremental ERP change feed.
+
+Every hire, and every later change to a hired employee's offer or position,
+appends an ERPChangeEvent. The ERP sync asks for events after the last
+watermark it processed and receives the current state of each affected
+employee once, however many times it changed in between.
+
+The watermark is the (txid, id) of the last event served, not the id alone:
+ids are allocated at INSERT, so a transaction that commits late can expose
+an id lower than one already served. Reads only return events whose
+transaction id is below the snapshot xmin, i.e. whose transaction and every
+earlier one has finished. Any transaction still open, or not yet started,
+has a txid at or above that horizon, so its events always sort after
+everything served so far and are never skipped.
+"""
+from django.db import connection
+from django.db.models import Q
+
+from ..models import ERPChangeEvent, HiredEmployee
+from .erp_export import employee_record
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+
+
+def format_watermark(txid, event_id):
+    return f'{txid}-{event_id}'
+
+
+def parse_watermark(value):
+    """Parse a `txid-id` watermark; empty means from the beginning. Raises ValueError."""
+    if not value:
+        return None
+    txid, event_id = value.split('-', 1)
+    txid, event_id = int(txid), int(event_id)
+    if txid < 0 or event_id < 0:
+        raise ValueError(value)
+    return txid, event_id
+
+
+def commit_horizon():
+    """
+    Oldest transaction id still in progress; every event with a lower txid is
+    committed (or rolled back). None without Postgres, where writes are
+    serialized and id order is commit order.
+    """
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT txid_snapshot_xmin(txid_current_snapshot())')
+        return cursor.fetchone()[0]
+
+
+def record_changes(employees, reason):
+    """Append one change event per hired employee in the queryset"""
+    rows = employees.values_list('id', 'district_id')
+    ERPChangeEvent.objects.bulk_create([
+        ERPChangeEvent(hired_employee_id=employee_id, district_id=district_id, reason=reason)
+        for employee_id, district_id in rows
+    ])
+
+
+def read_changes(since=None, limit=DEFAULT_LIMIT, district=None):
+    """
+    Return (records, watermark, has_more) for events after the `since` watermark.
+
+    `records` holds the current ERP record of every employee touched by the
+    page of events, ordered by their latest event, each with the event
+    reasons that produced it. `watermark` is the value to pass as `since`
+    on the next call (unchanged when nothing new is available).
+    """
+    cursor = parse_watermark(since)
+    events = ERPChangeEvent.objects.all()
+    if cursor is not None:
+        txid, event_id = cursor
+        events = events.filter(Q(txid__gt=txid) | Q(txid=txid, id__gt=event_id))
+    horizon = commit_horizon()
+    if horizon is not None:
+        events = events.filter(txid__lt=horizon)
+    if district is not None:
+        events = events.filter(district=district)
+
+    page = list(
+        events.order_by('txid', 'id')
+        .values_list('txid', 'id', 'hired_employee_id', 'reason')[:limit + 1]
+    )
+    has_more = len(page) > limit
+    page = page[:limit]
+    if not page:
+        return [], since or '', False
+
+    latest = {}
+    reasons = {}
+    for position, (txid, event_id, employee_id, reason) in enumerate(page):
+        latest[employee_id] = (position, format_watermark(txid, event_id))
+        reasons.setdefault(employee_id, set()).add(reason)
+
+    employees = HiredEmployee.objects.select_related(
+        'application__position', 'offer'
+    ).in_bulk(list(latest))
+
+    records = []
+    for employee_id, (_, seq) in sorted(latest.items(), key=lambda item: item[1][0]):
+        employee = employees.get(employee_id)
+        if employee is None:
+            continue
+        record = employee_record(employee)
+        record['change_seq'] = seq
+        record['change_reasons'] = sorted(reasons[employee_id])
+        record['exported_to_infinite_vision'] = employee.exported_to_infinite_vision
+        record['infinite_vision_employee_id'] = employee.infinite_vision_employee_id
+        records.append(record)
+
+    last_txid, last_id = page[-1][0], page[-1][1]
+    return records, format_watermark(last_txid, last_id), has_more
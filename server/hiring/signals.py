@@ -1,32 +1,117 @@
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 
 from .models import (
+    Position,
+    ScreeningQuestion,
     JobApplication,
     Interview,
     Offer,
     HiredEmployee
 )
+from core.outbox import build_email, enqueue_email, enqueue_emails
+
 from .email_utils import (
-    send_html_email,
     create_offer_email_html,
     create_application_confirmation_html,
     create_interview_invitation_html
 )
+from .cache import invalidate_public_board
+from .services.erp_export import ERP_SOURCE_FIELDS
+from .services.erp_feed import record_changes
+from .search import SEARCH_VECTOR_FIELDS, refresh_search_vector
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_save, sender=JobApplication)
+def update_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Keep the weighted full-text search column in sync with its source fields"""
+    if update_fields is not None:
+        source_fields = {field for field, _ in SEARCH_VECTOR_FIELDS[sender.__name__]}
+        if not source_fields.intersection(update_fields):
+            return
+    refresh_search_vector(sender, instance.pk)
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+@receiver(post_save, sender=ScreeningQuestion)
+@receiver(post_delete, sender=ScreeningQuestion)
+@receiver(m2m_changed, sender=Position.screening_questions.through)
+def invalidate_public_board_cache(sender, **kwargs):
+    """Drop cached job board responses once position data changes are committed"""
+    transaction.on_commit(invalidate_public_board)
+
+
+@receiver(pre_save, sender=HiredEmployee)
+@receiver(pre_save, sender=Offer)
+@receiver(pre_save, sender=Position)
+def snapshot_erp_fields(sender, instance, update_fields=None, **kwargs):
+    """Remember the stored values of the columns the ERP record reads"""
+    instance._erp_snapshot = None
+    if instance._state.adding:
+        return
+    fields = ERP_SOURCE_FIELDS[sender.__name__]
+    if update_fields is not None:
+        updated = {sender._meta.get_field(field).attname for field in update_fields}
+        fields = [field for field in fields if field in updated]
+        if not fields:
+            return
+    instance._erp_snapshot = (
+        sender._base_manager.filter(pk=instance.pk).order_by().values(*fields).first())
+
+
+def _erp_fields_changed(sender, instance, created):
+    """Whether a save changed a column the ERP record reads"""
+    snapshot = getattr(instance, '_erp_snapshot', None)
+    if created or not snapshot:
+        return False
+    return any(
+        sender._meta.get_field(field).to_python(getattr(instance, field)) != stored
+        for field, stored in snapshot.items()
+    )
+
+
+@receiver(post_save, sender=HiredEmployee)
+def record_hire_change(sender, instance, created, **kwargs):
+    """Feed new hires and edits to hired employees to the ERP change log"""
+    if created:
+        record_changes(HiredEmployee.objects.filter(pk=instance.pk), 'hired')
+    elif _erp_fields_changed(sender, instance, created):
+        record_changes(HiredEmployee.objects.filter(pk=instance.pk), 'employee')
+
+
+@receiver(post_save, sender=Offer)
+def record_offer_change(sender, instance, created, **kwargs):
+    """Offer edits after the hire (salary, FTE, start date) must reach the ERP"""
+    if _erp_fields_changed(sender, instance, created):
+        record_changes(HiredEmployee.objects.filter(offer=instance), 'offer')
+
+
+@receiver(post_save, sender=Position)
+def record_position_change(sender, instance, created, **kwargs):
+    """Position edits affect every employee hired into it"""
+    if _erp_fields_changed(sender, instance, created):
+        record_changes(HiredEmployee.objects.filter(application__position=instance), 'position')
 
 
 @receiver(post_save, sender=JobApplication)
 def send_application_confirmation(sender, instance, created, **kwargs):
-    """Send confirmation email when application is submitted"""
+    """Queue the confirmation email in the same transaction as the application"""
     if created:
-        subject = f'Application Received - {instance.position.title}'
+        send_application_confirmation_email(instance)
 
-        # Plain text version
-        plain_text = f"""Dear {instance.applicant_name},
+
+def send_application_confirmation_email(instance):
+    """Queue the application confirmation email to the applicant"""
+    subject = f'Application Received - {instance.position.title}'
+
+    # Plain text version
+    plain_text = f"""Dear {instance.applicant_name},
 
 Thank you for applying for the {instance.position.title} position at School Demo District.
 
@@ -45,25 +130,22 @@ Best regards,
 School Demo District Human Resources Team
 """
 
-        # HTML version with inline CSS
-        html_content = create_application_confirmation_html(instance)
+    # HTML version with inline CSS
+    html_content = create_application_confirmation_html(instance)
 
-        try:
-            send_html_email(
-                subject,
-                html_content,
-                plain_text,
-                settings.DEFAULT_FROM_EMAIL,
-                [instance.applicant_email]
-            )
-        except Exception as e:
-            # Log error but don't fail the application submission
-            print(f"Failed to send application confirmation email: {e}")
+    enqueue_email(
+        subject,
+        plain_text,
+        [instance.applicant_email],
+        html_body=html_content,
+        district=instance.district,
+        category='application_confirmation',
+    )
 
 
 @receiver(post_save, sender=Interview)
 def send_interview_notifications(sender, instance, created, **kwargs):
-    """Send notifications when interview is scheduled"""
+    """Queue notifications when interview is scheduled"""
     if created:
         # Send to candidate
         send_candidate_interview_invitation(instance)
@@ -99,30 +181,30 @@ School Demo District HR Team
     # HTML version with inline CSS
     html_content = create_interview_invitation_html(interview)
 
-    try:
-        send_html_email(
-            subject,
-            html_content,
-            plain_text,
-            settings.DEFAULT_FROM_EMAIL,
-            [interview.application.applicant_email]
-        )
-    except Exception as e:
-        print(f"Failed to send interview invitation: {e}")
+    enqueue_email(
+        subject,
+        plain_text,
+        [interview.application.applicant_email],
+        html_body=html_content,
+        district=interview.district,
+        category='interview_invitation',
+    )
 
 
 def send_interviewer_notifications(interview):
-    """Send notifications to interview panel members"""
-    for interviewer in interview.stage.interviewers.all():
-        subject = f'Interview Scheduled - {interview.application.applicant_name}'
-        message = f"""
-        Hello {interviewer.name},
+    """Queue one notification per interview panel member in a single batch"""
+    interviewers = list(interview.stage.interviewers.all())
+    if not interviewers:
+        return
 
-        You have been assigned to interview {interview.application.applicant_name} for the {interview.application.position.title} position.
+    application = interview.application
+    subject = f'Interview Scheduled - {application.applicant_name}'
+    panel = chr(10).join([f'- {i.name} ({i.role})' for i in interviewers])
+    details = f"""You have been assigned to interview {application.applicant_name} for the {application.position.title} position.
 
         Interview Details:
         - Stage: {interview.stage.stage_name}
-        - Candidate: {interview.application.applicant_name} ({interview.application.applicant_email})
+        - Candidate: {application.applicant_name} ({application.applicant_email})
         - Date: {interview.scheduled_date.strftime('%A, %B %d, %Y')}
         - Time: {interview.scheduled_time.strftime('%I:%M %p')}
         - Location: {interview.location}
@@ -130,7 +212,7 @@ def send_interviewer_notifications(interview):
         {f'Join Meeting: {interview.zoom_link}' if interview.zoom_link else ''}
 
         Panel Members:
-        {chr(10).join([f'- {i.name} ({i.role})' for i in interview.stage.interviewers.all()])}
+        {panel}
 
         Please add this to your calendar.
 
@@ -138,16 +220,19 @@ def send_interviewer_notifications(interview):
         HR System
         """
 
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [interviewer.email],
-                fail_silently=True,
-            )
-        except Exception as e:
-            print(f"Failed to send interviewer notification: {e}")
+    enqueue_emails([
+        build_email(
+            subject,
+            f"""
+        Hello {interviewer.name},
+
+        {details}""",
+            [interviewer.email],
+            district=interview.district,
+            category='interviewer_notification',
+        )
+        for interviewer in interviewers
+    ])
 
 
 @receiver(post_save, sender=Offer)
@@ -163,9 +248,7 @@ def send_offer_notification(sender, instance, created, **kwargs):
 
         # Plain text version
         if instance.template_text and instance.template_data:
-            plain_message_body = instance.template_text
-            for key, value in instance.template_data.items():
-                plain_message_body = plain_message_body.replace(f'{{{{{key}}}}}', str(value))
+            plain_message_body = instance.get_filled_text()
         else:
             plain_message_body = f"""Dear {instance.application.applicant_name},
 
@@ -206,17 +289,14 @@ Please respond by {instance.expiration_date.strftime('%B %d, %Y')}.
         # HTML version with inline CSS
         html_content = create_offer_email_html(instance, accept_url, reject_url)
 
-        try:
-            send_html_email(
-                subject,
-                html_content,
-                plain_text,
-                settings.DEFAULT_FROM_EMAIL,
-                [instance.application.applicant_email, "starodu5@gmail.com", "demo-admin@example.com"]
-            )
-            print(f"Offer email sent to: {instance.application.applicant_email}")
-        except Exception as e:
-            print(f"Failed to send offer notification to {instance.application.applicant_email}: {e}")
+        enqueue_email(
+            subject,
+            plain_text,
+            [instance.application.applicant_email, "starodu5@gmail.com", "demo-admin@example.com"],
+            html_body=html_content,
+            district=instance.district,
+            category='offer',
+        )
 
 
 @receiver(pre_save, sender=Offer)
@@ -249,16 +329,13 @@ def notify_offer_status_change(sender, instance, created, **kwargs):
         HR System
         """
 
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [settings.DEFAULT_FROM_EMAIL],  # Send to HR email
-                fail_silently=True,
-            )
-        except Exception as e:
-            print(f"Failed to send offer status notification: {e}")
+        enqueue_email(
+            subject,
+            message,
+            [settings.DEFAULT_FROM_EMAIL],  # Send to HR email
+            district=instance.district,
+            category='offer_status',
+        )
 
 
 @receiver(post_save, sender=HiredEmployee)
@@ -287,13 +364,10 @@ def send_onboarding_notification(sender, instance, created, **kwargs):
         School Demo District Human Resources Team
         """
 
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [instance.application.applicant_email],
-                fail_silently=True,
-            )
-        except Exception as e:
-            print(f"Failed to send onboarding notification: {e}")
+        enqueue_email(
+            subject,
+            message,
+            [instance.application.applicant_email],
+            district=instance.district,
+            category='hire_welcome',
+        )
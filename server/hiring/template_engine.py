@@ -0,0 +1,92 @@
+"""
+Compiled renderer for offer letter templates.
+
+Offer templates use `{{fieldName}}` placeholders. Rather than running one
+`str.replace` over the whole letter per field, a template is tokenized once
+into alternating literal and placeholder segments and rendered with a single
+join. Compiled templates are cached per process keyed by a hash of the
+template text, so rendering a list of offers that share a template parses
+it only once.
+
+Placeholders with no matching key in the data are left in place, matching
+the previous replace-based behaviour.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+PLACEHOLDER_RE = re.compile(r'\{\{([^{}]+)\}\}')
+FIELD_NAME_RE = re.compile(r'\w+')
+
+COMPILED_CACHE_SIZE = 128
+
+_compiled = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+class CompiledTemplate:
+    """A template split into literal text and placeholder names"""
+
+    __slots__ = ('literals', 'names', 'fields')
+
+    def __init__(self, text):
+        # literals[i] precedes names[i]; literals has one trailing element
+        self.literals = []
+        self.names = []
+        position = 0
+        for match in PLACEHOLDER_RE.finditer(text):
+            self.literals.append(text[position:match.start()])
+            self.names.append(match.group(1))
+            position = match.end()
+        self.literals.append(text[position:])
+
+        # Fillable field names in order of first appearance
+        self.fields = tuple(dict.fromkeys(
+            name for name in self.names if FIELD_NAME_RE.fullmatch(name)))
+
+    def render(self, data):
+        """Fill placeholders from data in a single pass"""
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            if name in data:
+                parts.append(str(data[name]))
+            else:
+                parts.append(f'{{{{{name}}}}}')
+            parts.append(literal)
+        return ''.join(parts)
+
+
+def template_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def compile_template(text):
+    """Return the cached CompiledTemplate for text, compiling it on first use"""
+    key = template_hash(text)
+    with _compiled_lock:
+        compiled = _compiled.get(key)
+        if compiled is not None:
+            _compiled.move_to_end(key)
+            return compiled
+
+    compiled = CompiledTemplate(text)
+    with _compiled_lock:
+        _compiled[key] = compiled
+        while len(_compiled) > COMPILED_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return compiled
+
+
+def render_template(text, data):
+    """Render template text with data; returns text unchanged when there is no data"""
+    if not text or not data:
+        return text or ''
+    return compile_template(text).render(data)
+
+
+def extract_fields(text):
+    """Return the `{{field}}` names used in text, in order of first appearance"""
+    if not text:
+        return []
+    return list(compile_template(text).fields)
@@ -1,4 +1,1325 @@
-from django.test import TestCase
+import io
+import pytest
+from datetime import date, time, timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 
-# Create your tests here.
+def create_position(district, index, stage_count=2, applicant_count=2):
+    """Create an open position with stages, interviewers, applications and interviews"""
+    from hiring.models import (
+        Position, InterviewStage, Interviewer, JobApplication, Interview, ScreeningQuestion
+    )
+
+    today = date.today()
+    position = Position.objects.create(
+        district=district,
+        req_id=f"REQ-{index:04d}",
+        title=f"Teacher {index}",
+        department="Education",
+        worksite="Central High",
+        primary_job_title="Teacher",
+        salary_range="$50,000 - $60,000",
+        start_date=today + timedelta(days=30),
+        status='Open',
+        employee_category="Certified",
+        eeoc_classification="Professional",
+        workers_comp_classification="Teacher",
+        leave_plan="Standard",
+        deduction_template="Standard",
+        posting_start_date=today - timedelta(days=1),
+        posting_end_date=today + timedelta(days=14),
+        interview_stages=stage_count,
+    )
+    question = ScreeningQuestion.objects.create(
+        district=district, question=f"Question {index}", category='general')
+    position.screening_questions.add(question)
+
+    stages = []
+    for number in range(1, stage_count + 1):
+        stage = InterviewStage.objects.create(
+            district=district, position=position,
+            stage_number=number, stage_name=f"Stage {number}")
+        Interviewer.objects.create(
+            district=district, stage=stage,
+            name=f"Interviewer {number}", email=f"interviewer{number}@test.com", role="Principal")
+        stages.append(stage)
+
+    for applicant in range(applicant_count):
+        application = JobApplication.objects.create(
+            district=district,
+            position=position,
+            applicant_name=f"Applicant {index}-{applicant}",
+            applicant_email=f"applicant{index}-{applicant}@test.com",
+            start_date_availability=today,
+            resume='resumes/test.pdf',
+        )
+        Interview.objects.create(
+            district=district,
+            application=application,
+            stage=stages[0],
+            scheduled_date=today + timedelta(days=3),
+            scheduled_time=time(10, 0),
+            location="Room 101",
+        )
+
+    return position
+
+
+def create_offer(district, application, **fields):
+    """Create a pending offer expiring in a week; `fields` override the defaults"""
+    from hiring.models import Offer
+
+    today = date.today()
+    values = {
+        'salary': 50000, 'fte': 1, 'start_date': today, 'offer_date': today,
+        'expiration_date': today + timedelta(days=7),
+    }
+    values.update(fields)
+    return Offer.objects.create(district=district, application=application, **values)
+
+
+def hire_all(district, position):
+    """Make an offer to and hire every applicant of the position"""
+    from hiring.models import HiredEmployee, JobApplication
+
+    employees = []
+    for application in JobApplication.objects.filter(position=position).order_by('applicant_email'):
+        offer = create_offer(district, application)
+        employees.append(HiredEmployee.objects.create(
+            district=district, application=application, offer=offer, hire_date=offer.start_date))
+    return employees
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestPositionListQueries:
+    """The position list must cost a fixed number of queries per page"""
+
+    def _list_query_count(self, api_client):
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get('/api/hiring/positions/')
+        assert response.status_code == 200
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_does_not_grow_with_page_size(self, api_client, district1):
+        for index in range(2):
+            create_position(district1, index)
+        small_page_queries, _ = self._list_query_count(api_client)
+
+        for index in range(2, 20):
+            create_position(district1, index)
+        full_page_queries, data = self._list_query_count(api_client)
+
+        assert len(data['results']) == 20
+        assert full_page_queries == small_page_queries
+        # COUNT for pagination, positions, screening questions, stages, interviewers
+        assert full_page_queries <= 5
+
+    def test_annotated_counts_match_properties(self, api_client, district1):
+        position = create_position(district1, 0, applicant_count=3)
+
+        _, data = self._list_query_count(api_client)
+        row = data['results'][0]
+
+        assert row['applicant_count'] == position.applicant_count == 3
+        assert row['interview_count'] == position.interview_count == 3
+        assert [stage['stage_number'] for stage in row['stages']] == [1, 2]
+        assert len(row['stages'][0]['interviewers']) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestPublicJobBoardCache:
+    """The public board is served from cache with an ETag until positions change"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def _board(self, api_client, **headers):
+        return api_client.get('/api/hiring/positions/public/', **headers)
+
+    def test_etag_and_not_modified(self, api_client, district1):
+        create_position(district1, 0)
+
+        response = self._board(api_client)
+        assert response.status_code == 200
+        etag = response['ETag']
+        assert etag.startswith('"') and etag.endswith('"')
+        assert response['Cache-Control'] == 'public, max-age=0, must-revalidate'
+
+        response = self._board(api_client, HTTP_IF_NONE_MATCH=f'"stale", {etag}')
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert not response.content
+
+        assert self._board(api_client, HTTP_IF_NONE_MATCH='"stale"').status_code == 200
+
+    def test_cache_hit_runs_no_queries(self, api_client, district1):
+        create_position(district1, 0)
+        first = self._board(api_client)
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = self._board(api_client)
+        assert len(ctx.captured_queries) == 0
+        assert second.data == first.data and second['ETag'] == first['ETag']
+
+    def test_position_write_invalidates(self, api_client, district1, django_capture_on_commit_callbacks):
+        position = create_position(district1, 0)
+        etag = self._board(api_client)['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            position.title = 'Renamed Teacher'
+            position.save()
+
+        response = self._board(api_client, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data[0]['title'] == 'Renamed Teacher'
+        assert response['ETag'] != etag
+
+    def test_screening_question_write_invalidates(self, api_client, district1,
+                                                 django_capture_on_commit_callbacks):
+        position = create_position(district1, 0)
+        etag = self._board(api_client)['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            question = position.screening_questions.get()
+            question.question = 'Why do you want to teach here?'
+            question.save()
+
+        response = self._board(api_client, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestDashboardStatsCache:
+    """Stats are cached per district and computed once per concurrent miss"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def _stats(self, api_client, district=None):
+        headers = {'HTTP_X_DISTRICT_ID': str(district.id)} if district else {}
+        response = api_client.get('/api/hiring/positions/stats/', **headers)
+        assert response.status_code == 200
+        return response.data
+
+    def test_cached_per_district(self, api_client, district1, district2):
+        create_position(district1, 0)
+        create_position(district1, 1)
+        create_position(district2, 2)
+
+        assert self._stats(api_client, district1)['total_positions'] == 2
+        assert self._stats(api_client, district2)['total_positions'] == 1
+        assert self._stats(api_client)['total_positions'] == 3
+
+        create_position(district1, 3)
+        with CaptureQueriesContext(connection) as ctx:
+            assert self._stats(api_client, district1)['total_positions'] == 2
+        assert not any('positions' in query['sql'] for query in ctx.captured_queries)
+
+    def test_concurrent_misses_compute_once(self):
+        import threading
+        from hiring.cache import get_or_compute
+
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def compute():
+            calls.append(1)
+            threading.Event().wait(0.1)
+            return {'total': 1}
+
+        results = []
+
+        def read():
+            barrier.wait()
+            results.append(get_or_compute('hiring:stats:test', compute, timeout=30))
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{'total': 1}] * 8
+
+    def test_waits_for_another_worker_holding_the_lock(self):
+        import threading
+        from django.core.cache import cache
+        from hiring.cache import get_or_compute
+
+        key = 'hiring:stats:other-worker'
+        cache.add(f'{key}:lock', 1, timeout=10)
+        threading.Timer(0.1, lambda: cache.set(key, 'from other worker', 30)).start()
+
+        def compute():
+            raise AssertionError('computed while another worker held the lock')
+
+        assert get_or_compute(key, compute, timeout=30) == 'from other worker'
+
+
+@pytest.mark.django_db
+class TestPositionStageSync:
+    """Updating stage_data keeps unchanged rows and only adds or removes the difference"""
+
+    def test_reconciles_stages_and_interviewers(self, district1):
+        from hiring.models import Interview, InterviewStage, Interviewer
+        from hiring.serializers import PositionDetailSerializer
+
+        position = create_position(district1, 0, stage_count=2, applicant_count=1)
+        first = position.stages.get(stage_number=1)
+        kept = first.interviewers.get()
+        dropped = Interviewer.objects.create(
+            district=district1, stage=first, name='Dropped', email='dropped@test.com', role='Coach')
+        removed_stage = position.stages.get(stage_number=2)
+        removed_interviewer = removed_stage.interviewers.get()
+
+        serializer = PositionDetailSerializer(position, data={'stage_data': [
+            {'stage_number': 1, 'stage_name': 'Screening', 'interviewer_data': [
+                {'name': kept.name, 'email': kept.email.upper(), 'role': kept.role},
+                {'name': 'New Panelist', 'email': 'panelist@test.com', 'role': 'Teacher'},
+            ]},
+            {'stage_number': 3, 'stage_name': 'Demo Lesson', 'interviewer_data': [
+                {'name': 'Department Head', 'email': 'head@test.com', 'role': 'Head'},
+            ]},
+        ]}, partial=True)
+        assert serializer.is_valid(), serializer.errors
+        serializer.save()
+
+        stages = {stage.stage_number: stage for stage in InterviewStage.objects.filter(position=position)}
+        assert set(stages) == {1, 3}
+        assert stages[1].id == first.id and stages[1].stage_name == 'Screening'
+        assert not InterviewStage.objects.filter(id=removed_stage.id).exists()
+        assert not Interviewer.objects.filter(id__in=[removed_interviewer.id, dropped.id]).exists()
+
+        first_panel = {i.email.lower(): i for i in stages[1].interviewers.all()}
+        assert set(first_panel) == {kept.email.lower(), 'panelist@test.com'}
+        assert first_panel[kept.email.lower()].id == kept.id
+        assert first_panel['panelist@test.com'].district_id == district1.id
+        assert [i.email for i in stages[3].interviewers.all()] == ['head@test.com']
+        # Interviews scheduled on the kept stage survive
+        assert Interview.objects.filter(stage=first).count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestAsyncApplicationIntake:
+    """Async intake stages the submission, then the worker persists or fails it"""
+
+    @pytest.fixture(autouse=True)
+    def async_intake(self, settings, tmp_path):
+        settings.APPLICATION_INTAKE_MODE = 'async'
+        settings.MEDIA_ROOT = str(tmp_path)
+
+    def _submit(self, api_client, position):
+        import json
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        return api_client.post('/api/hiring/applications/', {
+            'position': str(position.id),
+            'applicant_name': 'Async Applicant',
+            'applicant_email': 'async@test.com',
+            'start_date_availability': date.today().isoformat(),
+            'references': json.dumps([{'name': 'Ref One', 'email': 'ref@test.com'}]),
+            'resume': SimpleUploadedFile('cv.pdf', b'%PDF-1.4 test', content_type='application/pdf'),
+        }, format='multipart')
+
+    def test_submit_returns_tracking_id_and_worker_persists(self, api_client, district1):
+        from hiring.models import ApplicationSubmission, JobApplication
+        from hiring.services.application_intake import process_submission
+
+        position = create_position(district1, 0, applicant_count=0)
+        response = self._submit(api_client, position)
+
+        assert response.status_code == 202
+        submission = ApplicationSubmission.objects.get(id=response.data['tracking_id'])
+        assert submission.status == 'Pending'
+        assert not JobApplication.objects.filter(applicant_email='async@test.com').exists()
+
+        submission = process_submission(submission.id)
+        assert submission.status == 'Completed' and submission.attempts == 1
+        application = JobApplication.objects.get(applicant_email='async@test.com')
+        assert submission.application_id == application.id
+        assert application.district_id == district1.id
+        assert [r.email for r in application.references.all()] == ['ref@test.com']
+        # A second run finds the submission already claimed
+        assert process_submission(submission.id) is None
+
+        status_response = api_client.get(f"/api/hiring/applications/intake/{submission.id}/")
+        assert status_response.data['status'] == 'Completed'
+        assert status_response.data['application'] == str(application.id)
+
+    def test_failure_marks_submission_failed(self, api_client, district1):
+        from unittest import mock
+        from hiring.models import ApplicationSubmission, JobApplication
+        from hiring.services.application_intake import process_submission
+
+        position = create_position(district1, 0, applicant_count=0)
+        tracking_id = self._submit(api_client, position).data['tracking_id']
+
+        with mock.patch('hiring.services.application_intake.persist_application',
+                        side_effect=RuntimeError('database unavailable')):
+            submission = process_submission(tracking_id)
+
+        assert submission.status == 'Failed'
+        assert 'database unavailable' in submission.error_message
+        assert ApplicationSubmission.objects.get(id=tracking_id).status == 'Failed'
+        assert not JobApplication.objects.filter(applicant_email='async@test.com').exists()
+
+    def test_command_reclaims_stale_processing(self, api_client, district1):
+        from django.core.management import call_command
+        from django.utils import timezone
+        from hiring.models import ApplicationSubmission, JobApplication
+
+        position = create_position(district1, 0, applicant_count=0)
+        tracking_id = self._submit(api_client, position).data['tracking_id']
+        # A worker claimed the submission, then died
+        ApplicationSubmission.objects.filter(id=tracking_id).update(
+            status='Processing', updated_at=timezone.now() - timedelta(hours=1))
+
+        call_command('process_application_intake', '--stale-after', '7200', stdout=io.StringIO())
+        assert ApplicationSubmission.objects.get(id=tracking_id).status == 'Processing'
+
+        call_command('process_application_intake', '--stale-after', '600', stdout=io.StringIO())
+        submission = ApplicationSubmission.objects.get(id=tracking_id)
+        assert submission.status == 'Completed'
+        assert JobApplication.objects.filter(applicant_email='async@test.com').count() == 1
+
+    def test_failed_staging_removes_resume(self, api_client, district1, tmp_path):
+        from unittest import mock
+        from hiring.models import ApplicationSubmission
+
+        position = create_position(district1, 0, applicant_count=0)
+        with mock.patch.object(ApplicationSubmission.objects, 'create',
+                               side_effect=RuntimeError('database unavailable')):
+            response = self._submit(api_client, position)
+
+        assert response.status_code == 400
+        assert not [path for path in tmp_path.rglob('*') if path.is_file()]
+
+
+@pytest.mark.django_db
+class TestExpireOffers:
+    """Only overdue Pending offers expire, with one HR digest per district"""
+
+    def test_expires_overdue_pending_offers(self, district1, district2):
+        from django.core.management import call_command
+        from core.models import EmailOutbox
+        from hiring.models import JobApplication, Offer
+
+        today = date.today()
+
+        def offer(application, expires_in, status='Pending'):
+            # Saving a past expiration_date would expire the offer in pre_save,
+            # so create it live and backdate it with update().
+            created = create_offer(
+                application.district, application, offer_date=today - timedelta(days=10),
+                expiration_date=today + timedelta(days=30), status=status)
+            Offer.objects.filter(id=created.id).update(expiration_date=today + timedelta(days=expires_in))
+            return created
+
+        first = list(JobApplication.objects.filter(position=create_position(district1, 0, applicant_count=4)))
+        second = list(JobApplication.objects.filter(position=create_position(district2, 1, applicant_count=1)))
+        overdue = [offer(first[0], -1), offer(first[1], -5), offer(second[0], -2)]
+        due_today = offer(first[2], 0)
+        accepted = offer(first[3], -3, status='Accepted')
+        EmailOutbox.objects.all().delete()
+
+        call_command('expire_offers', stdout=io.StringIO())
+
+        statuses = dict(Offer.objects.values_list('id', 'status'))
+        assert all(statuses[o.id] == 'Expired' for o in overdue)
+        assert statuses[due_today.id] == 'Pending'
+        assert statuses[accepted.id] == 'Accepted'
+
+        digests = EmailOutbox.objects.filter(category='offer_expiry_digest')
+        assert sorted(digests.values_list('district_id', flat=True)) == sorted([district1.id, district2.id])
+        assert digests.get(district=district1).subject.startswith('2 offer(s) expired')
+
+        call_command('expire_offers', stdout=io.StringIO())
+        assert digests.count() == 2
+
+    def test_locks_only_offer_rows(self, district1):
+        from django.core.management import call_command
+        from hiring.models import JobApplication, Offer
+
+        application = JobApplication.objects.get(position=create_position(district1, 0, applicant_count=1))
+        overdue = create_offer(district1, application, expiration_date=date.today() + timedelta(days=30))
+        Offer.objects.filter(id=overdue.id).update(expiration_date=date.today() - timedelta(days=1))
+
+        with CaptureQueriesContext(connection) as ctx:
+            call_command('expire_offers', '--no-digest', stdout=io.StringIO())
+
+        locking = [query['sql'] for query in ctx.captured_queries if 'FOR UPDATE' in query['sql']]
+        assert len(locking) == 1
+        assert 'JOIN' not in locking[0]
+        assert Offer.objects.get(id=overdue.id).status == 'Expired'
+
+    def test_prunes_expired_idempotency_records(self, settings):
+        from django.core.management import call_command
+        from django.utils import timezone
+        from core.models import IdempotencyRecord
+
+        settings.IDEMPOTENCY_KEY_TTL = 60
+        for key in ('old', 'new'):
+            IdempotencyRecord.objects.create(scope='offers.accept:1', key=key, request_hash='x', status_code=200)
+        IdempotencyRecord.objects.filter(key='old').update(created_at=timezone.now() - timedelta(seconds=61))
+
+        call_command('expire_offers', '--dry-run', stdout=io.StringIO())
+        assert IdempotencyRecord.objects.count() == 2
+
+        out = io.StringIO()
+        call_command('expire_offers', stdout=out)
+        assert list(IdempotencyRecord.objects.values_list('key', flat=True)) == ['new']
+        assert 'Deleted 1 expired idempotency record(s)' in out.getvalue()
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestApplicationCursorPagination:
+    """Cursor pages are stable and disjoint even when submitted_at ties"""
+
+    def test_pages_do_not_overlap_on_equal_timestamps(self, authenticated_client, district1):
+        from unittest import mock
+        from django.utils import timezone
+        from core.pagination import KeysetPagination
+        from hiring.models import JobApplication
+
+        position = create_position(district1, 0, applicant_count=8)
+        JobApplication.objects.filter(position=position).update(submitted_at=timezone.now())
+        expected = [str(pk) for pk in JobApplication.objects.filter(
+            position=position).order_by('-submitted_at', '-id').values_list('id', flat=True)]
+
+        pages = []
+        with mock.patch.object(KeysetPagination, 'page_size', 3):
+            url = '/api/hiring/applications/?cursor='
+            while url:
+                response = authenticated_client.get(url)
+                assert response.status_code == 200 and 'count' not in response.data
+                pages.append([row['id'] for row in response.data['results']])
+                url = response.data['next']
+
+            # Walking back from the last page returns the previous page unchanged
+            previous = authenticated_client.get(response.data['previous'])
+            assert [row['id'] for row in previous.data['results']] == pages[-2]
+
+        assert [len(page) for page in pages] == [3, 3, 2]
+        assert [pk for page in pages for pk in page] == expected
+
+    def test_interview_pages_follow_schedule_order(self, authenticated_client, district1):
+        from unittest import mock
+        from core.pagination import KeysetPagination
+        from hiring.models import Interview
+
+        position = create_position(district1, 0, applicant_count=5)
+        interviews = list(Interview.objects.filter(application__position=position).order_by('id'))
+        # Two interviews share a slot; id breaks the tie
+        for interview, hour in zip(interviews, (14, 9, 9, 11, 16)):
+            interview.scheduled_time = time(hour, 0)
+            interview.save(update_fields=['scheduled_time'])
+        expected = [str(pk) for pk in Interview.objects.filter(application__position=position).order_by(
+            'scheduled_date', 'scheduled_time', 'id').values_list('id', flat=True)]
+
+        pages = []
+        with mock.patch.object(KeysetPagination, 'page_size', 2):
+            url = '/api/hiring/interviews/?cursor='
+            while url:
+                response = authenticated_client.get(url)
+                assert response.status_code == 200 and 'count' not in response.data
+                pages.append([row['id'] for row in response.data['results']])
+                url = response.data['next']
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [pk for page in pages for pk in page] == expected
+
+    def test_tampered_cursor_is_not_found(self, authenticated_client):
+        import base64
+        import json
+
+        for values in (['x', 'y'], ['2026-01-01T00:00:00+00:00', 'not-a-uuid'], ['x']):
+            cursor = base64.urlsafe_b64encode(json.dumps({'v': values}).encode()).decode().rstrip('=')
+            response = authenticated_client.get(f'/api/hiring/applications/?cursor={cursor}')
+            assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+    """Signal emails are queued with the business change and sent by the worker"""
+
+    def test_application_email_is_queued_not_sent(self, district1):
+        from django.core import mail
+        from core.models import EmailOutbox
+
+        create_position(district1, 0, applicant_count=1)
+
+        assert len(mail.outbox) == 0
+        assert EmailOutbox.objects.filter(
+            category='application_confirmation', status='pending').count() == 1
+
+    def test_worker_delivers_and_records_status(self, district1):
+        from django.core import mail
+        from core.models import EmailOutbox
+        from core.outbox import deliver_due
+
+        create_position(district1, 0, applicant_count=1)
+        queued = EmailOutbox.objects.count()
+
+        sent, failed = deliver_due()
+
+        assert (sent, failed) == (queued, 0)
+        assert len(mail.outbox) == queued
+        assert not EmailOutbox.objects.exclude(status='sent').exists()
+
+    def test_send_batch_reports_failures_per_message(self):
+        from unittest import mock
+        from django.core.mail import EmailMessage, get_connection
+        from core.mail import send_batch
+
+        messages = [EmailMessage('s', 'b', 'hr@test.com', [f'user{i}@test.com']) for i in range(3)]
+        connection = get_connection()
+        original = connection.send_messages
+
+        def flaky(batch):
+            if batch[0].to == ['user1@test.com']:
+                raise OSError('recipient refused')
+            return original(batch)
+
+        with mock.patch.object(connection, 'send_messages', side_effect=flaky):
+            failures = send_batch(messages, connection)
+
+        assert list(failures) == [1]
+
+
+class TestTemplateEngine:
+    """Compiled offer templates render like the old per-key str.replace"""
+
+    def test_render_fills_known_and_keeps_unknown_placeholders(self):
+        from hiring.template_engine import render_template
+
+        text = 'Dear {{candidateName}}, salary {{salary}}. {{unknown}} - {{candidateName}}'
+        rendered = render_template(text, {'candidateName': 'Ana', 'salary': 50000})
+
+        assert rendered == 'Dear Ana, salary 50000. {{unknown}} - Ana'
+
+    def test_fields_are_unique_and_ordered(self):
+        from hiring.template_engine import extract_fields
+
+        assert extract_fields('{{b}} {{a}} {{b}} {{ spaced }}') == ['b', 'a']
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestOfferTemplatePreview:
+    """Previews map snake_case keys, escape HTML and cache per template text and data"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def _preview(self, api_client, template, data):
+        response = api_client.post(
+            f'/api/hiring/offer-templates/{template.id}/preview/', {'data': data}, format='json')
+        assert response.status_code == 200
+        return response.data
+
+    def test_maps_snake_case_keys_and_escapes_html(self, api_client):
+        from hiring.models import OfferTemplate
+
+        template = OfferTemplate.objects.create(
+            template_text='Dear {{candidateName}},\nSalary: {{salary}} {{startDate}}')
+        data = self._preview(api_client, template, {
+            'candidate_name': '<b>Ana</b> & Co', 'salary': 50000})
+
+        assert data['filled_text'] == 'Dear <b>Ana</b> & Co,\nSalary: 50000 {{startDate}}'
+        assert data['filled_html'] == (
+            'Dear &lt;b&gt;Ana&lt;/b&gt; &amp; Co,<br>Salary: 50000 {{startDate}}')
+        assert data['extracted_fields'] == ['candidateName', 'salary', 'startDate']
+        assert data['missing_fields'] == ['startDate']
+
+    def test_cache_is_keyed_by_template_text_and_data(self, api_client):
+        from unittest import mock
+        from hiring.models import OfferTemplate
+        from hiring.template_engine import compile_template
+
+        template = OfferTemplate.objects.create(template_text='Hello {{name}}')
+        with mock.patch('hiring.views.templates.compile_template',
+                        side_effect=compile_template) as compiled:
+            assert self._preview(api_client, template, {'name': 'Ana'})['filled_text'] == 'Hello Ana'
+            assert self._preview(api_client, template, {'name': 'Ana'})['filled_text'] == 'Hello Ana'
+            assert compiled.call_count == 1
+
+            assert self._preview(api_client, template, {'name': 'Bo'})['filled_text'] == 'Hello Bo'
+            assert compiled.call_count == 2
+
+            template.template_text = 'Hi {{name}}'
+            template.save()
+            assert self._preview(api_client, template, {'name': 'Ana'})['filled_text'] == 'Hi Ana'
+            assert compiled.call_count == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestDocuSignConnectWebhook:
+    """Connect events are HMAC-verified and stored on the offer"""
+
+    def _post(self, api_client, payload, key):
+        import base64
+        import hashlib
+        import hmac
+        import json
+
+        body = json.dumps(payload).encode('utf-8')
+        signature = base64.b64encode(hmac.new(key.encode(), body, hashlib.sha256).digest()).decode()
+        return api_client.generic(
+            'POST', '/api/hiring/docusign/connect/', body,
+            content_type='application/json', HTTP_X_DOCUSIGN_SIGNATURE_1=signature)
+
+    def test_rejects_bad_signature(self, api_client, settings):
+        settings.DOCUSIGN_CONNECT_HMAC_KEYS = ['secret']
+        response = self._post(api_client, {'data': {'envelopeId': 'env-1'}}, 'wrong')
+        assert response.status_code == 401
+
+    def test_persists_envelope_status(self, api_client, district1, settings):
+        from hiring.models import JobApplication
+
+        settings.DOCUSIGN_CONNECT_HMAC_KEYS = ['secret']
+        position = create_position(district1, 0, applicant_count=1)
+        offer = create_offer(
+            district1, JobApplication.objects.get(position=position),
+            docusign_envelope_id='env-1', docusign_status='sent')
+
+        response = self._post(api_client, {
+            'event': 'envelope-completed',
+            'data': {
+                'envelopeId': 'env-1',
+                'envelopeSummary': {
+                    'status': 'completed',
+                    'recipients': {'signers': [
+                        {'recipientId': '1', 'email': 'a@test.com', 'status': 'completed'}]},
+                },
+            },
+        }, 'secret')
+
+        assert response.status_code == 200
+        offer.refresh_from_db()
+        assert offer.docusign_status == 'completed'
+        assert offer.docusign_recipients[0]['status'] == 'completed'
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestDocuSignBulkSend:
+    """Bulk sends report one result per offer and count unsent drafts as failures"""
+
+    class FakeService:
+        def authenticate(self):
+            pass
+
+        def create_envelope_from_template(self, recipient_email, recipient_name, subject, tabs_data):
+            if recipient_email.endswith('-1@test.com'):
+                raise RuntimeError('DocuSign unavailable')
+            if recipient_email.endswith('-2@test.com'):
+                # Draft created, final send failed
+                return {'envelopeId': 'env-draft', 'status': 'created', 'signingUrl': 'https://sign/draft'}
+            return {'envelopeId': 'env-sent', 'status': 'sent', 'signingUrl': 'https://sign/sent'}
+
+    def test_partial_failure(self, authenticated_client, district1, settings):
+        import uuid
+        from unittest import mock
+        from hiring.models import JobApplication, Offer
+
+        settings.DOCUSIGN_BULK_RATE_LIMIT = 0
+        position = create_position(district1, 0, applicant_count=3)
+        offers = [
+            create_offer(district1, application)
+            for application in JobApplication.objects.filter(position=position).order_by('applicant_email')
+        ]
+        missing = str(uuid.uuid4())
+
+        with mock.patch('hiring.services.docusign_bulk.get_docusign_service',
+                        return_value=self.FakeService()):
+            response = authenticated_client.post(
+                '/api/hiring/docusign/envelopes/bulk/',
+                {'offer_ids': [str(offer.id) for offer in offers] + [missing]},
+                format='json',
+            )
+
+        assert response.status_code == 200
+        assert (response.data['sent'], response.data['failed']) == (1, 3)
+        results = {result['offer_id']: result for result in response.data['results']}
+        assert set(results) == {str(offer.id) for offer in offers} | {missing}
+        for result in results.values():
+            assert set(result) == {'offer_id', 'ok', 'envelope_id', 'status', 'signing_url', 'error'}
+
+        sent, raised, draft = (results[str(offer.id)] for offer in offers)
+        assert sent['ok'] and sent['envelope_id'] == 'env-sent' and sent['error'] is None
+        assert not raised['ok'] and 'unavailable' in raised['error']
+        assert not draft['ok'] and draft['status'] == 'created' and draft['signing_url'] is None
+        assert results[missing] == {'offer_id': missing, 'ok': False, 'envelope_id': None,
+                                    'status': None, 'signing_url': None, 'error': 'Offer not found'}
+
+        linked = {offer.id: offer.docusign_envelope_id
+                  for offer in Offer.objects.filter(id__in=[offer.id for offer in offers])}
+        assert linked[offers[0].id] == 'env-sent'
+        assert not linked[offers[1].id] and not linked[offers[2].id]
+
+    def test_rejects_oversized_batch(self, authenticated_client, settings):
+        settings.DOCUSIGN_BULK_MAX_BATCH = 2
+        response = authenticated_client.post(
+            '/api/hiring/docusign/envelopes/bulk/', {'offer_ids': ['a', 'b', 'c']}, format='json')
+        assert response.status_code == 400
+
+
+class TestDocuSignEnvelopeLogging:
+    """Envelope creation keeps recipient data off stdout and out of non-debug logs"""
+
+    def test_no_personal_data_logged(self, capsys, caplog, settings):
+        import logging
+        from types import SimpleNamespace
+        from unittest import mock
+        from hiring.services.docusign_service import DocuSignService
+
+        settings.DOCUSIGN_DEBUG = False
+        service = DocuSignService()
+        api = mock.Mock()
+        api.create_envelope.return_value = SimpleNamespace(
+            envelope_id='env-1', status='created', status_date_time=None)
+        api.list_recipients.return_value = SimpleNamespace(
+            signers=[SimpleNamespace(recipient_id='1')])
+        api.create_recipient_view.return_value = SimpleNamespace(url='https://sign/1')
+
+        with mock.patch.object(DocuSignService, 'authenticate'), \
+                mock.patch('hiring.services.docusign_service.EnvelopesApi', return_value=api), \
+                caplog.at_level(logging.DEBUG, logger='hiring.services.docusign_service'):
+            result = service.create_envelope_from_template(
+                'secret.person@test.com', 'Secret Person', 'Offer',
+                {'textTabs': [{'tabLabel': 'salary', 'value': '98765.00'}]})
+
+        assert result['status'] == 'sent'
+        assert capsys.readouterr().out == ''
+        for value in ('secret.person@test.com', 'Secret Person', '98765.00'):
+            assert value not in caplog.text
+
+    @pytest.mark.django_db
+    def test_view_writes_nothing_to_stdout(self, authenticated_client, capsys, caplog):
+        import logging
+        from unittest import mock
+
+        service = mock.Mock()
+        service.create_envelope_from_template.side_effect = [
+            {'envelopeId': 'env-1', 'status': 'sent', 'signingUrl': 'https://sign/secret-token'},
+            RuntimeError('DocuSign unavailable'),
+        ]
+        body = {
+            'emailSubject': 'Offer for Secret Person',
+            'recipients': [{'name': 'Secret Person', 'email': 'secret.person@test.com'}],
+            'tabs': {'textTabs': [{'tabLabel': 'salary', 'value': '98765.00'}]},
+        }
+
+        with mock.patch('hiring.views_extra.docusign.get_docusign_service', return_value=service), \
+                caplog.at_level(logging.DEBUG, logger='hiring.views_extra.docusign'):
+            sent = authenticated_client.post('/api/hiring/docusign/envelopes/', body, format='json')
+            failed = authenticated_client.post('/api/hiring/docusign/envelopes/', body, format='json')
+
+        assert (sent.status_code, failed.status_code) == (201, 400)
+        captured = capsys.readouterr()
+        assert captured.out == '' and captured.err == ''
+        for value in ('secret.person@test.com', 'Secret Person', 'secret-token'):
+            assert value not in caplog.text
+
+
+class TestDocuSignTokenRefresh:
+    """A 401 from DocuSign forces one token refresh and a retry"""
+
+    def _service(self):
+        from unittest import mock
+        from hiring.services.docusign_service import DocuSignService
+
+        service = DocuSignService()
+        service.authenticate = mock.Mock()
+        return service
+
+    def test_retries_once_after_refresh(self):
+        from unittest import mock
+        from docusign_esign import ApiException
+
+        service = self._service()
+        method = mock.Mock(side_effect=[ApiException(status=401), 'ok'])
+
+        assert service._call(method, 'account', envelope_id='env-1') == 'ok'
+        service.authenticate.assert_called_once_with(force=True)
+        assert method.call_count == 2
+        method.assert_called_with('account', envelope_id='env-1')
+
+    def test_other_errors_and_repeated_401_propagate(self):
+        from unittest import mock
+        from docusign_esign import ApiException
+
+        service = self._service()
+        with pytest.raises(ApiException):
+            service._call(mock.Mock(side_effect=ApiException(status=400)))
+        service.authenticate.assert_not_called()
+
+        with pytest.raises(ApiException):
+            service._call(mock.Mock(side_effect=ApiException(status=401)))
+        service.authenticate.assert_called_once_with(force=True)
+
+    def test_refreshes_when_listing_recipients_is_rejected(self, settings):
+        from types import SimpleNamespace
+        from unittest import mock
+        from docusign_esign import ApiException
+        from hiring.services.docusign_service import DocuSignService
+
+        settings.DOCUSIGN_DEBUG = False
+        service = DocuSignService()
+        api = mock.Mock()
+        api.create_envelope.return_value = SimpleNamespace(
+            envelope_id='env-1', status='created', status_date_time=None)
+        api.list_recipients.side_effect = [
+            ApiException(status=401), SimpleNamespace(signers=[SimpleNamespace(recipient_id='1')])]
+        api.create_recipient_view.return_value = SimpleNamespace(url='https://sign/1')
+
+        with mock.patch.object(DocuSignService, 'authenticate') as authenticate, \
+                mock.patch('hiring.services.docusign_service.EnvelopesApi', return_value=api):
+            result = service.create_envelope_from_template(
+                'person@test.com', 'Person', 'Offer',
+                {'textTabs': [{'tabLabel': 'salary', 'value': '50000.00'}]})
+
+        assert result['status'] == 'sent'
+        authenticate.assert_any_call(force=True)
+        assert api.list_recipients.call_count == 2
+        tabs = api.update_tabs.call_args.kwargs['tabs']
+        assert [(tab.tab_label, tab.value) for tab in tabs.text_tabs] == [('salary', '50000.00')]
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestDocuSignSingleSend:
+    """The single-send view links only sent envelopes and rejects bad offer ids"""
+
+    def _post(self, client, offer_id, result):
+        from unittest import mock
+
+        service = mock.Mock()
+        service.create_envelope_from_template.return_value = result
+        with mock.patch('hiring.views_extra.docusign.get_docusign_service', return_value=service):
+            response = client.post('/api/hiring/docusign/envelopes/', {
+                'offer_id': offer_id,
+                'emailSubject': 'Offer',
+                'recipients': [{'name': 'Ana', 'email': 'ana@test.com'}],
+            }, format='json')
+        return response, service
+
+    def test_links_sent_envelope_only(self, authenticated_client, district1):
+        from hiring.models import JobApplication
+
+        position = create_position(district1, 0, applicant_count=1)
+        offer = create_offer(district1, JobApplication.objects.get(position=position))
+
+        self._post(authenticated_client, str(offer.id),
+                   {'envelopeId': 'env-draft', 'status': 'created', 'signingUrl': 'https://sign/1'})
+        offer.refresh_from_db()
+        assert offer.docusign_envelope_id == ''
+
+        self._post(authenticated_client, str(offer.id),
+                   {'envelopeId': 'env-sent', 'status': 'sent', 'signingUrl': 'https://sign/2'})
+        offer.refresh_from_db()
+        assert (offer.docusign_envelope_id, offer.docusign_status) == ('env-sent', 'sent')
+
+    def test_rejects_malformed_offer_id(self, authenticated_client):
+        response, service = self._post(authenticated_client, 'not-an-id', {})
+        assert response.status_code == 400
+        service.create_envelope_from_template.assert_not_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestOfferIdempotency:
+    """Accepting with an Idempotency-Key replays the first response"""
+
+    def _offer(self, district):
+        from hiring.models import JobApplication
+
+        position = create_position(district, 0, applicant_count=1)
+        return create_offer(district, JobApplication.objects.get(position=position))
+
+    def _accept(self, client, offer, key, body=None):
+        return client.post(f'/api/hiring/offers/{offer.id}/accept/', body or {},
+                           format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_replays_stored_response(self, authenticated_client, district1):
+        from hiring.models import HiredEmployee
+
+        offer = self._offer(district1)
+
+        first = self._accept(authenticated_client, offer, 'accept-1')
+        second = self._accept(authenticated_client, offer, 'accept-1')
+
+        assert first.status_code == second.status_code == 200
+        assert second['Idempotent-Replayed'] == 'true'
+        assert second.json() == first.json()
+        assert second.json()['status'] == 'Accepted'
+        assert HiredEmployee.objects.filter(application=offer.application).count() == 1
+
+    def test_rejects_key_reused_with_different_body(self, authenticated_client, district1):
+        offer = self._offer(district1)
+
+        assert self._accept(authenticated_client, offer, 'accept-2', {'note': 'a'}).status_code == 200
+        response = self._accept(authenticated_client, offer, 'accept-2', {'note': 'b'})
+        assert response.status_code == 422
+
+    def test_accepting_twice_hires_once(self, authenticated_client, district1):
+        from hiring.models import HiredEmployee
+
+        offer = self._offer(district1)
+
+        assert self._accept(authenticated_client, offer, 'accept-3').status_code == 200
+        assert self._accept(authenticated_client, offer, 'accept-4').status_code == 400
+        assert HiredEmployee.objects.filter(application=offer.application).count() == 1
+
+
+@pytest.mark.django_db
+class TestERPExport:
+    """Exports run in chunks, resume after failure and never run a batch twice"""
+
+    @pytest.fixture(autouse=True)
+    def storage(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+
+    def test_exports_in_chunks(self, district1):
+        from hiring.models import HiredEmployee
+        from hiring.services.erp_export import start_export
+
+        hire_all(district1, create_position(district1, 0, applicant_count=5))
+        batch = start_export(district=district1, chunk_size=2)
+
+        assert batch.status == 'Completed'
+        assert (batch.total, batch.exported_count, batch.chunks_completed) == (5, 5, 3)
+        assert len(batch.files) == 3 and batch.files[0].endswith('chunk-00001.json')
+        assert not HiredEmployee.objects.filter(exported_to_infinite_vision=False).exists()
+
+    def test_resumes_failed_batch(self, district1):
+        from unittest import mock
+        from django.core.files.storage import default_storage
+        from hiring.models import HiredEmployee
+        from hiring.services.erp_export import run_export, start_export
+
+        hire_all(district1, create_position(district1, 0, applicant_count=5))
+        save = default_storage.save
+        calls = []
+
+        def fail_second_chunk(name, content):
+            calls.append(name)
+            if len(calls) == 2:
+                raise OSError('storage unavailable')
+            return save(name, content)
+
+        with mock.patch.object(default_storage, 'save', side_effect=fail_second_chunk):
+            batch = start_export(district=district1, chunk_size=2)
+        assert batch.status == 'Failed' and 'storage unavailable' in batch.error_message
+        assert (batch.exported_count, len(batch.files)) == (2, 1)
+
+        batch = run_export(batch)
+        assert batch.status == 'Completed' and batch.error_message == ''
+        assert (batch.exported_count, batch.chunks_completed, len(batch.files)) == (5, 3, 3)
+        assert HiredEmployee.objects.filter(export_batch=batch).count() == 5
+
+    def test_rejects_resume_unless_failed(self, district1):
+        from hiring.models import ERPExportBatch
+        from hiring.services.erp_export import run_export
+
+        for state in ('Running', 'Completed'):
+            batch = ERPExportBatch.objects.create(district=district1, status=state)
+            with pytest.raises(ValueError):
+                run_export(batch)
+            batch.refresh_from_db()
+            assert batch.status == state
+
+    def test_resumes_stalled_running_batch(self, district1, settings):
+        from django.utils import timezone
+        from hiring.models import ERPExportBatch
+        from hiring.services.erp_export import run_export
+
+        settings.ERP_EXPORT_STALE_SECONDS = 60
+        hire_all(district1, create_position(district1, 0, applicant_count=3))
+        batch = ERPExportBatch.objects.create(district=district1, chunk_size=2, total=3)
+        ERPExportBatch.objects.filter(id=batch.id).update(
+            updated_at=timezone.now() - timedelta(seconds=61))
+
+        batch = run_export(batch)
+        assert batch.status == 'Completed'
+        assert (batch.exported_count, batch.chunks_completed) == (3, 2)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_erp_export_skips_locked_employees(district1, settings, tmp_path):
+    """Employees locked by a concurrent export are left for that export"""
+    import threading
+    from django.db import connections, transaction
+    from hiring.models import HiredEmployee
+    from hiring.services.erp_export import run_export, start_export
+
+    if connection.vendor != 'postgresql':
+        pytest.skip('SKIP LOCKED needs Postgres')
+    settings.MEDIA_ROOT = str(tmp_path)
+    employees = hire_all(district1, create_position(district1, 0, applicant_count=4))
+    held = employees[:2]
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        try:
+            with transaction.atomic():
+                # Without order_by() Meta.ordering joins and locks the district row,
+                # which would block the batch INSERT's foreign key check
+                list(HiredEmployee.objects.order_by().select_for_update()
+                     .filter(id__in=[e.id for e in held]))
+                locked.set()
+                release.wait(10)
+        finally:
+            connections.close_all()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    try:
+        assert locked.wait(10)
+        batch = start_export(district=district1, chunk_size=10)
+    finally:
+        release.set()
+        holder.join()
+
+    assert (batch.status, batch.exported_count, batch.total) == ('Partial', 2, 4)
+    pending = HiredEmployee.objects.filter(exported_to_infinite_vision=False)
+    assert set(pending.values_list('id', flat=True)) == {e.id for e in held}
+
+    batch = run_export(batch)
+    assert (batch.status, batch.exported_count) == ('Completed', 4)
+    assert not pending.exists()
+
+
+@pytest.mark.django_db
+class TestERPChangeFeed:
+    """Hires and later offer edits surface once per employee after the watermark"""
+
+    def test_changes_after_watermark(self, district1):
+        from unittest import mock
+        from hiring.services.erp_feed import parse_watermark, read_changes
+
+        position = create_position(district1, 0, applicant_count=2)
+        employees = hire_all(district1, position)
+
+        # The test's own transaction is still open; treat everything as committed
+        with mock.patch('hiring.services.erp_feed.commit_horizon', return_value=None):
+            records, watermark, has_more = read_changes(district=district1)
+            assert [record['hired_employee_id'] for record in records] == [str(e.id) for e in employees]
+            assert not has_more
+
+            offer = employees[0].offer
+            offer.salary = 52000
+            offer.save()
+            offer.save()
+
+            records, next_watermark, _ = read_changes(since=watermark, district=district1)
+            assert len(records) == 1
+            assert records[0]['compensation']['salary'] == 52000
+            assert records[0]['change_reasons'] == ['offer']
+            assert parse_watermark(next_watermark) > parse_watermark(watermark)
+            assert read_changes(since=next_watermark, district=district1)[0] == []
+
+    def test_saves_outside_erp_fields_add_no_events(self, district1):
+        from hiring.models import ERPChangeEvent
+
+        position = create_position(district1, 0, applicant_count=1)
+        offer = hire_all(district1, position)[0].offer
+        events = ERPChangeEvent.objects.count()
+
+        offer.status = 'Accepted'
+        offer.save(update_fields=['status', 'updated_at'])
+        position.status = 'Closed'
+        with CaptureQueriesContext(connection) as ctx:
+            position.save(update_fields=['status', 'updated_at'])
+        assert ERPChangeEvent.objects.count() == events
+        assert not any('hired_employees' in q['sql'] for q in ctx.captured_queries)
+
+        position.title = 'Renamed'
+        position.save(update_fields=['title', 'updated_at'])
+        assert ERPChangeEvent.objects.filter(reason='position').count() == 1
+
+    def test_employee_saves_add_events_only_for_changed_erp_fields(self, district1):
+        from hiring.models import ERPChangeEvent
+
+        position = create_position(district1, 0, applicant_count=1)
+        employee = hire_all(district1, position)[0]
+        events = ERPChangeEvent.objects.count()
+
+        employee.infinite_vision_employee_id = 'EMP-LOCAL'
+        employee.save()
+        employee.exported_to_infinite_vision = True
+        employee.save(update_fields=['exported_to_infinite_vision', 'updated_at'])
+        employee.hire_date = str(employee.hire_date)
+        employee.save(update_fields=['hire_date', 'updated_at'])
+        assert ERPChangeEvent.objects.count() == events
+
+        employee.hire_date = employee.offer.start_date + timedelta(days=1)
+        employee.save()
+        assert list(ERPChangeEvent.objects.filter(reason='employee').values_list(
+            'hired_employee_id', flat=True)) == [employee.id]
+
+    def test_full_saves_add_events_only_for_changed_erp_fields(self, district1):
+        from hiring.models import ERPChangeEvent
+
+        position = create_position(district1, 0, applicant_count=1)
+        offer = hire_all(district1, position)[0].offer
+        events = ERPChangeEvent.objects.count()
+
+        position.description = 'Updated description'
+        position.save()
+        offer.salary = str(offer.salary)
+        offer.save()
+        assert ERPChangeEvent.objects.count() == events
+
+        position.worksite = 'North High'
+        position.save()
+        offer.fte = '0.5'
+        offer.save()
+        assert ERPChangeEvent.objects.count() == events + 2
+        assert sorted(ERPChangeEvent.objects.exclude(reason='hired').values_list('reason', flat=True)) == [
+            'offer', 'position']
+
+    def test_late_commit_is_not_skipped(self, district1):
+        """An event that commits after a higher id was served still comes through"""
+        from unittest import mock
+        from hiring.models import ERPChangeEvent
+        from hiring.services.erp_feed import read_changes
+
+        position = create_position(district1, 0, applicant_count=3)
+        first, second, late = hire_all(district1, position)
+        ERPChangeEvent.objects.all().delete()
+
+        def event(event_id, txid, employee):
+            ERPChangeEvent.objects.create(
+                id=event_id, txid=txid, hired_employee=employee,
+                district=district1, reason='hired')
+
+        # Transactions 100 and 102 have committed; 101 is still open and has
+        # not written yet, so the snapshot xmin is 101
+        event(11, 100, first)
+        event(12, 102, second)
+        with mock.patch('hiring.services.erp_feed.commit_horizon', return_value=101):
+            records, watermark, _ = read_changes(district=district1)
+        assert [record['hired_employee_id'] for record in records] == [str(first.id)]
+        assert watermark == '100-11'
+
+        # Transaction 101 inserts with an id below one already written, then commits
+        event(10, 101, late)
+        with mock.patch('hiring.services.erp_feed.commit_horizon', return_value=103):
+            records, watermark, _ = read_changes(since=watermark, district=district1)
+        assert [record['hired_employee_id'] for record in records] == [str(late.id), str(second.id)]
+        assert watermark == '102-12'
+
+    def test_rejects_malformed_watermark(self, authenticated_client):
+        response = authenticated_client.get('/api/hiring/hired-employees/changes/?since=12')
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestHiredEmployeeListQueries:
+    """Hired employees embed a position summary unless ?expand=position"""
+
+    def _list(self, client, query=''):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(f'/api/hiring/hired-employees/{query}')
+        assert response.status_code == 200
+        return len(ctx.captured_queries), response.data['results']
+
+    def test_query_count_does_not_grow_with_page_size(self, authenticated_client, district1):
+        for index in range(0, 2):
+            hire_all(district1, create_position(district1, index, applicant_count=1))
+        small_slim, _ = self._list(authenticated_client)
+        small_expanded, _ = self._list(authenticated_client, '?expand=position')
+
+        for index in range(2, 12):
+            hire_all(district1, create_position(district1, index, applicant_count=1))
+        slim, rows = self._list(authenticated_client)
+        expanded, expanded_rows = self._list(authenticated_client, '?expand=position')
+
+        assert len(rows) == 12
+        assert (slim, expanded) == (small_slim, small_expanded)
+        assert set(rows[0]['position']) >= {'id', 'req_id', 'title'}
+        assert 'position_data' not in rows[0]
+        assert expanded_rows[0]['position_data']['applicant_count'] == 1
+        assert len(expanded_rows[0]['position_data']['stages']) == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestSparseFieldsets:
+    """?fields= / ?omit= prune the payload and the columns loaded"""
+
+    def test_fields_and_omit(self, api_client, district1):
+        from hiring.models import JobApplication
+
+        position = create_position(district1, 0, applicant_count=1)
+        create_offer(district1, JobApplication.objects.get(position=position))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get('/api/hiring/offers/?fields=id,status,position_title')
+        assert response.status_code == 200
+        assert set(response.data['results'][0]) == {'id', 'status', 'position_title'}
+        offer_query = [q['sql'] for q in ctx.captured_queries if 'FROM "offers"' in q['sql']][-1]
+        assert '"template_text"' not in offer_query
+        assert '"title"' in offer_query
+
+        response = api_client.get('/api/hiring/offers/?omit=filled_text,template_text')
+        row = response.data['results'][0]
+        assert 'filled_text' not in row and 'template_text' not in row
+        assert row['salary'] is not None
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestApplicationSearch:
+    """Full-text search keeps matching what icontains used to match"""
+
+    def _search(self, client, text):
+        response = client.get('/api/hiring/applications/', {'search': text})
+        assert response.status_code == 200
+        return sorted(row['applicant_email'] for row in response.data['results'])
+
+    def test_full_email_matches(self, authenticated_client, district1):
+        create_position(district1, 0, applicant_count=2)
+
+        assert self._search(authenticated_client, 'applicant0-1@test.com') == ['applicant0-1@test.com']
+
+    def test_prefix_matches(self, authenticated_client, district1):
+        create_position(district1, 0, applicant_count=2)
+
+        assert self._search(authenticated_client, 'Applic') == [
+            'applicant0-0@test.com', 'applicant0-1@test.com']
+
+    def test_stop_word_query_falls_back_to_icontains(self, authenticated_client, district1):
+        from hiring.models import JobApplication
+
+        create_position(district1, 0, applicant_count=2)
+        application = JobApplication.objects.get(applicant_email='applicant0-0@test.com')
+        application.applicant_name = 'Over The Top'
+        application.save()
+
+        assert self._search(authenticated_client, 'over the') == ['applicant0-0@test.com']
+
+    def test_search_indexes_are_always_declared(self):
+        from django.contrib.postgres.indexes import GinIndex
+        from hiring.models import JobApplication, Position
+
+        for model in (Position, JobApplication):
+            assert any(isinstance(index, GinIndex) and index.fields == ['search_vector']
+                       for index in model._meta.indexes)
@@ -10,6 +10,7 @@ from .views import (
     OfferViewSet,
     HiredEmployeeViewSet
 )
+from .views_extra import docusign
 
 router = DefaultRouter()
 router.register(r'screening-questions', ScreeningQuestionViewSet, basename='screening-question')
@@ -23,4 +24,8 @@ router.register(r'hired-employees', HiredEmployeeViewSet, basename='hired-employ
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('docusign/envelopes/', docusign.create_docusign_envelope, name='docusign-envelope-create'),
+    path('docusign/envelopes/bulk/', docusign.create_docusign_envelopes_bulk, name='docusign-envelope-bulk'),
+    path('docusign/envelopes/<str:envelope_id>/', docusign.docusign_envelope_status, name='docusign-envelope-status'),
+    path('docusign/connect/', docusign.docusign_connect_webhook, name='docusign-connect'),
 ]
\ No newline at end of file
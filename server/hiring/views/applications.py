@@ -4,32 +4,46 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.exceptions import ValidationError as DjangoValidationError
 import json
+import logging
+
+from core.pagination import KeysetPagination
+from core.sparse_fields import SparseFieldsetViewMixin
 
 from ..models import (
     Position,
     JobApplication,
-    Reference,
-    InterviewAvailability
+    ApplicationSubmission
+)
+from ..search import FullTextSearchFilter
+from ..services.application_intake import (
+    is_async_intake_enabled,
+    persist_application,
+    stage_submission,
 )
 from ..serializers import (
     JobApplicationListSerializer,
     JobApplicationDetailSerializer
 )
 
+logger = logging.getLogger(__name__)
+
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+class JobApplicationViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for job applications"""
     queryset = JobApplication.objects.all()
     permission_classes = [IsAuthenticated]
     # Add parsers to handle file uploads
     parser_classes = (MultiPartParser, FormParser, JSONParser)
-    filter_backends = [filters.SearchFilter,
-                       DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter,
+                       FullTextSearchFilter]
     search_fields = ['applicant_name', 'applicant_email', 'current_role']
     filterset_fields = ['stage', 'certified', 'internal', 'position']
     ordering_fields = ['submitted_at', 'applicant_name']
     ordering = ['-submitted_at']
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-submitted_at', '-id')
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -37,17 +51,17 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
         return JobApplicationDetailSerializer
 
     def get_permissions(self):
-        # Allow public submission of applications
-        if self.action == 'create':
+        # Allow public submission of applications and intake status polling
+        if self.action in ('create', 'intake_status'):
             return [AllowAny()]
         return [IsAuthenticated()]
 
     def get_district_from_position(self, position_id):
         """Get district from the position being applied to"""
         try:
-            position = Position.objects.get(id=position_id)
+            position = Position.objects.select_related('district').get(id=position_id)
             return position.district
-        except Position.DoesNotExist:
+        except (Position.DoesNotExist, ValueError, DjangoValidationError):
             return None
 
     def create(self, request, *args, **kwargs):
@@ -107,37 +121,29 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            print('Creating application with data:', {
-                  k: v for k, v in data.items() if k != 'resume'})
-            print('Screening answers:', data['screening_answers'])
-            print('References:', references_data)
-            print('Interview availability:', availability_data)
-
-            # Create the application first
-            serializer = self.get_serializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            application = serializer.save()
-
-            # Create references
-            for reference_data in references_data:
-                Reference.objects.create(
-                    application=application,
-                    district=application.district,  # Set district from application
-                    name=reference_data.get('name', ''),
-                    email=reference_data.get('email', ''),
-                    phone=reference_data.get('phone', ''),
-                    relationship=reference_data.get('relationship', '')
-                )
+            logger.debug(
+                f"Creating application for position {position_id} with "
+                f"{len(references_data)} references and {len(availability_data)} availability slots")
 
-            # Create interview availability
-            for availability in availability_data:
-                InterviewAvailability.objects.create(
-                    application=application,
-                    district=application.district,  # Set district from application
-                    date=availability.get('date'),
-                    time_slots=availability.get('timeSlots', [])
+            if is_async_intake_enabled():
+                # Stage and hand off to the intake worker pool
+                submission = stage_submission(data, references_data, availability_data)
+                return Response(
+                    {
+                        'tracking_id': str(submission.id),
+                        'status': submission.status,
+                        'status_url': request.build_absolute_uri(
+                            f'intake/{submission.id}/'),
+                    },
+                    status=status.HTTP_202_ACCEPTED
                 )
 
+            # Application, nested rows and the queued confirmation email are
+            # written as one unit (see hiring.signals and core.outbox)
+            application = persist_application(
+                data, references_data, availability_data,
+                context=self.get_serializer_context())
+
             # Return the created application with all related data
             response_serializer = JobApplicationDetailSerializer(application)
             headers = self.get_success_headers(response_serializer.data)
@@ -149,14 +155,32 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
             )
 
         except Exception as e:
-            print(f'Error creating application: {str(e)}')
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error creating application: {e}")
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=False, methods=['get'], url_path=r'intake/(?P<tracking_id>[0-9a-f-]+)')
+    def intake_status(self, request, tracking_id=None):
+        """Public status of an asynchronously submitted application (tracking id acts as token)"""
+        try:
+            submission = ApplicationSubmission.objects.only(
+                'id', 'status', 'application_id', 'processed_at'
+            ).get(id=tracking_id)
+        except (ApplicationSubmission.DoesNotExist, ValueError, DjangoValidationError):
+            return Response(
+                {'error': 'Submission not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response({
+            'tracking_id': str(submission.id),
+            'status': submission.status,
+            'application': str(submission.application_id) if submission.application_id else None,
+            'processed_at': submission.processed_at,
+        })
+
     @action(detail=True, methods=['post'])
     def advance_stage(self, request, pk=None):
         """Advance application to next stage"""
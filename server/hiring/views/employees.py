@@ -1,82 +1,183 @@
+import json
+from urllib.parse import urlencode
+
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.utils import timezone
-import uuid
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+
+from core.district_cache import get_request_district
+from core.sparse_fields import SparseFieldsetViewMixin
 
-from ..models import HiredEmployee
-from ..serializers import HiredEmployeeSerializer
+from ..models import ERPExportBatch, HiredEmployee, Position
+from ..serializers import HiredEmployeeExpandedSerializer, HiredEmployeeSerializer
+from ..services.erp_export import run_export, start_export
+from ..services.erp_feed import DEFAULT_LIMIT, MAX_LIMIT, parse_watermark, read_changes
 
 
-class HiredEmployeeViewSet(viewsets.ModelViewSet):
+class HiredEmployeeViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for hired employees"""
     queryset = HiredEmployee.objects.all()
-    serializer_class = HiredEmployeeSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [filters.SearchFilter,
                        DjangoFilterBackend, filters.OrderingFilter]
     search_fields = ['application__applicant_name',
                      'application__position__title']
-    filterset_fields = ['exported_to_erp']
+    filterset_fields = ['exported_to_infinite_vision']
     ordering_fields = ['hire_date', 'export_date']
     ordering = ['-hire_date']
 
+    def _expand_position(self):
+        expand = self.request.query_params.get('expand', '')
+        return 'position' in [part.strip() for part in expand.split(',')]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self._expand_position():
+            # Full position detail: counts annotated and stages prefetched
+            # once for the page rather than per employee
+            return queryset.select_related('application').prefetch_related(
+                Prefetch(
+                    'application__position',
+                    queryset=Position.objects.with_counts().with_related(),
+                )
+            )
+        return queryset.select_related('application__position')
+
+    def get_serializer_class(self):
+        if self._expand_position():
+            return HiredEmployeeExpandedSerializer
+        return HiredEmployeeSerializer
+
     @action(detail=True, methods=['post'])
     def export_to_erp(self, request, pk=None):
         """Export employee data to ERP system"""
         hired_employee = self.get_object()
 
-        if hired_employee.exported_to_erp:
+        if hired_employee.exported_to_infinite_vision:
             return Response(
                 {'error': 'Employee already exported to ERP system'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # TODO: Implement actual ERP API integration
-        # For now, just mark as exported with mock employee ID
-        hired_employee.exported_to_erp = True
-        hired_employee.export_date = timezone.now()
-        hired_employee.erp_employee_id = f"EMP-{uuid.uuid4().hex[:8].upper()}"
-        hired_employee.save()
+        batch = start_export(employee_ids=[hired_employee.id], chunk_size=1)
+        if batch.status != 'Completed':
+            return Response(
+                {'error': batch.error_message or 'ERP export failed'},
+                status=status.HTTP_502_BAD_GATEWAY
+            )
 
+        hired_employee.refresh_from_db()
         serializer = self.get_serializer(hired_employee)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def pending_export(self, request):
         """Get employees pending export to ERP system"""
-        pending = self.queryset.filter(exported_to_erp=False)
+        pending = self.filter_queryset(self.get_queryset()).filter(exported_to_infinite_vision=False)
         serializer = self.get_serializer(pending, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['post'])
     def bulk_export(self, request):
-        """Bulk export employees to ERP system"""
+        """
+        Bulk export employees to ERP system
+
+        Body: {"employee_ids": [...]} or {"all_pending": true}. Runs a chunked
+        ERPExportBatch; a Failed, Partial or stalled batch can be resumed via
+        POST export-batches/<id>/resume/.
+        """
         employee_ids = request.data.get('employee_ids', [])
+        all_pending = bool(request.data.get('all_pending'))
 
-        if not employee_ids:
+        if not employee_ids and not all_pending:
             return Response(
                 {'error': 'employee_ids list is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        employees = self.queryset.filter(
-            id__in=employee_ids,
-            exported_to_erp=False
-        )
+        try:
+            batch = start_export(
+                district=get_request_district(request) if all_pending else None,
+                employee_ids=employee_ids,
+            )
+        except (ValueError, DjangoValidationError):
+            return Response(
+                {'error': 'employee_ids must contain valid employee IDs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        exported_count = 0
-        for employee in employees:
-            # TODO: Implement actual ERP API integration
-            employee.exported_to_erp = True
-            employee.export_date = timezone.now()
-            employee.erp_employee_id = f"EMP-{uuid.uuid4().hex[:8].upper()}"
-            employee.save()
-            exported_count += 1
+        return Response({
+            'batch_id': str(batch.id),
+            'status': batch.status,
+            'exported_count': batch.exported_count,
+            'total': batch.total,
+            'error': batch.error_message or None,
+            'message': f'Successfully exported {batch.exported_count} employees to ERP system'
+            if batch.status == 'Completed' else f'Export stopped after {batch.exported_count} employees',
+        })
+
+    @action(detail=False, methods=['post'], url_path=r'export-batches/(?P<batch_id>[0-9a-f-]+)/resume')
+    def resume_export(self, request, batch_id=None):
+        """Resume a failed, partial or stalled ERP export batch from its last completed chunk"""
+        batch = get_object_or_404(ERPExportBatch, id=batch_id)
+        try:
+            batch = run_export(batch)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response({
+            'batch_id': str(batch.id),
+            'status': batch.status,
+            'exported_count': batch.exported_count,
+            'total': batch.total,
+            'error': batch.error_message or None,
+        })
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Incremental ERP change feed
+
+        GET ?since=<watermark>&limit=<n>. Returns the current record of every
+        employee changed after the watermark (an opaque `txid-id` token; omit
+        it to start from the beginning), plus the next watermark. Send
+        ?output=ndjson (or Accept: application/x-ndjson) to stream one JSON
+        record per line; the next watermark is then in X-ERP-Watermark.
+        """
+        since = request.query_params.get('since', '')
+        try:
+            parse_watermark(since)
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            return Response(
+                {'error': 'since must be a watermark returned by this endpoint and limit an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        records, watermark, has_more = read_changes(
+            since=since, limit=limit, district=get_request_district(request))
+
+        ndjson = (request.query_params.get('output') == 'ndjson'
+                  or 'application/x-ndjson' in request.headers.get('Accept', ''))
+        if ndjson:
+            response = StreamingHttpResponse(
+                (json.dumps(record, cls=DjangoJSONEncoder) + '\n' for record in records),
+                content_type='application/x-ndjson',
+            )
+            response['X-ERP-Watermark'] = watermark
+            response['X-ERP-Has-More'] = 'true' if has_more else 'false'
+            return response
 
         return Response({
-            'exported_count': exported_count,
-            'message': f'Successfully exported {exported_count} employees to ERP system'
+            'results': records,
+            'watermark': watermark,
+            'has_more': has_more,
+            'next': f"{request.path}?{urlencode({'since': watermark, 'limit': limit})}" if has_more else None,
         })
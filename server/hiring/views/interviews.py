@@ -4,14 +4,20 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from django.db.models import Count, Q
 from datetime import timedelta
 import uuid
 
+from core.district_cache import get_request_district
+from core.pagination import KeysetPagination
+from core.sparse_fields import SparseFieldsetViewMixin
+
 from ..models import Interview, Interviewer
 from ..serializers import InterviewSerializer
+from ..cache import get_cached_stats
 
 
-class InterviewViewSet(viewsets.ModelViewSet):
+class InterviewViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for interviews"""
     queryset = Interview.objects.all()
     serializer_class = InterviewSerializer
@@ -23,6 +29,8 @@ class InterviewViewSet(viewsets.ModelViewSet):
     filterset_fields = ['status', 'stage', 'scheduled_date']
     ordering_fields = ['scheduled_date', 'scheduled_time']
     ordering = ['scheduled_date', 'scheduled_time']
+    pagination_class = KeysetPagination
+    keyset_ordering = ('scheduled_date', 'scheduled_time', 'id')
 
     @action(detail=False, methods=['get'])
     def interviewers(self, request):
@@ -141,22 +149,30 @@ class InterviewViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get interview statistics"""
+        """Get interview statistics (single conditional aggregate, cached briefly)"""
+        district = get_request_district(request)
+        return Response(get_cached_stats(
+            'interviews', district, lambda: self._compute_stats(district)))
+
+    @staticmethod
+    def _compute_stats(district):
         today = timezone.now().date()
 
-        stats = {
-            'total_interviews': Interview.objects.count(),
-            'scheduled': Interview.objects.filter(status='Scheduled').count(),
-            'completed': Interview.objects.filter(status='Completed').count(),
-            'upcoming_this_week': Interview.objects.filter(
+        interviews = Interview.objects.order_by()
+        if district is not None:
+            interviews = interviews.filter(district=district)
+
+        return interviews.aggregate(
+            total_interviews=Count('id'),
+            scheduled=Count('id', filter=Q(status='Scheduled')),
+            completed=Count('id', filter=Q(status='Completed')),
+            upcoming_this_week=Count('id', filter=Q(
                 scheduled_date__gte=today,
                 scheduled_date__lte=today + timedelta(days=7),
                 status='Scheduled'
-            ).count(),
-            'today': Interview.objects.filter(
+            )),
+            today=Count('id', filter=Q(
                 scheduled_date=today,
                 status='Scheduled'
-            ).count(),
-        }
-
-        return Response(stats)
+            )),
+        )
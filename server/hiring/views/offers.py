@@ -3,16 +3,23 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
 from django.utils import timezone
+from django.db.models import Count, Q
 from datetime import timedelta
 
+from core.district_cache import get_request_district
+from core.idempotency import get_replay, store_response
+from core.sparse_fields import SparseFieldsetViewMixin
+
 from ..models import Offer, HiredEmployee
 from ..serializers import OfferSerializer
+from ..cache import get_cached_stats
 
 
-class OfferViewSet(viewsets.ModelViewSet):
+class OfferViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for offers"""
-    queryset = Offer.objects.all()
+    queryset = Offer.objects.select_related('application__position')
     serializer_class = OfferSerializer
     # Temporarily allow unauthenticated for testing
     permission_classes = [AllowAny]
@@ -20,57 +27,91 @@ class OfferViewSet(viewsets.ModelViewSet):
                        DjangoFilterBackend, filters.OrderingFilter]
     search_fields = ['application__applicant_name',
                      'application__position__title']
-    filterset_fields = ['status', 'application__position__worksite']
+    filterset_fields = ['status', 'application__position__worksite', 'docusign_status']
     ordering_fields = ['offer_date', 'expiration_date']
     ordering = ['-offer_date']
 
-    @action(detail=True, methods=['post'], permission_classes=[AllowAny])
-    def accept(self, request, pk=None):
-        """Accept an offer - public endpoint (UUID acts as secure token)"""
+    def _lock_offer(self):
+        """Re-read the requested offer under a row lock (call inside a transaction)"""
         offer = self.get_object()
+        return Offer.objects.select_for_update().select_related('application').get(pk=offer.pk)
 
-        if offer.status != 'Pending':
-            return Response(
-                {'error': 'Only pending offers can be accepted'},
-                status=status.HTTP_400_BAD_REQUEST
+    @action(detail=True, methods=['post'], permission_classes=[AllowAny])
+    def accept(self, request, pk=None):
+        """
+        Accept an offer - public endpoint (UUID acts as secure token)
+
+        Runs under a row lock so concurrent submissions can't both accept.
+        Honors an Idempotency-Key header: repeats get the stored response.
+        """
+        scope = f'offers.accept:{pk}'
+        replay = get_replay(request, scope)
+        if replay is not None:
+            return replay
+
+        with transaction.atomic():
+            offer = self._lock_offer()
+            replay = get_replay(request, scope)
+            if replay is not None:
+                return replay
+
+            if offer.status != 'Pending':
+                return store_response(request, scope, Response(
+                    {'error': 'Only pending offers can be accepted'},
+                    status=status.HTTP_400_BAD_REQUEST
+                ))
+
+            offer.status = 'Accepted'
+            offer.accepted_date = timezone.now().date()
+            offer.save(update_fields=['status', 'accepted_date', 'updated_at'])
+
+            # Update application stage to Offer Accepted
+            offer.application.stage = 'Offer Accepted'
+            offer.application.save(update_fields=['stage', 'updated_at'])
+
+            # Create hired employee record
+            HiredEmployee.objects.get_or_create(
+                application=offer.application,
+                defaults={
+                    'district': offer.district,
+                    'offer': offer,
+                    'hire_date': offer.start_date,
+                }
             )
 
-        offer.status = 'Accepted'
-        offer.accepted_date = timezone.now().date()
-        offer.save()
-
-        # Update application stage to Offer Accepted
-        offer.application.stage = 'Offer Accepted'
-        offer.application.save()
-
-        # Create hired employee record
-        HiredEmployee.objects.create(
-            district=offer.district,
-            application=offer.application,
-            offer=offer,
-            hire_date=offer.start_date
-        )
-
-        serializer = self.get_serializer(offer)
-        return Response(serializer.data)
+            serializer = self.get_serializer(offer)
+            return store_response(request, scope, Response(serializer.data))
 
     @action(detail=True, methods=['post'], permission_classes=[AllowAny])
     def decline(self, request, pk=None):
-        """Decline an offer - public endpoint (UUID acts as secure token)"""
-        offer = self.get_object()
-
-        if offer.status != 'Pending':
-            return Response(
-                {'error': 'Only pending offers can be declined'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        offer.status = 'Declined'
-        offer.declined_reason = request.data.get('reason', '')
-        offer.save()
-
-        serializer = self.get_serializer(offer)
-        return Response(serializer.data)
+        """
+        Decline an offer - public endpoint (UUID acts as secure token)
+
+        Locked and idempotent like accept.
+        """
+        scope = f'offers.decline:{pk}'
+        replay = get_replay(request, scope)
+        if replay is not None:
+            return replay
+
+        with transaction.atomic():
+            offer = self._lock_offer()
+            replay = get_replay(request, scope)
+            if replay is not None:
+                return replay
+
+            if offer.status != 'Pending':
+                return store_response(request, scope, Response(
+                    {'error': 'Only pending offers can be declined'},
+                    status=status.HTTP_400_BAD_REQUEST
+                ))
+
+            offer.status = 'Declined'
+            offer.declined_reason = request.data.get('reason', '')
+            offer.save(update_fields=['status', 'declined_reason', 'updated_at'])
+
+            serializer = self.get_serializer(offer)
+            return store_response(request, scope, Response(serializer.data))
 
     @action(detail=True, methods=['get'], permission_classes=[AllowAny], url_path='public-accept')
     def public_accept(self, request, pk=None):
@@ -119,13 +160,21 @@ class OfferViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get offer statistics"""
-        stats = {
-            'total_offers': Offer.objects.count(),
-            'pending': Offer.objects.filter(status='Pending').count(),
-            'accepted': Offer.objects.filter(status='Accepted').count(),
-            'declined': Offer.objects.filter(status='Declined').count(),
-            'expired': Offer.objects.filter(status='Expired').count(),
-        }
-
-        return Response(stats)
+        """Get offer statistics (single conditional aggregate, cached briefly)"""
+        district = get_request_district(request)
+        return Response(get_cached_stats(
+            'offers', district, lambda: self._compute_stats(district)))
+
+    @staticmethod
+    def _compute_stats(district):
+        offers = Offer.objects.order_by()
+        if district is not None:
+            offers = offers.filter(district=district)
+
+        return offers.aggregate(
+            total_offers=Count('id'),
+            pending=Count('id', filter=Q(status='Pending')),
+            accepted=Count('id', filter=Q(status='Accepted')),
+            declined=Count('id', filter=Q(status='Declined')),
+            expired=Count('id', filter=Q(status='Expired')),
+        )
@@ -4,9 +4,20 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, Q
+
+from core.district_cache import get_request_district
+from core.sparse_fields import SparseFieldsetViewMixin
 
 from ..models import Position, JobApplication, Offer
+from ..cache import (
+    public_board_cache_key,
+    get_public_board,
+    set_public_board,
+    etag_matches,
+    get_cached_stats,
+)
+from ..search import FullTextSearchFilter, apply_full_text_search
 from ..serializers import (
     PositionListSerializer,
     PositionDetailSerializer,
@@ -15,17 +26,25 @@ from ..serializers import (
 )
 
 
-class PositionViewSet(viewsets.ModelViewSet):
+class PositionViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for positions"""
     queryset = Position.objects.all()
-    filter_backends = [filters.SearchFilter,
-                       DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter,
+                       FullTextSearchFilter]
     search_fields = ['req_id', 'title', 'department', 'worksite']
     filterset_fields = ['status', 'department',
                         'worksite', 'employee_category']
     ordering_fields = ['created_at', 'start_date', 'posting_end_date']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            # Counts and nested stages come from one annotated query plus
+            # fixed prefetches, independent of page size
+            queryset = queryset.with_counts().with_related()
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'list':
             return PositionListSerializer
@@ -38,10 +57,12 @@ class PositionViewSet(viewsets.ModelViewSet):
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'district': 'District ID is required'})
 
-        from core.models import SchoolDistrict
+        from core.district_cache import district_cache
         try:
-            district = SchoolDistrict.objects.get(id=district_id)
-        except SchoolDistrict.DoesNotExist:
+            district = district_cache.get_by_id(district_id)
+        except ValueError:
+            district = None
+        if district is None:
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'district': 'Invalid district ID'})
 
@@ -49,35 +70,56 @@ class PositionViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
     def public(self, request):
-        """Public endpoint for job board - returns only open positions"""
-        today = timezone.now().date()
-        positions = Position.objects.filter(
-            status='Open',
-            posting_start_date__lte=today,
-            posting_end_date__gte=today
-        )
+        """
+        Public endpoint for job board - returns only open positions.
 
-        # Apply search filter
+        Responses are cached per (search, department, worksite, date) and
+        carry a strong ETag; conditional requests get a 304 without touching
+        the database.
+        """
+        today = timezone.now().date()
         search = request.query_params.get('search', None)
-        if search:
-            positions = positions.filter(
-                Q(title__icontains=search) |
-                Q(department__icontains=search) |
-                Q(worksite__icontains=search)
-            )
-
-        # Apply department filter
         department = request.query_params.get('department', None)
-        if department and department != 'all':
-            positions = positions.filter(department=department)
-
-        # Apply worksite filter
+        if department == 'all':
+            department = None
         worksite = request.query_params.get('worksite', None)
-        if worksite and worksite != 'all':
-            positions = positions.filter(worksite=worksite)
+        if worksite == 'all':
+            worksite = None
+
+        cache_key = public_board_cache_key(search, department, worksite, today)
+        cached = get_public_board(cache_key)
+        if cached:
+            etag, data = cached
+        else:
+            positions = Position.objects.filter(
+                status='Open',
+                posting_start_date__lte=today,
+                posting_end_date__gte=today
+            ).prefetch_related('screening_questions')
 
-        serializer = PublicPositionSerializer(positions, many=True)
-        return Response(serializer.data)
+            # Apply search filter
+            if search:
+                positions = apply_full_text_search(
+                    positions, search, ['title', 'department', 'worksite'])
+
+            # Apply department filter
+            if department:
+                positions = positions.filter(department=department)
+
+            # Apply worksite filter
+            if worksite:
+                positions = positions.filter(worksite=worksite)
+
+            data = PublicPositionSerializer(positions, many=True).data
+            etag = set_public_board(cache_key, data)
+
+        headers = {
+            'ETag': etag,
+            'Cache-Control': 'public, max-age=0, must-revalidate',
+        }
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(data, headers=headers)
 
     @action(detail=True, methods=['get'])
     def applicants(self, request, pk=None):
@@ -101,24 +143,42 @@ class PositionViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get hiring statistics"""
-        today = timezone.now().date()
+        """Get hiring statistics (one conditional aggregate per table, cached briefly)"""
+        district = get_request_district(request)
+        return Response(get_cached_stats(
+            'positions', district, lambda: self._compute_stats(district)))
 
-        stats = {
-            'total_positions': Position.objects.count(),
-            'open_positions': Position.objects.filter(
+    @staticmethod
+    def _compute_stats(district):
+        today = timezone.now().date()
+        month_start = timezone.now().replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0)
+
+        positions = Position.objects.order_by()
+        applications = JobApplication.objects.order_by()
+        offers = Offer.objects.order_by()
+        if district is not None:
+            positions = positions.filter(district=district)
+            applications = applications.filter(district=district)
+            offers = offers.filter(district=district)
+
+        stats = positions.aggregate(
+            total_positions=Count('id'),
+            open_positions=Count('id', filter=Q(
                 status='Open',
                 posting_start_date__lte=today,
                 posting_end_date__gte=today
-            ).count(),
-            'draft_positions': Position.objects.filter(status='Draft').count(),
-            'closed_positions': Position.objects.filter(status='Closed').count(),
-            'total_applications': JobApplication.objects.count(),
-            'applications_this_month': JobApplication.objects.filter(
-                submitted_at__gte=timezone.now().replace(day=1)
-            ).count(),
-            'pending_offers': Offer.objects.filter(status='Pending').count(),
-            'accepted_offers': Offer.objects.filter(status='Accepted').count(),
-        }
-
-        return Response(stats)
+            )),
+            draft_positions=Count('id', filter=Q(status='Draft')),
+            closed_positions=Count('id', filter=Q(status='Closed')),
+        )
+        stats.update(applications.aggregate(
+            total_applications=Count('id'),
+            applications_this_month=Count(
+                'id', filter=Q(submitted_at__gte=month_start)),
+        ))
+        stats.update(offers.aggregate(
+            pending_offers=Count('id', filter=Q(status='Pending')),
+            accepted_offers=Count('id', filter=Q(status='Accepted')),
+        ))
+        return stats
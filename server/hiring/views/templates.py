@@ -4,16 +4,26 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
+from django.template.defaultfilters import linebreaksbr
 
+from core.sparse_fields import SparseFieldsetViewMixin
+
+from ..cache import get_cached_offer_preview
 from ..models import ScreeningQuestion, JobTemplate, OfferTemplate
 from ..serializers import (
     ScreeningQuestionSerializer,
     JobTemplateSerializer,
     OfferTemplateSerializer
 )
+from ..template_engine import compile_template, template_hash
+
+
+def _camel_case(key):
+    head, *rest = key.split('_')
+    return head + ''.join(part[:1].upper() + part[1:] for part in rest)
 
 
-class ScreeningQuestionViewSet(viewsets.ModelViewSet):
+class ScreeningQuestionViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for screening questions"""
     queryset = ScreeningQuestion.objects.all()
     serializer_class = ScreeningQuestionSerializer
@@ -30,17 +40,19 @@ class ScreeningQuestionViewSet(viewsets.ModelViewSet):
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'district': 'District ID is required'})
 
-        from core.models import SchoolDistrict
+        from core.district_cache import district_cache
         try:
-            district = SchoolDistrict.objects.get(id=district_id)
-        except SchoolDistrict.DoesNotExist:
+            district = district_cache.get_by_id(district_id)
+        except ValueError:
+            district = None
+        if district is None:
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'district': 'Invalid district ID'})
 
         serializer.save(district=district)
 
 
-class JobTemplateViewSet(viewsets.ModelViewSet):
+class JobTemplateViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for job templates"""
     queryset = JobTemplate.objects.all()
     serializer_class = JobTemplateSerializer
@@ -57,17 +69,19 @@ class JobTemplateViewSet(viewsets.ModelViewSet):
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'district': 'District ID is required'})
 
-        from core.models import SchoolDistrict
+        from core.district_cache import district_cache
         try:
-            district = SchoolDistrict.objects.get(id=district_id)
-        except SchoolDistrict.DoesNotExist:
+            district = district_cache.get_by_id(district_id)
+        except ValueError:
+            district = None
+        if district is None:
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'district': 'Invalid district ID'})
 
         serializer.save(district=district)
 
 
-class OfferTemplateViewSet(viewsets.ModelViewSet):
+class OfferTemplateViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """ViewSet for offer templates"""
     queryset = OfferTemplate.objects.all()
     serializer_class = OfferTemplateSerializer
@@ -87,3 +101,41 @@ class OfferTemplateViewSet(viewsets.ModelViewSet):
             )
         serializer = self.get_serializer(template)
         return Response(serializer.data)
+
+    @action(detail=True, methods=['post'])
+    def preview(self, request, pk=None):
+        """
+        Render a template against field values on the server.
+
+        Body: {"template_data": {...}} or {"data": {...}}. The frontend API
+        client snake_cases keys inside "data", so camelCase placeholders are
+        also matched against their snake_case equivalents. Results are
+        cached per (template text hash, data hash).
+        """
+        template = self.get_object()
+
+        data = request.data.get('template_data')
+        if data is None:
+            data = request.data.get('data', {})
+        if not isinstance(data, dict):
+            return Response(
+                {'error': 'data must be an object of field values'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        values = {str(key): '' if value is None else str(value) for key, value in data.items()}
+        for key, value in list(values.items()):
+            values.setdefault(_camel_case(key), value)
+
+        def render():
+            compiled = compile_template(template.template_text)
+            filled_text = compiled.render(values)
+            return {
+                'filled_text': filled_text,
+                'filled_html': str(linebreaksbr(filled_text, autoescape=True)),
+                'extracted_fields': list(compiled.fields),
+                'missing_fields': [field for field in compiled.fields if field not in values],
+            }
+
+        return Response(get_cached_offer_preview(
+            template.id, template_hash(template.template_text), values, render))
@@ -1,8 +1,37 @@
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+import json
+import logging
+
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from ..services.docusign_service import DocuSignService
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+
+from ..models import Offer
+from ..services.docusign_bulk import send_offer_envelopes
+from ..services.docusign_connect import apply_event, verify_signature
+from ..services.docusign_service import get_docusign_service
+
+logger = logging.getLogger(__name__)
+
+
+def _link_envelope(offer_id, result):
+    """
+    Record a freshly sent envelope on its offer so Connect events can find it.
+
+    A draft left behind by a failed send is not linked, matching the bulk path.
+    """
+    if result['status'] != 'sent':
+        return
+    Offer.objects.filter(id=offer_id).update(
+        docusign_envelope_id=result['envelopeId'],
+        docusign_status=result['status'],
+        docusign_recipients=[],
+        docusign_status_changed_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
 
 
 @api_view(['POST'])
@@ -12,18 +41,22 @@ def create_docusign_envelope(request):
     try:
         data = request.data
 
-        print("\n" + "="*80)
-        print("FRONTEND REQUEST RECEIVED")
-        print("="*80)
-        print(f"User: {request.user}")
-        print(f"Email Subject: {data.get('emailSubject', 'N/A')}")
-        print(f"Recipients Count: {len(data.get('recipients', []))}")
-        if data.get('recipients'):
-            print(f"Recipient: {data['recipients'][0].get('name')} ({data['recipients'][0].get('email')})")
-        print(f"Tabs Provided: {len(data.get('tabs', {}).get('textTabs', []))} text tabs")
-        print("="*80 + "\n")
+        logger.debug(
+            f"DocuSign envelope requested by user {request.user.pk} with "
+            f"{len(data.get('recipients', []))} recipient(s) and "
+            f"{len(data.get('tabs', {}).get('textTabs', []))} text tabs")
+
+        offer_id = data.get('offer_id') or data.get('offerId')
+        if offer_id:
+            try:
+                offer_id = Offer._meta.pk.to_python(offer_id)
+            except DjangoValidationError:
+                return Response(
+                    {'error': 'offer_id must be a valid offer ID'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
-        service = DocuSignService()
+        service = get_docusign_service()
 
         recipient = data['recipients'][0]
 
@@ -34,26 +67,130 @@ def create_docusign_envelope(request):
             tabs_data=data.get('tabs', {})
         )
 
-        print("\n" + "="*80)
-        print("RETURNING TO FRONTEND")
-        print("="*80)
-        print(f"Envelope ID: {result.get('envelopeId')}")
-        print(f"Status: {result.get('status')}")
-        print(f"Signing URL: {result.get('signingUrl')[:100]}..." if result.get('signingUrl') else "No URL")
-        print("="*80 + "\n")
+        if offer_id:
+            _link_envelope(offer_id, result)
+
+        logger.debug(f"DocuSign envelope {result.get('envelopeId')} created with status {result.get('status')}")
 
         return Response(result, status=status.HTTP_201_CREATED)
 
     except Exception as e:
-        print("\n" + "="*80)
-        print("ERROR OCCURRED")
-        print("="*80)
-        print(f"Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        print("="*80 + "\n")
+        logger.exception("DocuSign envelope creation failed")
 
         return Response(
             {'error': str(e)},
             status=status.HTTP_400_BAD_REQUEST
         )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_docusign_envelopes_bulk(request):
+    """
+    Send offer letter envelopes for many offers at once.
+
+    Body: {"offer_ids": [...]}. Envelopes are sent concurrently (bounded by
+    DOCUSIGN_BULK_MAX_WORKERS and DOCUSIGN_BULK_RATE_LIMIT) and the response
+    carries one result per offer, so partial failures are reported rather
+    than aborting the batch.
+    """
+    offer_ids = request.data.get('offer_ids') or []
+    if not isinstance(offer_ids, list) or not offer_ids:
+        return Response(
+            {'error': 'offer_ids must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    max_batch = getattr(settings, 'DOCUSIGN_BULK_MAX_BATCH', 50)
+    if len(offer_ids) > max_batch:
+        return Response(
+            {'error': f'At most {max_batch} offers can be sent per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        offers = list(
+            Offer.objects.filter(id__in=offer_ids)
+            .select_related('district', 'application__position')
+        )
+    except (ValueError, DjangoValidationError):
+        return Response(
+            {'error': 'offer_ids must contain valid offer IDs'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    found = {str(offer.id) for offer in offers}
+    results = send_offer_envelopes(offers)
+
+    now = timezone.now()
+    offers_by_id = {str(offer.id): offer for offer in offers}
+    linked = []
+    for result in results:
+        if result['ok']:
+            offer = offers_by_id[result['offer_id']]
+            offer.docusign_envelope_id = result['envelope_id']
+            offer.docusign_status = result['status'] or ''
+            offer.docusign_recipients = []
+            offer.docusign_status_changed_at = now
+            offer.updated_at = now
+            linked.append(offer)
+    Offer.objects.bulk_update(linked, [
+        'docusign_envelope_id', 'docusign_status', 'docusign_recipients',
+        'docusign_status_changed_at', 'updated_at'])
+    results.extend(
+        {'offer_id': str(offer_id), 'ok': False, 'envelope_id': None,
+         'status': None, 'signing_url': None, 'error': 'Offer not found'}
+        for offer_id in offer_ids if str(offer_id) not in found
+    )
+
+    sent = sum(1 for result in results if result['ok'])
+    return Response({
+        'sent': sent,
+        'failed': len(results) - sent,
+        'results': results,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def docusign_envelope_status(request, envelope_id):
+    """Signing status for an envelope, read from the offer (kept current by Connect)"""
+    offer = Offer.objects.filter(docusign_envelope_id=envelope_id).only(
+        'id', 'docusign_envelope_id', 'docusign_status',
+        'docusign_recipients', 'docusign_status_changed_at'
+    ).first()
+    if offer is None:
+        return Response({'error': 'Envelope not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response({
+        'envelope_id': offer.docusign_envelope_id,
+        'offer_id': str(offer.id),
+        'status': offer.docusign_status,
+        'recipients': offer.docusign_recipients,
+        'status_changed_at': offer.docusign_status_changed_at,
+    })
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def docusign_connect_webhook(request):
+    """
+    DocuSign Connect listener.
+
+    Authenticated by HMAC signature (DOCUSIGN_CONNECT_HMAC_KEYS) rather than
+    by user. Answers 200 quickly once the event is stored; DocuSign retries
+    anything else.
+    """
+    # Read the raw body before DRF parses it; the signature covers the exact bytes
+    raw_body = request.body
+    if not verify_signature(raw_body, request.headers):
+        return Response({'error': 'Invalid signature'}, status=status.HTTP_401_UNAUTHORIZED)
+
+    try:
+        payload = json.loads(raw_body)
+    except ValueError:
+        return Response({'error': 'Invalid JSON payload'}, status=status.HTTP_400_BAD_REQUEST)
+
+    updated = apply_event(payload)
+    return Response({'updated': updated})
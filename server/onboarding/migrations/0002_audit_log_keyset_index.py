@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-16 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='onboardingauditlog',
+            name='onboarding__candida_1be226_idx',
+        ),
+        migrations.AddIndex(
+            model_name='onboardingauditlog',
+            index=models.Index(fields=['candidate', '-created_at', '-id'], name='onboarding_audit_keyset_idx'),
+        ),
+    ]
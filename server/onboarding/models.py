@@ -6,6 +6,20 @@ import uuid
 import secrets
 
 
+class OnboardingCandidateQuerySet(models.QuerySet):
+    """QuerySet helpers for rendering candidates without per-section queries"""
+
+    def with_sections(self):
+        """Prefetch section data (in form order) and documents"""
+        return self.prefetch_related(
+            models.Prefetch(
+                'section_data',
+                queryset=OnboardingSectionData.objects.order_by('section_index'),
+            ),
+            'documents',
+        )
+
+
 class OnboardingCandidate(BaseModel):
     """
     Main onboarding candidate model.
@@ -66,6 +80,8 @@ class OnboardingCandidate(BaseModel):
     reviewed_at = models.DateTimeField(null=True, blank=True)
     admin_notes = models.TextField(blank=True)
 
+    objects = OnboardingCandidateQuerySet.as_manager()
+
     class Meta:
         db_table = 'onboarding_candidates'
         ordering = ['district', '-created_at']
@@ -117,6 +133,16 @@ class OnboardingCandidate(BaseModel):
         """Calculate completion percentage"""
         return int((self.completed_sections / 8) * 100)
 
+    def get_sections_by_name(self):
+        """
+        Map section_name -> OnboardingSectionData.
+
+        Reads the prefetch cache when section_data was prefetched (see
+        OnboardingCandidateQuerySet.with_sections), so callers should build
+        the map once and look sections up in it.
+        """
+        return {section.section_name: section for section in self.section_data.all()}
+
 
 class OnboardingSectionData(BaseModel):
     """
@@ -297,7 +323,8 @@ class OnboardingAuditLog(BaseModel):
         indexes = [
             models.Index(fields=['district', 'candidate']),
             models.Index(fields=['district', 'action']),
-            models.Index(fields=['candidate', '-created_at']),
+            # Keyset pagination order used by OnboardingCandidateViewSet.audit_log
+            models.Index(fields=['candidate', '-created_at', '-id'], name='onboarding_audit_keyset_idx'),
         ]
 
     def __str__(self):
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.utils import timezone
+
+from core.sparse_fields import SparseFieldsetMixin
 from .models import (
     OnboardingCandidate,
     OnboardingSectionData,
@@ -9,7 +11,7 @@ from .models import (
 )
 
 
-class OnboardingSectionDataSerializer(serializers.ModelSerializer):
+class OnboardingSectionDataSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for individual section data"""
     
     section_display_name = serializers.CharField(source='get_section_name_display', read_only=True)
@@ -42,7 +44,7 @@ class OnboardingSectionDataSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class OnboardingDocumentSerializer(serializers.ModelSerializer):
+class OnboardingDocumentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for onboarding documents"""
     
     document_type_display = serializers.CharField(source='get_document_type_display', read_only=True)
@@ -65,6 +67,7 @@ class OnboardingDocumentSerializer(serializers.ModelSerializer):
             'created_at',
         ]
         read_only_fields = ['id', 'file_size', 'created_at']
+        sparse_field_sources = {'file_url': ['file']}
     
     def get_file_url(self, obj):
         if obj.file:
@@ -74,7 +77,7 @@ class OnboardingDocumentSerializer(serializers.ModelSerializer):
         return None
 
 
-class OnboardingCandidateListSerializer(serializers.ModelSerializer):
+class OnboardingCandidateListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Simplified serializer for listing candidates"""
     
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -98,9 +101,10 @@ class OnboardingCandidateListSerializer(serializers.ModelSerializer):
             'created_at',
         ]
         read_only_fields = ['id', 'created_at']
+        sparse_field_sources = {'progress_percentage': ['completed_sections']}
 
 
-class OnboardingCandidateDetailSerializer(serializers.ModelSerializer):
+class OnboardingCandidateDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Detailed serializer for candidate with all form data"""
     
     section_data = OnboardingSectionDataSerializer(many=True, read_only=True)
@@ -156,14 +160,29 @@ class OnboardingCandidateDetailSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'access_token', 'created_at', 'updated_at']
+        sparse_field_sources = {
+            'progress_percentage': ['completed_sections'],
+            'onboarding_url': ['access_token'],
+            'is_expired': ['token_expires_at'],
+            'personal_info': ['section_data'],
+            'employment_details': ['section_data'],
+            'i9_form': ['section_data'],
+            'tax_withholdings': ['section_data'],
+            'payment_method': ['section_data'],
+            'time_off': ['section_data'],
+            'deductions': ['section_data'],
+            'emergency_contact': ['section_data'],
+        }
     
     def get_section_data(self, obj, section_name):
         """Helper to get data for a specific section"""
-        try:
-            section = obj.section_data.get(section_name=section_name)
-            return section.form_data
-        except OnboardingSectionData.DoesNotExist:
-            return None
+        # One section map per candidate, shared by all eight section getters
+        if not hasattr(self, '_section_maps'):
+            self._section_maps = {}
+        if obj.pk not in self._section_maps:
+            self._section_maps[obj.pk] = obj.get_sections_by_name()
+        section = self._section_maps[obj.pk].get(section_name)
+        return section.form_data if section is not None else None
     
     def get_personal_info(self, obj):
         return self.get_section_data(obj, 'personal_info')
@@ -190,7 +209,7 @@ class OnboardingCandidateDetailSerializer(serializers.ModelSerializer):
         return self.get_section_data(obj, 'emergency_contact')
 
 
-class OnboardingCandidateCreateSerializer(serializers.ModelSerializer):
+class OnboardingCandidateCreateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for creating new onboarding candidates"""
     
     class Meta:
@@ -242,6 +261,18 @@ class SectionUpdateSerializer(serializers.Serializer):
     is_completed = serializers.BooleanField(default=False)
 
 
+class SectionAutosaveSerializer(serializers.Serializer):
+    """Serializer for saving several sections in one request"""
+
+    sections = SectionUpdateSerializer(many=True, allow_empty=False)
+
+    def validate_sections(self, value):
+        indexes = [section['section_index'] for section in value]
+        if len(indexes) != len(set(indexes)):
+            raise serializers.ValidationError('Each section may only appear once.')
+        return value
+
+
 class ProgressUpdateSerializer(serializers.Serializer):
     """Serializer for progress updates"""
     
@@ -261,7 +292,7 @@ class SubmitOnboardingSerializer(serializers.Serializer):
         return value
 
 
-class OnboardingAuditLogSerializer(serializers.ModelSerializer):
+class OnboardingAuditLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for audit logs"""
     
     action_display = serializers.CharField(source='get_action_display', read_only=True)
@@ -282,6 +313,7 @@ class OnboardingAuditLogSerializer(serializers.ModelSerializer):
             'created_at',
         ]
         read_only_fields = ['id', 'created_at']
+        sparse_field_sources = {'performed_by_name': ['performed_by', 'performed_by_candidate', 'candidate']}
     
     def get_performed_by_name(self, obj):
         if obj.performed_by_candidate:
@@ -1,9 +1,11 @@
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
 
+from core.models import EmailOutbox
+from core.outbox import email_failed, email_sent, enqueue_email
+
 from .models import (
     OnboardingCandidate,
     OnboardingSectionData,
@@ -11,6 +13,46 @@ from .models import (
 )
 
 
+def queue_candidate_email(candidate, email_type, recipient_email, subject, message):
+    """
+    Queue an onboarding email through the outbox and log it as pending.
+
+    The log row is marked sent/failed by the outbox delivery receivers below.
+    """
+    email_log = OnboardingEmailLog.objects.create(
+        district=candidate.district,
+        candidate=candidate,
+        email_type=email_type,
+        recipient_email=recipient_email,
+        subject=subject,
+    )
+    enqueue_email(
+        subject,
+        message,
+        [recipient_email],
+        district=candidate.district,
+        category=f'onboarding_{email_type}',
+        metadata={'onboarding_email_log_id': str(email_log.id)},
+    )
+    return email_log
+
+
+@receiver(email_sent, sender=EmailOutbox)
+def mark_onboarding_email_sent(sender, message, **kwargs):
+    email_log_id = message.metadata.get('onboarding_email_log_id')
+    if email_log_id:
+        OnboardingEmailLog.objects.filter(id=email_log_id).update(
+            sent=True, sent_at=message.sent_at, failed=False, error_message='')
+
+
+@receiver(email_failed, sender=EmailOutbox)
+def mark_onboarding_email_failed(sender, message, **kwargs):
+    email_log_id = message.metadata.get('onboarding_email_log_id')
+    if email_log_id:
+        OnboardingEmailLog.objects.filter(id=email_log_id).update(
+            failed=True, error_message=message.last_error)
+
+
 @receiver(post_save, sender=OnboardingCandidate)
 def send_onboarding_invitation(sender, instance, created, **kwargs):
     """Send onboarding invitation email when candidate is created"""
@@ -54,47 +96,18 @@ def send_onboarding_invitation(sender, instance, created, **kwargs):
         School Demo District Human Resources Team
         """
 
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [instance.email],
-                fail_silently=False,
-            )
-            
-            # Log the email
-            OnboardingEmailLog.objects.create(
-                candidate=instance,
-                email_type='invitation',
-                recipient_email=instance.email,
-                subject=subject,
-                sent=True,
-                sent_at=timezone.now()
-            )
-        except Exception as e:
-            # Log the failed email
-            OnboardingEmailLog.objects.create(
-                candidate=instance,
-                email_type='invitation',
-                recipient_email=instance.email,
-                subject=subject,
-                sent=False,
-                failed=True,
-                error_message=str(e)
-            )
-            print(f"Failed to send onboarding invitation: {e}")
+        queue_candidate_email(instance, 'invitation', instance.email, subject, message)
 
 
 @receiver(post_save, sender=OnboardingCandidate)
 def send_submission_confirmation(sender, instance, created, **kwargs):
     """Send confirmation email when onboarding is submitted"""
     if not created and instance.status == 'submitted' and instance.submitted_at:
-        # Check if we already sent this email
+        # Check if we already queued or sent this email
         existing_log = OnboardingEmailLog.objects.filter(
             candidate=instance,
             email_type='submission_confirmation',
-            sent=True
+            failed=False
         ).exists()
         
         if existing_log:
@@ -129,45 +142,18 @@ def send_submission_confirmation(sender, instance, created, **kwargs):
         School Demo District Human Resources Team
         """
 
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [instance.email],
-                fail_silently=False,
-            )
-            
-            OnboardingEmailLog.objects.create(
-                candidate=instance,
-                email_type='submission_confirmation',
-                recipient_email=instance.email,
-                subject=subject,
-                sent=True,
-                sent_at=timezone.now()
-            )
-        except Exception as e:
-            OnboardingEmailLog.objects.create(
-                candidate=instance,
-                email_type='submission_confirmation',
-                recipient_email=instance.email,
-                subject=subject,
-                sent=False,
-                failed=True,
-                error_message=str(e)
-            )
-            print(f"Failed to send submission confirmation: {e}")
+        queue_candidate_email(instance, 'submission_confirmation', instance.email, subject, message)
 
 
 @receiver(post_save, sender=OnboardingCandidate)
 def notify_hr_on_submission(sender, instance, created, **kwargs):
     """Notify HR when a candidate submits their onboarding"""
     if not created and instance.status == 'submitted' and instance.submitted_at:
-        # Check if we already sent this notification
+        # Check if we already queued or sent this notification
         existing_log = OnboardingEmailLog.objects.filter(
             candidate=instance,
             email_type='admin_notification',
-            sent=True
+            failed=False
         ).exists()
         
         if existing_log:
@@ -197,37 +183,9 @@ def notify_hr_on_submission(sender, instance, created, **kwargs):
         This is an automated notification from the School Demo District HR System.
         """
 
-        try:
-            # Send to HR email (configure in settings)
-            hr_email = getattr(settings, 'HR_EMAIL', settings.DEFAULT_FROM_EMAIL)
-            
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [hr_email],
-                fail_silently=False,
-            )
-            
-            OnboardingEmailLog.objects.create(
-                candidate=instance,
-                email_type='admin_notification',
-                recipient_email=hr_email,
-                subject=subject,
-                sent=True,
-                sent_at=timezone.now()
-            )
-        except Exception as e:
-            OnboardingEmailLog.objects.create(
-                candidate=instance,
-                email_type='admin_notification',
-                recipient_email=hr_email,
-                subject=subject,
-                sent=False,
-                failed=True,
-                error_message=str(e)
-            )
-            print(f"Failed to send HR notification: {e}")
+        # Send to HR email (configure in settings)
+        hr_email = getattr(settings, 'HR_EMAIL', settings.DEFAULT_FROM_EMAIL)
+        queue_candidate_email(instance, 'admin_notification', hr_email, subject, message)
 
 
 def send_reminder_email(candidate):
@@ -285,34 +243,5 @@ def send_reminder_email(candidate):
     School Demo District Human Resources Team
     """
 
-    try:
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [candidate.email],
-            fail_silently=False,
-        )
-        
-        OnboardingEmailLog.objects.create(
-            candidate=candidate,
-            email_type='reminder',
-            recipient_email=candidate.email,
-            subject=subject,
-            sent=True,
-            sent_at=timezone.now()
-        )
-        
-        return True
-    except Exception as e:
-        OnboardingEmailLog.objects.create(
-            candidate=candidate,
-            email_type='reminder',
-            recipient_email=candidate.email,
-            subject=subject,
-            sent=False,
-            failed=True,
-            error_message=str(e)
-        )
-        print(f"Failed to send reminder email: {e}")
-        return False
+    queue_candidate_email(candidate, 'reminder', candidate.email, subject, message)
+    return True
@@ -0,0 +1,236 @@
+import pytest
+from datetime import date, timedelta
+from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+SECTION_NAMES = [
+    'personal_info', 'employment_details', 'i9_form', 'tax_withholdings',
+    'payment_method', 'time_off', 'deductions', 'emergency_contact',
+]
+
+
+def create_candidate(district):
+    """Create an onboarding candidate with all eight (empty) sections"""
+    from onboarding.models import OnboardingCandidate, OnboardingSectionData
+
+    candidate = OnboardingCandidate.objects.create(
+        district=district, name="Test Candidate", email="candidate@test.com",
+        position="Teacher", offer_date=date.today(),
+        token_expires_at=timezone.now() + timedelta(days=30),
+    )
+    OnboardingSectionData.objects.bulk_create([
+        OnboardingSectionData(
+            district=district, candidate=candidate, section_name=name,
+            section_index=index, form_data={'index': index})
+        for index, name in enumerate(SECTION_NAMES)
+    ])
+    return candidate
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestCandidateDetailQueries:
+    """A candidate detail response costs a fixed number of queries"""
+
+    def test_sections_come_from_one_prefetch(self, api_client, district1):
+        candidate = create_candidate(district1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(
+                f'/api/onboarding/candidates/{candidate.id}/?token={candidate.access_token}')
+
+        assert response.status_code == 200
+        # candidate, section_data, documents
+        assert len(ctx.captured_queries) <= 3
+        assert [s['section_name'] for s in response.data['section_data']] == SECTION_NAMES
+        assert response.data['tax_withholdings'] == {'index': 3}
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestAutosave:
+    """Several sections are saved atomically and acknowledged compactly"""
+
+    SECTIONS = [
+        {'section_index': 0, 'form_data': {'first_name': 'Ada'}, 'is_completed': True},
+        {'section_index': 7, 'form_data': {'phone': '555'}, 'is_completed': True},
+        {'section_index': 2, 'form_data': {'draft': True}},
+    ]
+
+    def _autosave(self, api_client, candidate, sections):
+        return api_client.post(
+            f'/api/onboarding/candidates/{candidate.id}/autosave/?token={candidate.access_token}',
+            {'sections': sections},
+            format='json',
+        )
+
+    def test_saves_sections_and_counts_completed(self, api_client, district1):
+        from onboarding.models import OnboardingAuditLog
+
+        candidate = create_candidate(district1)
+        response = self._autosave(api_client, candidate, self.SECTIONS)
+
+        assert response.status_code == 200
+        assert response.data['completed_sections'] == 2
+        assert response.data['status'] == 'in_progress'
+        assert [s['section_index'] for s in response.data['sections']] == [0, 2, 7]
+        assert 'section_data' not in response.data
+
+        candidate.refresh_from_db()
+        sections = candidate.get_sections_by_name()
+        assert candidate.completed_sections == 2
+        assert sections['personal_info'].form_data == {'first_name': 'Ada'}
+        assert sections['personal_info'].completed_at is not None
+        assert sections['i9_form'].is_completed is False
+        assert OnboardingAuditLog.objects.filter(candidate=candidate).count() == 3
+
+    def test_repeated_autosave_writes_only_changed_sections(self, api_client, district1):
+        from onboarding.models import OnboardingAuditLog, OnboardingSectionData
+
+        candidate = create_candidate(district1)
+        self._autosave(api_client, candidate, self.SECTIONS)
+        logs = OnboardingAuditLog.objects.filter(candidate=candidate)
+        updated_at = dict(OnboardingSectionData.objects.filter(
+            candidate=candidate).values_list('section_index', 'updated_at'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._autosave(api_client, candidate, self.SECTIONS)
+        assert response.status_code == 200
+        assert [s['section_index'] for s in response.data['sections']] == [0, 2, 7]
+        assert logs.count() == 3
+        assert not any(q['sql'].startswith(('UPDATE', 'INSERT')) for q in ctx.captured_queries)
+
+        sections = [dict(self.SECTIONS[0], form_data={'first_name': 'Grace'}), *self.SECTIONS[1:]]
+        self._autosave(api_client, candidate, sections)
+        assert logs.count() == 4
+        assert list(logs.order_by('-created_at', '-id').values_list('section_name', flat=True)[:1]) == [
+            'personal_info']
+        current = dict(OnboardingSectionData.objects.filter(
+            candidate=candidate).values_list('section_index', 'updated_at'))
+        assert current[0] > updated_at[0] and current[7] == updated_at[7]
+
+    def test_rejects_duplicate_sections(self, api_client, district1):
+        candidate = create_candidate(district1)
+        response = api_client.post(
+            f'/api/onboarding/candidates/{candidate.id}/autosave/?token={candidate.access_token}',
+            {'sections': [
+                {'section_index': 1, 'form_data': {}},
+                {'section_index': 1, 'form_data': {}},
+            ]},
+            format='json',
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestAuditLogCursorPagination:
+    """Audit log cursor pages follow (-created_at, -id) without gaps or repeats"""
+
+    def test_pages_do_not_overlap_on_equal_timestamps(self, authenticated_client, district1):
+        from unittest import mock
+        from core.pagination import KeysetPagination
+        from onboarding.models import OnboardingAuditLog
+
+        candidate = create_candidate(district1)
+        OnboardingAuditLog.objects.bulk_create([
+            OnboardingAuditLog(district=district1, candidate=candidate, action='updated',
+                               section_name=name, details={})
+            for name in SECTION_NAMES[:7]
+        ])
+        OnboardingAuditLog.objects.filter(candidate=candidate).update(created_at=timezone.now())
+        expected = [str(pk) for pk in OnboardingAuditLog.objects.filter(
+            candidate=candidate).order_by('-created_at', '-id').values_list('id', flat=True)]
+
+        pages = []
+        with mock.patch('onboarding.permissions.CanReviewOnboarding.has_permission', return_value=True), \
+                mock.patch.object(KeysetPagination, 'page_size', 3):
+            url = f'/api/onboarding/candidates/{candidate.id}/audit-log/?cursor='
+            while url:
+                response = authenticated_client.get(url)
+                assert response.status_code == 200 and 'count' not in response.data
+                pages.append([row['id'] for row in response.data['results']])
+                url = response.data['next']
+
+            previous = authenticated_client.get(response.data['previous'])
+            assert [row['id'] for row in previous.data['results']] == pages[-2]
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [pk for page in pages for pk in page] == expected
+
+
+@pytest.mark.django_db
+class TestOnboardingEmailDelivery:
+    """Onboarding emails go through the outbox and the worker records the outcome"""
+
+    def test_invitation_is_queued_then_marked_sent(self, district1):
+        from django.core import mail
+        from core.models import EmailOutbox
+        from core.outbox import deliver_due
+        from onboarding.models import OnboardingEmailLog
+
+        candidate = create_candidate(district1)
+
+        queued = EmailOutbox.objects.get(category='onboarding_invitation')
+        log = OnboardingEmailLog.objects.get(candidate=candidate, email_type='invitation')
+        assert queued.status == 'pending' and queued.to == [candidate.email]
+        assert not log.sent and len(mail.outbox) == 0
+
+        assert deliver_due() == (1, 0)
+
+        queued.refresh_from_db()
+        log.refresh_from_db()
+        assert queued.status == 'sent'
+        assert log.sent and log.sent_at is not None
+        assert len(mail.outbox) == 1
+
+    def test_failed_delivery_marks_log_failed(self, district1, settings):
+        from unittest import mock
+        from core.models import EmailOutbox
+        from core.outbox import deliver_due
+        from onboarding.models import OnboardingEmailLog
+
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+        candidate = create_candidate(district1)
+
+        def refuse_all(messages, connection=None):
+            return {index: OSError('smtp down') for index in range(len(messages))}
+
+        with mock.patch('core.outbox.send_batch', side_effect=refuse_all):
+            assert deliver_due() == (0, 1)
+
+        queued = EmailOutbox.objects.get(category='onboarding_invitation')
+        log = OnboardingEmailLog.objects.get(candidate=candidate, email_type='invitation')
+        assert queued.status == 'failed' and queued.attempts == 1
+        assert log.failed and 'smtp down' in log.error_message
+        assert not log.sent
+
+
+@pytest.mark.django_db
+@pytest.mark.api
+class TestUpdateSection:
+    """First saves of a missing section create exactly one row"""
+
+    def test_creates_missing_section_once(self, api_client, district1):
+        from onboarding.models import OnboardingSectionData
+
+        candidate = create_candidate(district1)
+        OnboardingSectionData.objects.filter(candidate=candidate, section_name='time_off').delete()
+        url = f'/api/onboarding/candidates/{candidate.id}/update_section/?token={candidate.access_token}'
+
+        first = api_client.post(url, {'section_index': 5, 'form_data': {'days': 1}}, format='json')
+        autosaved = api_client.post(
+            f'/api/onboarding/candidates/{candidate.id}/autosave/?token={candidate.access_token}',
+            {'sections': [{'section_index': 5, 'form_data': {'days': 2}}]},
+            format='json',
+        )
+        second = api_client.post(
+            url, {'section_index': 5, 'form_data': {'days': 3}, 'is_completed': True}, format='json')
+
+        assert (first.status_code, autosaved.status_code, second.status_code) == (200, 200, 200)
+        section = OnboardingSectionData.objects.get(candidate=candidate, section_name='time_off')
+        assert section.form_data == {'days': 3} and section.district_id == district1.id
+        assert second.data['candidate']['time_off'] == {'days': 3}
+        assert second.data['candidate']['completed_sections'] == 1
@@ -22,6 +22,10 @@ urlpatterns = [
         'post': 'update_section'
     }), name='onboarding-candidate-update-section'),
 
+    path('candidates/<uuid:pk>/autosave/', OnboardingCandidateViewSet.as_view({
+        'post': 'autosave'
+    }), name='onboarding-candidate-autosave'),
+
     path('candidates/<uuid:pk>/submit/', OnboardingCandidateViewSet.as_view({
         'post': 'submit'
     }), name='onboarding-candidate-submit'),
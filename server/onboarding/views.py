@@ -4,10 +4,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Avg, Count, Q
 from django.shortcuts import get_object_or_404
 from datetime import datetime, timedelta
 
+from core.pagination import KeysetPagination
+from core.sparse_fields import SparseFieldsetViewMixin
+
 from .models import (
     OnboardingCandidate,
     OnboardingSectionData,
@@ -22,6 +26,7 @@ from .serializers import (
     OnboardingSectionDataSerializer,
     OnboardingDocumentSerializer,
     SectionUpdateSerializer,
+    SectionAutosaveSerializer,
     ProgressUpdateSerializer,
     SubmitOnboardingSerializer,
     OnboardingAuditLogSerializer,
@@ -37,7 +42,7 @@ from .permissions import (
 )
 
 
-class OnboardingCandidateViewSet(viewsets.ModelViewSet):
+class OnboardingCandidateViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for onboarding candidates.
     Supports both HR staff and token-based candidate access.
@@ -59,6 +64,14 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
             return [IsHRStaff()]
         return super().get_permissions()
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'create', 'autosave', 'update_section'):
+            # Detail responses render every section and document; load them
+            # in two fixed queries instead of one per section getter
+            queryset = queryset.with_sections()
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'create':
             return OnboardingCandidateCreateSerializer
@@ -76,7 +89,7 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
         if access_token:
             # Token-based access
             obj = get_object_or_404(
-                OnboardingCandidate, access_token=access_token)
+                self.get_queryset(), access_token=access_token)
             self.check_object_permissions(self.request, obj)
             return obj
 
@@ -132,25 +145,34 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
         ]
         section_name = section_name_map[section_index]
 
-        section, created = OnboardingSectionData.objects.get_or_create(
-            candidate=candidate,
-            section_name=section_name,
-            defaults={'section_index': section_index}
-        )
+        # Section writers (this and autosave) serialize on the candidate row,
+        # so a concurrent first save can't insert the same section twice
+        with transaction.atomic():
+            candidate = OnboardingCandidate.objects.select_for_update().get(pk=candidate.pk)
+            section, _ = OnboardingSectionData.objects.get_or_create(
+                candidate=candidate,
+                section_name=section_name,
+                defaults={
+                    'district_id': candidate.district_id,
+                    'section_index': section_index,
+                },
+            )
 
-        # Update the section
-        section.form_data = form_data
-        section.is_completed = is_completed
-        if is_completed and not section.completed_at:
-            section.completed_at = timezone.now()
-        section.save()
-
-        # Update candidate's completed sections count
-        completed_count = candidate.section_data.filter(
-            is_completed=True).count()
-        candidate.completed_sections = completed_count
-        candidate.last_updated = timezone.now()
-        candidate.save()
+            # Update the section
+            section.form_data = form_data
+            section.is_completed = is_completed
+            if is_completed and not section.completed_at:
+                section.completed_at = timezone.now()
+            section.save()
+
+            # Update candidate's completed sections count
+            completed_count = candidate.section_data.filter(
+                is_completed=True).count()
+            candidate.completed_sections = completed_count
+            candidate.last_updated = timezone.now()
+            candidate.save()
+
+        candidate = OnboardingCandidate.objects.with_sections().get(pk=candidate.pk)
 
         # Create audit log
         self._create_audit_log(
@@ -167,6 +189,103 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
             'candidate': OnboardingCandidateDetailSerializer(candidate).data
         })
 
+    @action(detail=True, methods=['post'], permission_classes=[IsCandidateOrHRStaff])
+    def autosave(self, request, pk=None):
+        """
+        Save several sections in one request.
+
+        Body: {"sections": [{"section_index", "form_data", "is_completed"}, ...]}.
+        All sections are written in one transaction with the candidate row
+        locked, so concurrent autosaves can't lose a completed_sections
+        update. Sections whose form_data and is_completed are unchanged are
+        neither written nor audited, so a repeated autosave only takes the
+        lock and reads. Returns a compact acknowledgement instead of the full
+        candidate; fetch the candidate when the full document is needed.
+        """
+        candidate = self.get_object()
+        serializer = SectionAutosaveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        section_names = [name for name, _ in OnboardingSectionData.SECTION_CHOICES]
+        updates = {
+            section_names[item['section_index']]: item
+            for item in serializer.validated_data['sections']
+        }
+        now = timezone.now()
+        performed_by = request.user if request.user.is_authenticated else None
+
+        with transaction.atomic():
+            candidate = OnboardingCandidate.objects.select_for_update().get(pk=candidate.pk)
+            existing = {
+                section.section_name: section
+                for section in OnboardingSectionData.objects.filter(
+                    candidate=candidate, section_name__in=list(updates))
+            }
+
+            unchanged, changed, created = [], [], []
+            for section_name, item in updates.items():
+                form_data = item['form_data']
+                is_completed = item.get('is_completed', False)
+                section = existing.get(section_name)
+                if section is not None and (section.form_data, section.is_completed) == (form_data, is_completed):
+                    unchanged.append(section)
+                    continue
+                if section is None:
+                    section = OnboardingSectionData(
+                        district_id=candidate.district_id,
+                        candidate=candidate,
+                        section_name=section_name,
+                        section_index=item['section_index'],
+                    )
+                    created.append(section)
+                else:
+                    changed.append(section)
+                section.form_data = form_data
+                section.is_completed = is_completed
+                if section.is_completed and not section.completed_at:
+                    section.completed_at = now
+                section.updated_at = now
+
+            if changed:
+                OnboardingSectionData.objects.bulk_update(
+                    changed, ['form_data', 'is_completed', 'completed_at', 'updated_at'])
+            if created:
+                OnboardingSectionData.objects.bulk_create(created)
+
+            if changed or created:
+                candidate.completed_sections = candidate.section_data.aggregate(
+                    completed=Count('id', filter=Q(is_completed=True)))['completed']
+                candidate.last_updated = now
+                candidate.save(update_fields=['completed_sections', 'status', 'last_updated', 'updated_at'])
+
+            OnboardingAuditLog.objects.bulk_create([
+                self._build_audit_log(
+                    candidate,
+                    'section_completed' if section.is_completed else 'updated',
+                    f"Section {section.section_index}: {section.get_section_name_display()}",
+                    section_name=section.section_name,
+                    performed_by=performed_by,
+                    performed_by_candidate=performed_by is None,
+                )
+                for section in changed + created
+            ])
+
+        return Response({
+            'candidate_id': candidate.id,
+            'status': candidate.status,
+            'completed_sections': candidate.completed_sections,
+            'progress_percentage': candidate.progress_percentage,
+            'last_updated': candidate.last_updated,
+            'sections': [
+                {
+                    'section_index': section.section_index,
+                    'section_name': section.section_name,
+                    'is_completed': section.is_completed,
+                    'updated_at': section.updated_at,
+                }
+                for section in sorted(unchanged + changed + created, key=lambda s: s.section_index)
+            ],
+        })
+
     @action(detail=True, methods=['post'], permission_classes=[CanSubmitOnboarding])
     def submit(self, request, pk=None):
         """
@@ -227,17 +346,17 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
             ]
             section_name = section_name_map[section_index]
 
-            try:
-                section = candidate.section_data.get(section_name=section_name)
-                section.reviewed_by_admin = mark_as_reviewed
-                section.admin_reviewed_at = timezone.now() if mark_as_reviewed else None
-                section.admin_comments = admin_comments
-                section.save()
-            except OnboardingSectionData.DoesNotExist:
+            # Update the prefetched instance so the response reflects it
+            section = candidate.get_sections_by_name().get(section_name)
+            if section is None:
                 return Response(
                     {'error': f'Section {section_index} not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
+            section.reviewed_by_admin = mark_as_reviewed
+            section.admin_reviewed_at = timezone.now() if mark_as_reviewed else None
+            section.admin_comments = admin_comments
+            section.save()
         else:
             # Review entire onboarding
             candidate.reviewed_by = request.user
@@ -267,7 +386,7 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
         """
         candidate = self.get_object()
 
-        sections = candidate.section_data.all().order_by('section_index')
+        sections = candidate.section_data.all()
         section_progress = []
 
         for section in sections:
@@ -420,7 +539,17 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
         Get audit log for a candidate.
         """
         candidate = self.get_object()
-        logs = candidate.audit_logs.all()
+        logs = candidate.audit_logs.select_related('candidate', 'performed_by')
+
+        # Opt-in keyset pagination; without ?cursor= the full list is returned as before
+        if KeysetPagination.cursor_query_param in request.query_params:
+            paginator = KeysetPagination()
+            # Served by onboarding_audit_keyset_idx (candidate, -created_at, -id)
+            paginator.keyset_ordering = ('-created_at', '-id')
+            page = paginator.paginate_queryset(logs, request)
+            serializer = OnboardingAuditLogSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = OnboardingAuditLogSerializer(logs, many=True)
         return Response(serializer.data)
 
@@ -438,7 +567,7 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            candidate = OnboardingCandidate.objects.get(
+            candidate = OnboardingCandidate.objects.with_sections().get(
                 access_token=access_token)
 
             if candidate.is_expired:
@@ -465,9 +594,10 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-    def _create_audit_log(self, candidate, action, details_text, section_name='', performed_by=None, performed_by_candidate=False):
-        """Helper to create audit log entries"""
-        OnboardingAuditLog.objects.create(
+    def _build_audit_log(self, candidate, action, details_text, section_name='', performed_by=None, performed_by_candidate=False):
+        """Helper to build an unsaved audit log entry (for bulk_create)"""
+        return OnboardingAuditLog(
+            district_id=candidate.district_id,
             candidate=candidate,
             action=action,
             section_name=section_name,
@@ -478,6 +608,13 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
             user_agent=self._get_user_agent()
         )
 
+    def _create_audit_log(self, candidate, action, details_text, section_name='', performed_by=None, performed_by_candidate=False):
+        """Helper to create audit log entries"""
+        self._build_audit_log(
+            candidate, action, details_text, section_name=section_name,
+            performed_by=performed_by, performed_by_candidate=performed_by_candidate,
+        ).save()
+
     def _get_client_ip(self):
         """Get client IP address from request"""
         x_forwarded_for = self.request.META.get('HTTP_X_FORWARDED_FOR')
@@ -504,7 +641,7 @@ class OnboardingCandidateViewSet(viewsets.ModelViewSet):
         )
 
 
-class OnboardingDocumentViewSet(viewsets.ModelViewSet):
+class OnboardingDocumentViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for uploading and managing onboarding documents.
     """